@@ -0,0 +1,36 @@
+import numpy as np
+
+import simulacra as si
+from simulacra.utils import BlockTimer
+
+
+def make_spec(grid_points):
+    grid = np.linspace(0, 1, grid_points)
+    grid.flags.writeable = False
+
+    potential = np.exp(-grid ** 2)
+    potential.flags.writeable = False
+
+    return si.Specification('base', grid = grid, potential = potential, amplitude = 1.0)
+
+
+if __name__ == '__main__':
+    variants = 1000
+
+    for grid_points in (10 ** 3, 10 ** 4, 10 ** 5):
+        spec = make_spec(grid_points)
+
+        with BlockTimer() as t_deep:
+            deep = [spec.clone(amplitude = a) for a in np.linspace(0, 1, variants)]
+
+        with BlockTimer() as t_shared:
+            shared = [spec.clone(share_immutable = True, amplitude = a) for a in np.linspace(0, 1, variants)]
+
+        deep_bytes = sum(s.grid.nbytes + s.potential.nbytes for s in deep)
+        shared_bytes = spec.grid.nbytes + spec.potential.nbytes
+
+        print(f'{grid_points} grid points, {variants} variants')
+        print(f'  deepcopy: {t_deep.wall_time_elapsed}, {si.utils.bytes_to_str(deep_bytes)} of arrays')
+        print(f'  shared:   {t_shared.wall_time_elapsed}, {si.utils.bytes_to_str(shared_bytes)} of arrays')
+
+        del deep, shared
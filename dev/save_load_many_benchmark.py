@@ -0,0 +1,31 @@
+import os
+import shutil
+
+import numpy as np
+
+import simulacra as si
+from simulacra.utils import BlockTimer
+
+
+FILE_NAME = os.path.splitext(os.path.basename(__file__))[0]
+OUT_DIR = os.path.join(os.getcwd(), 'out', FILE_NAME)
+
+
+if __name__ == '__main__':
+    count = 200
+    specs = [si.Specification(str(ii), data = np.random.random(100000).round(3)) for ii in range(count)]
+
+    for workers in (1, 2, 4, 8, 16):
+        shutil.rmtree(OUT_DIR, ignore_errors = True)
+
+        with BlockTimer() as t_save:
+            paths = [r.value for r in si.Beet.save_many(specs, target_dir = OUT_DIR, workers = workers)]
+
+        with BlockTimer() as t_load:
+            loaded = [r.value for r in si.Specification.load_many(paths, workers = workers)]
+
+        save_rate = count / t_save.wall_time_elapsed.total_seconds()
+        load_rate = count / t_load.wall_time_elapsed.total_seconds()
+        print(f'{workers:>2} workers: save {save_rate:.1f} specs/s, load {load_rate:.1f} specs/s')
+
+    shutil.rmtree(OUT_DIR, ignore_errors = True)
@@ -0,0 +1,61 @@
+import tracemalloc
+
+import numpy as np
+
+import simulacra as si
+from simulacra.utils import BlockTimer
+
+
+class Wave(si.Summand):
+    """Only implements __call__, so it uses the fallback accumulation."""
+
+    def __init__(self, k):
+        super().__init__()
+        self.k = k
+
+    def __call__(self, x):
+        return np.sin(self.k * x)
+
+
+class InPlaceWave(Wave):
+    """Also accumulates into the output array, using a scratch buffer instead of temporaries."""
+
+    def __init__(self, k):
+        super().__init__(k)
+        self._scratch = None
+
+    def accumulate(self, out, x):
+        if self._scratch is None or self._scratch.shape != x.shape:
+            self._scratch = np.empty_like(x)
+        np.multiply(self.k, x, out = self._scratch)
+        np.sin(self._scratch, out = self._scratch)
+        out += self._scratch
+        return out
+
+
+def measure(label, function, repeats = 5):
+    function()  # warm up scratch buffers
+
+    tracemalloc.start()
+    with BlockTimer() as timer:
+        for _ in range(repeats):
+            function()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    print(f'{label:<40} {timer.wall_time_elapsed.total_seconds() / repeats * 1000:>8.2f} ms/call, peak {si.utils.bytes_to_str(peak)}')
+
+
+if __name__ == '__main__':
+    terms = 20
+    x = np.linspace(0, 1, 10 ** 6)
+    out = np.empty_like(x)
+
+    waves = [Wave(k) for k in range(terms)]
+    in_place_waves = [InPlaceWave(k) for k in range(terms)]
+
+    measure('sum() of summands (old Sum.__call__)', lambda: sum(w(x) for w in waves))
+    measure('Sum, fallback accumulate', lambda: si.Sum(*waves)(x))
+    measure('Sum, fallback accumulate, out =', lambda: si.Sum(*waves)(x, out = out))
+    measure('Sum, in-place accumulate', lambda: si.Sum(*in_place_waves)(x))
+    measure('Sum, in-place accumulate, out =', lambda: si.Sum(*in_place_waves)(x, out = out))
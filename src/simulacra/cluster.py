@@ -25,6 +25,7 @@ import logging
 import os
 import pickle
 import posixpath
+import pstats
 import stat
 import subprocess
 import sys
@@ -279,7 +280,7 @@ class ClusterInterface:
 
     def mirror_remote_home_dir(self,
                                blacklist_dir_names = ('python', 'build_python'),
-                               whitelist_file_ext = ('.txt', '.log', '.json', '.spec', '.sim', '.pkl')):
+                               whitelist_file_ext = ('.txt', '.log', '.json', '.spec', '.sim', '.pkl', core.DELTA_EXTENSION, core.PROFILE_EXTENSION)):
         """
         Mirror the entire remote home directory.
 
@@ -323,6 +324,11 @@ class SimulationResult:
         self.end_time = copy(sim.end_time)
         self.elapsed_time = copy(sim.elapsed_time.total_seconds())
         self.running_time = copy(sim.running_time.total_seconds())
+        self.phase_timings = core.PhaseTimings().merge(getattr(sim, 'phase_timings', core.PhaseTimings()))
+        sampler = getattr(sim, 'resource_sampler', None)
+        self.resource_peaks = sampler.peaks() if sampler is not None else {}
+        tracker = getattr(sim, 'memory_tracker', None)
+        self.memory_growth = tracker.growth() if tracker is not None else {}
 
 
 class JobProcessor(core.Beet):
@@ -399,13 +405,83 @@ class JobProcessor(core.Beet):
 
         return latest - earliest
 
+    @property
+    def phase_timings(self):
+        """The :class:`~simulacra.core.PhaseTimings` of all the simulations in the job, added together."""
+        phase_timings = core.PhaseTimings()
+        for r in self.data.values():
+            if r is not None and hasattr(r, 'phase_timings'):
+                phase_timings.merge(r.phase_timings)
+
+        return phase_timings
+
+    @property
+    def resource_peaks(self):
+        """The largest peak of each resource sampled by a :class:`~simulacra.core.ResourceSampler` in any simulation in the job, which is a good guide to how much to request for each job."""
+        peaks = {}
+        for r in self.data.values():
+            for field, value in getattr(r, 'resource_peaks', {}).items():
+                peaks[field] = max(peaks.get(field, value), value)
+
+        return peaks
+
+    def memory_growth(self, top = 10):
+        """
+        Compare the memory growth recorded by the :class:`~simulacra.core.MemoryTracker` of each simulation in the job (see :func:`~simulacra.core.compare_memory_growth`).
+
+        Parameters
+        ----------
+        top
+            The number of allocation sites to return. If ``None``, return all of them.
+
+        Returns
+        -------
+        :class:`list` of :class:`~simulacra.core.MemoryGrowthComparison`
+            The sites that grew the most in total, largest first.
+        """
+        growths = {str(r.file_name): r.memory_growth for r in self.data.values() if r is not None and getattr(r, 'memory_growth', None)}
+
+        return core.compare_memory_growth(growths, top = top)
+
     def get_sim_names_from_specs(self):
         """Get a list of Simulation file names based on their Specifications."""
         return sorted([f.strip('.spec') for f in os.listdir(self.inputs_dir)], key = int)
 
     def get_sim_names_from_sims(self):
         """Get a list of Simulation file names actually found in the output directory."""
-        return sorted([f.strip('.sim') for f in os.listdir(self.outputs_dir)], key = int)
+        return sorted([f.strip('.sim') for f in os.listdir(self.outputs_dir) if f.endswith('.sim')], key = int)  # skip profiles, delta logs, etc.
+
+    def merge_profiles(self):
+        """
+        Combine the profiles of every Simulation in the output directory (see :attr:`simulacra.core.Simulation.profiling_enabled`) to find the hot spots of the whole job.
+
+        The combined profile is also written to ``{name}.prof`` in the job's summaries directory.
+
+        Returns
+        -------
+        :class:`pstats.Stats`
+            The combined profile, or ``None`` if there were no profiles.
+        """
+        stats = None
+        for file_name in sorted(os.listdir(self.outputs_dir)):
+            if not file_name.endswith(core.PROFILE_EXTENSION):
+                continue
+
+            path = os.path.join(self.outputs_dir, file_name)
+            try:
+                if stats is None:
+                    stats = pstats.Stats(path)
+                else:
+                    stats.add(path)
+            except (OSError, EOFError, TypeError, ValueError) as e:
+                logger.warning(f'Failed to read profile {file_name} from job {self.name} due to {e}')
+
+        if stats is not None:
+            path = os.path.join(self.summaries_dir, f'{self.name}{core.PROFILE_EXTENSION}')
+            stats.dump_stats(path)
+            logger.debug(f'Wrote combined profile for job {self.name} to {path}')
+
+        return stats
 
     def save(self, target_dir = None, file_extension = '.job', **kwargs):
         """
@@ -441,6 +517,21 @@ class JobProcessor(core.Beet):
         sim_path = os.path.join(self.outputs_dir, '{}.sim'.format(sim_file_name))
 
         try:
+            try:
+                if not self.simulation_type.verify(sim_path, checksum = False):
+                    logger.warning('{}.sim from job {} is truncated or corrupt, removing it'.format(sim_file_name, self.name))
+                    os.remove(sim_path)
+                    return None
+            except core.SimulacraException:  # saved without an integrity trailer, so let loading find out
+                pass
+
+            try:
+                status = self.simulation_type.peek(sim_path).get('status')
+            except core.SimulacraException:  # saved without a metadata header, so we have to unpickle it to find out
+                status = None
+            if status is not None and status != core.STATUS_FIN:
+                raise FileNotFoundError
+
             sim = self.simulation_type.load(os.path.join(sim_path), **load_kwargs)
 
             if sim.status != 'finished':
@@ -458,23 +549,72 @@ class JobProcessor(core.Beet):
 
         return sim
 
-    def load_sims(self, force_reprocess = False):
+    def peek_sims(self):
+        """
+        Read the metadata of every Simulation in the output directory without unpickling them.
+
+        Returns
+        -------
+        :class:`collections.OrderedDict`
+            A dictionary mapping Simulation file names to the metadata returned by :meth:`Beet.peek`, or ``None`` if the metadata could not be read.
+        """
+        metadata = collections.OrderedDict()
+
+        for sim_name in self.get_sim_names_from_sims():
+            sim_path = os.path.join(self.outputs_dir, f'{sim_name}.sim')
+            try:
+                metadata[sim_name] = self.simulation_type.peek(sim_path)
+            except (core.SimulacraException, OSError, ValueError) as e:
+                logger.debug(f'Failed to read metadata from {sim_name}.sim from job {self.name} due to {e}')
+                metadata[sim_name] = None
+
+        return metadata
+
+    def load_slices(self, attribute, start = 0, stop = None):
+        """
+        Read rows ``[start, stop)`` of a time series attribute from every Simulation in the output directory, without loading the Simulations.
+
+        See :meth:`~simulacra.core.Simulation.load_slice`, which loads the whole Simulation if it has delta checkpoints.
+
+        Returns
+        -------
+        :class:`collections.OrderedDict`
+            A dictionary mapping Simulation file names to the requested rows, or ``None`` if they could not be read.
+        """
+        slices = collections.OrderedDict()
+
+        for sim_name in self.get_sim_names_from_sims():
+            sim_path = os.path.join(self.outputs_dir, f'{sim_name}.sim')
+            try:
+                slices[sim_name] = self.simulation_type.load_slice(sim_path, attribute, start = start, stop = stop)
+            except (core.SimulacraException, OSError, ValueError, zlib.error) as e:
+                logger.debug(f'Failed to read {attribute} from {sim_name}.sim from job {self.name} due to {e}')
+                slices[sim_name] = None
+
+        return slices
+
+    def load_sims(self, force_reprocess = False, workers = 1):
         """
         Process the job by loading newly-downloaded Simulations and generating SimulationResults from them.
 
+        With more than one worker, Simulations are loaded by a pool of threads (see :func:`simulacra.utils.thread_map`), so their decompression and file I/O overlap.
+        Up to two loaded Simulations per worker are held in memory at once, so only use more workers if there is memory to spare.
+        Missing, unfinished, and truncated Simulations are skipped, but any other exception raised while loading a Simulation is re-raised.
+
         :param force_reprocess: if True, process all Simulations in the output directory regardless of prior processing status
+        :param workers: the number of threads to load Simulations with
         """
         with utils.BlockTimer() as t:
             logger.info('Loading simulations from job {}'.format(self.name))
 
             if force_reprocess:
-                sim_names = tqdm(copy(self.sim_names))
+                sim_names = copy(self.sim_names)
             else:
-                new_sims = self.unprocessed_sim_names.intersection(self.get_sim_names_from_sims())  # only process newly-downloaded Simulations
-                sim_names = tqdm(new_sims)
+                sim_names = self.unprocessed_sim_names.intersection(self.get_sim_names_from_sims())  # only process newly-downloaded Simulations
 
-            for sim_name in sim_names:
-                sim = self._load_sim(sim_name)
+            for sim_name, sim, exception in tqdm(utils.thread_map(self._load_sim, sim_names, workers = workers), total = len(sim_names)):  # the bar advances as Simulations finish loading
+                if exception is not None:  # already logged by _load_sim
+                    raise exception
 
                 if sim is not None and sim.status == core.STATUS_FIN:
                     try:
@@ -573,6 +713,23 @@ class JobProcessor(core.Beet):
                 f'Latest Sim Finish: {max(r.end_time for r in self.data.values() if r is not None)}',
             )))
 
+            resource_peaks = self.resource_peaks
+            if 'rss' in resource_peaks:
+                f.write(f'\n\nLargest Peak RSS: {utils.bytes_to_str(resource_peaks["rss"])}')
+
+            memory_growth = self.memory_growth(top = 5)
+            if len(memory_growth) > 0:
+                f.write('\n\nLargest Memory Growth (total, simulations, largest):\n')
+                for c in memory_growth:
+                    f.write(f'{c.site}: {utils.bytes_to_str(c.total)}, {c.simulations}, {c.largest} ({utils.bytes_to_str(c.largest_size)})\n')
+
+            phase_timings = self.phase_timings
+            if len(phase_timings) > 0:
+                f.write('\n\nPhase Timings (wall, CPU, calls, fraction of combined runtime):\n')
+                for phase in phase_timings:
+                    fraction = phase_timings.wall[phase] / self.running_time if self.running_time else 0
+                    f.write(f'{phase}: {phase_timings.wall[phase]}, {phase_timings.cpu[phase]}, {phase_timings.calls[phase]}, {fraction:.1%}\n')
+
         logger.debug(f'Wrote diagnostic information for job {self.name} to {path}')
 
     def make_time_diagnostics_plot(self):
@@ -671,6 +828,148 @@ def expand_parameters_to_dicts(parameters):
     return dicts
 
 
+_COLUMN_KINDS = {bool: 'b', int: 'i', float: 'f', complex: 'c', str: 'U'}
+
+
+def _as_column(values):
+    """
+    Return `values` as a one-dimensional NumPy array.
+
+    The array is typed if `values` is already a one-dimensional typed array, or if every value is a Python scalar of the same type that NumPy can store without conversion.
+    Otherwise it has dtype object, so that mixed values like ``[1, 'a']`` or ``[1, 2.5]`` aren't silently converted to a common type.
+    """
+    if isinstance(values, np.ndarray) and values.ndim == 1:
+        return values
+
+    types = {type(value) for value in values}
+    if len(types) == 1 and types <= _COLUMN_KINDS.keys():
+        column = np.asarray(values)
+        if column.ndim == 1 and column.dtype.kind == _COLUMN_KINDS[types.pop()]:  # e.g., ints too large for int64 become objects
+            return column
+
+    column = np.empty(len(values), dtype = object)
+    column[:] = list(values)
+
+    return column
+
+
+class SpecTable(core.Beet):
+    """
+    A compact, columnar representation of a parameter sweep: the same :class:`Specification` that :func:`expand_parameters_to_dicts` would generate, without generating them.
+
+    Each expandable :class:`Parameter` is stored once as a typed NumPy array of its values, and non-expandable parameters are stored once as constants.
+    Row ``i`` of the sweep is found by unravelling ``i`` over the expandable parameters, in the same order as :func:`expand_parameters_to_dicts`, so the table's size doesn't depend on the number of rows.
+    Specifications are only created when they are requested by index.
+
+    A :class:`SpecTable` is a :class:`Beet`, so the whole sweep can be saved to a single file.
+    """
+
+    def __init__(self, name, specification_type, parameters, file_name = None):
+        """
+        Parameters
+        ----------
+        name : :class:`str`
+            The name of the table.
+        specification_type
+            The :class:`Specification` subclass to create rows as.
+        parameters : iterable of :class:`Parameter`
+            The parameters to sweep over.
+        file_name : :class:`str`
+            The file name of the table.
+        """
+        super().__init__(name, file_name = file_name)
+
+        self.specification_type = specification_type
+
+        self.parameter_names = []
+        self.constants = {}
+        self.axes = collections.OrderedDict()  # expandable parameter name -> column of values
+        self._python_scalar_axes = set()  # axes whose values were given as Python scalars rather than a NumPy array
+
+        for par in parameters:
+            if par.name not in self.parameter_names:
+                self.parameter_names.append(par.name)
+
+            self.constants.pop(par.name, None)
+            self.axes.pop(par.name, None)
+            self._python_scalar_axes.discard(par.name)
+
+            if par.expandable and hasattr(par.value, '__iter__') and not isinstance(par.value, str) and hasattr(par.value, '__len__'):  # same test as expand_parameters_to_dicts
+                self.axes[par.name] = _as_column(par.value)
+                if not isinstance(par.value, np.ndarray):
+                    self._python_scalar_axes.add(par.name)
+            else:
+                self.constants[par.name] = par.value
+
+    def __str__(self):
+        return f'{self.__class__.__name__}({self.name}, {len(self)} {self.specification_type.__name__}s)'
+
+    @property
+    def shape(self):
+        """The number of values of each expandable parameter."""
+        return tuple(len(column) for column in self.axes.values())
+
+    def __len__(self):
+        return int(np.prod(self.shape, dtype = np.int64))
+
+    def _indices(self, rows):
+        return dict(zip(self.axes.keys(), np.unravel_index(rows, self.shape))) if len(self.axes) > 0 else {}
+
+    def row(self, index):
+        """Return the keyword arguments for row `index` of the sweep."""
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError(f'Row {index} is out of range for {self}')
+
+        indices = self._indices(index)
+        python_scalar_axes = getattr(self, '_python_scalar_axes', self.axes)  # tables saved before it existed converted every axis
+        kwargs = {}
+        for name in self.parameter_names:
+            if name in self.axes:
+                value = self.axes[name][indices[name]]
+                kwargs[name] = value.item() if name in python_scalar_axes and isinstance(value, np.generic) else value  # give back what expand_parameters_to_dicts would
+            else:
+                kwargs[name] = deepcopy(self.constants[name])  # like expand_parameters_to_dicts, rows never share mutable values
+
+        return kwargs
+
+    def __getitem__(self, index):
+        """Return a new :class:`Specification` for row `index`, named and file-named by its row number."""
+        kwargs = self.row(index)
+        index = index % len(self)
+
+        return self.specification_type(str(index), file_name = str(index), **kwargs)
+
+    def __iter__(self):
+        for index in range(len(self)):
+            yield self[index]
+
+    def column(self, name):
+        """Return the value of parameter `name` for every row of the sweep, as a NumPy array."""
+        if name in self.axes:
+            return self.axes[name][self._indices(np.arange(len(self)))[name]]
+        elif name in self.constants:
+            return _as_column([self.constants[name]] * len(self))
+
+        raise KeyError(f'{self} has no parameter {name}')
+
+    def save(self, target_dir = None, file_extension = '.table', **kwargs):
+        return super().save(target_dir = target_dir, file_extension = file_extension, **kwargs)
+
+    def info(self):
+        info = super().info()
+
+        info.add_field('Specification Type', self.specification_type.__name__)
+        info.add_field('Rows', len(self))
+        for name, column in self.axes.items():
+            info.add_field(name, f'{len(column)} values, {column.dtype}')
+        for name, value in self.constants.items():
+            info.add_field(name, value)
+
+        return info
+
+
 def ask_for_input(question, default = None, cast_to = str):
     """
     Ask for input from the user, with a default value, which will be cast to a specified type.
@@ -806,12 +1105,13 @@ def create_job_subdirs(job_dir):
     utils.ensure_dir_exists(os.path.join(job_dir, 'movies'))
 
 
-def save_specifications(specifications, job_dir):
-    """Save a list of Specifications."""
+def save_specifications(specifications, job_dir, workers = None):
+    """Save a list of Specifications, using `workers` threads (see :meth:`Beet.save_many`)."""
     print('Saving Specifications...')
 
-    for spec in specifications:
-        spec.save(target_dir = os.path.join(job_dir, 'inputs/'))
+    for spec, _, exception in core.Beet.save_many(specifications, target_dir = os.path.join(job_dir, 'inputs/'), workers = workers):
+        if exception is not None:
+            logger.error(f'Failed to save {spec}: {exception}')
 
     logger.debug('Saved Specifications')
 
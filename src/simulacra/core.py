@@ -17,17 +17,38 @@ See the License for the specific language governing permissions and
 limitations under the License.
 """
 
+import bz2
+import cProfile
+import contextlib
 import datetime
+import functools
 import gzip
+import hashlib
+import io
+import itertools
+import json
+import lzma
+import marshal
 import pickle
+import struct
+import tempfile
 import uuid
+import zlib
 import collections
+import concurrent.futures
+import threading
+import time
+import tracemalloc
+import types
 from copy import deepcopy
-from typing import Optional, Union, List, Tuple, Iterable
+from typing import Optional, Union, List, Tuple, Iterable, NamedTuple
 
 import logging
 import os
 
+import numpy as np
+import psutil
+
 from . import utils
 
 
@@ -132,6 +153,667 @@ class Info:
         self.children.update({id(info): info for info in infos})
 
 
+class Codec:
+    """
+    A compression scheme that a :class:`Beet` can be saved with.
+
+    Subclasses should set a unique ``name`` and implement :meth:`Codec.writer` and :meth:`Codec.reader`.
+    Register them with :func:`register_codec` so that :meth:`Beet.load` can find them by the name recorded in each file.
+    """
+
+    name = None
+    default_level = None
+
+    def __init__(self, level: Optional[int] = None):
+        """
+        Parameters
+        ----------
+        level : :class:`int`
+            The compression level to use. If ``None``, the codec's ``default_level`` is used.
+        """
+        if level is None:
+            level = self.default_level
+        self.level = level
+
+    def __str__(self):
+        if self.level is None:
+            return self.name
+        return f'{self.name} (level {self.level})'
+
+    def __repr__(self):
+        return f'{self.__class__.__name__}(level = {self.level})'
+
+    def writer(self, file):
+        """Return a context manager which wraps the binary `file` in a compressing stream. Exiting it must not close `file`."""
+        raise NotImplementedError
+
+    def reader(self, file):
+        """Return a context manager which wraps the binary `file` in a decompressing stream. Exiting it must not close `file`."""
+        raise NotImplementedError
+
+
+class NoCodec(Codec):
+    """Store the pickle stream without compression."""
+
+    name = 'none'
+
+    @contextlib.contextmanager
+    def writer(self, file):
+        yield file
+
+    @contextlib.contextmanager
+    def reader(self, file):
+        yield file
+
+
+class GzipCodec(Codec):
+    """Compress with :mod:`gzip`. Level 9 (the default) matches the behavior of :func:`gzip.open`."""
+
+    name = 'gzip'
+    default_level = 9
+
+    @contextlib.contextmanager
+    def writer(self, file):
+        with gzip.GzipFile(filename = '', mode = 'wb', compresslevel = self.level, fileobj = file) as stream:
+            yield stream
+
+    @contextlib.contextmanager
+    def reader(self, file):
+        with gzip.GzipFile(mode = 'rb', fileobj = file) as stream:
+            yield stream
+
+
+class LzmaCodec(Codec):
+    """Compress with :mod:`lzma`. Slow, but produces the smallest files of the standard library codecs."""
+
+    name = 'lzma'
+    default_level = 6
+
+    @contextlib.contextmanager
+    def writer(self, file):
+        with lzma.LZMAFile(file, mode = 'wb', preset = self.level) as stream:
+            yield stream
+
+    @contextlib.contextmanager
+    def reader(self, file):
+        with lzma.LZMAFile(file, mode = 'rb') as stream:
+            yield stream
+
+
+class Bz2Codec(Codec):
+    """Compress with :mod:`bz2`."""
+
+    name = 'bz2'
+    default_level = 9
+
+    @contextlib.contextmanager
+    def writer(self, file):
+        with bz2.BZ2File(file, mode = 'wb', compresslevel = self.level) as stream:
+            yield stream
+
+    @contextlib.contextmanager
+    def reader(self, file):
+        with bz2.BZ2File(file, mode = 'rb') as stream:
+            yield stream
+
+
+class Lz4Codec(Codec):
+    """Compress with LZ4 frames. Very fast, with a modest compression ratio. Requires the optional ``lz4`` package."""
+
+    name = 'lz4'
+    default_level = 0
+
+    @contextlib.contextmanager
+    def writer(self, file):
+        with lz4.frame.LZ4FrameFile(file, mode = 'wb', compression_level = self.level) as stream:
+            yield stream
+
+    @contextlib.contextmanager
+    def reader(self, file):
+        with lz4.frame.LZ4FrameFile(file, mode = 'rb') as stream:
+            yield stream
+
+
+class ZstdCodec(Codec):
+    """Compress with Zstandard. Fast, with a compression ratio comparable to gzip. Requires the optional ``zstandard`` package."""
+
+    name = 'zstd'
+    default_level = 3
+
+    @contextlib.contextmanager
+    def writer(self, file):
+        with zstandard.ZstdCompressor(level = self.level).stream_writer(file, closefd = False) as stream:
+            yield stream
+
+    @contextlib.contextmanager
+    def reader(self, file):
+        with zstandard.ZstdDecompressor().stream_reader(file, closefd = False) as raw:
+            yield io.BufferedReader(raw)  # pickle needs readline, which the raw zstd reader doesn't provide
+
+
+class ParallelGzipCodec(Codec):
+    """
+    Compress with gzip, using a pool of threads (like ``pigz``).
+
+    The stream is split into blocks which are compressed independently and written as the members of a multi-member gzip stream, so the output can still be read by any gzip decompressor.
+    Each member records its own compressed size in a gzip extra field, which lets the matching reader find the member boundaries and decompress them in parallel as well.
+    :mod:`zlib` releases the GIL while it works, so threads are enough to keep every core busy.
+    """
+
+    name = 'pgzip'
+    default_level = 6
+
+    def __init__(self, level: Optional[int] = None, threads: Optional[int] = None, block_size: int = 4 * 1024 * 1024):
+        """
+        Parameters
+        ----------
+        level : :class:`int`
+            The compression level to use.
+        threads : :class:`int`
+            The number of threads to compress and decompress with. Defaults to the number of CPUs.
+        block_size : :class:`int`
+            The number of uncompressed bytes in each gzip member.
+        """
+        super().__init__(level = level)
+
+        if threads is None:
+            threads = os.cpu_count() or 1
+        self.threads = threads
+        self.block_size = block_size
+
+    def __repr__(self):
+        return f'{self.__class__.__name__}(level = {self.level}, threads = {self.threads}, block_size = {self.block_size})'
+
+    @contextlib.contextmanager
+    def writer(self, file):
+        with _ParallelGzipWriter(file, level = self.level, threads = self.threads, block_size = self.block_size) as stream:
+            yield stream
+
+    @contextlib.contextmanager
+    def reader(self, file):
+        with io.BufferedReader(_ParallelGzipReader(file, threads = self.threads)) as stream:
+            yield stream
+
+
+_PGZIP_HEADER = struct.Struct('<2sBBIBBH2sHI')  # ID1 ID2, CM, FLG, MTIME, XFL, OS, XLEN, subfield ID, subfield length, member size
+_PGZIP_SUBFIELD = b'SM'
+_PGZIP_TRAILER = struct.Struct('<II')  # CRC32, ISIZE
+
+
+def _compress_gzip_member(data: bytes, level: int) -> bytes:
+    """Compress `data` into a complete gzip member that records its own size."""
+    compressor = zlib.compressobj(level, zlib.DEFLATED, -zlib.MAX_WBITS)
+    body = compressor.compress(data) + compressor.flush()
+
+    member_size = _PGZIP_HEADER.size + len(body) + _PGZIP_TRAILER.size
+    header = _PGZIP_HEADER.pack(_GZIP_MAGIC, 8, 4, 0, 0, 255, 8, _PGZIP_SUBFIELD, 4, member_size)  # FLG = FEXTRA, OS = unknown
+    trailer = _PGZIP_TRAILER.pack(zlib.crc32(data), len(data) & 0xffffffff)
+
+    return header + body + trailer
+
+
+def _decompress_gzip_member(member: bytes) -> bytes:
+    """Decompress a gzip member written by :func:`_compress_gzip_member`, checking its CRC and length."""
+    data = zlib.decompress(member[_PGZIP_HEADER.size:-_PGZIP_TRAILER.size], -zlib.MAX_WBITS)
+
+    crc, size = _PGZIP_TRAILER.unpack(member[-_PGZIP_TRAILER.size:])
+    if zlib.crc32(data) != crc or len(data) & 0xffffffff != size:
+        raise zlib.error('CRC or length check failed for parallel gzip member')
+
+    return data
+
+
+class _ParallelGzipWriter(io.RawIOBase):
+    """A writable stream that compresses blocks of its input in a thread pool and writes them to `file` in order. Closing it does not close `file`."""
+
+    def __init__(self, file, level: int, threads: int, block_size: int):
+        self.file = file
+        self.level = level
+        self.threads = threads
+        self.block_size = block_size
+
+        self.buffer = bytearray()
+        self.pending = collections.deque()
+        self.executor = concurrent.futures.ThreadPoolExecutor(max_workers = threads)
+
+    def writable(self):
+        return True
+
+    def write(self, data):
+        with memoryview(data) as view:  # pickle may hand us any buffer, not just bytes
+            self.buffer += view
+            length = view.nbytes
+
+        while len(self.buffer) >= self.block_size:
+            self._submit(bytes(self.buffer[:self.block_size]))
+            del self.buffer[:self.block_size]
+
+        return length
+
+    def _submit(self, block: bytes):
+        self.pending.append(self.executor.submit(_compress_gzip_member, block, self.level))
+
+        while len(self.pending) > 2 * self.threads:  # bound the memory held by blocks in flight
+            self.file.write(self.pending.popleft().result())
+
+    def close(self):
+        if self.closed:
+            return
+
+        try:
+            if len(self.buffer) > 0:
+                self._submit(bytes(self.buffer))
+                self.buffer.clear()
+            while len(self.pending) > 0:
+                self.file.write(self.pending.popleft().result())
+        finally:
+            self.executor.shutdown()
+            super().close()
+
+
+class _ParallelGzipReader(io.RawIOBase):
+    """A readable stream that decompresses the members of a stream written by :class:`_ParallelGzipWriter` in a thread pool. Closing it does not close `file`."""
+
+    def __init__(self, file, threads: int):
+        self.file = file
+        self.threads = threads
+
+        self.block = memoryview(b'')
+        self.pending = collections.deque()
+        self.exhausted = False
+        self.executor = concurrent.futures.ThreadPoolExecutor(max_workers = threads)
+
+    def readable(self):
+        return True
+
+    def _read_member(self) -> Optional[bytes]:
+        header = self.file.read(_PGZIP_HEADER.size)
+        if len(header) == 0:
+            return None
+
+        if len(header) < _PGZIP_HEADER.size:
+            raise EOFError('Parallel gzip stream ended in the middle of a member header')
+
+        magic, _, flags, _, _, _, _, subfield, _, member_size = _PGZIP_HEADER.unpack(header)
+        if magic != _GZIP_MAGIC or flags != 4 or subfield != _PGZIP_SUBFIELD:
+            raise zlib.error('Not a parallel gzip member')
+
+        rest = self.file.read(member_size - _PGZIP_HEADER.size)
+        if len(rest) < member_size - _PGZIP_HEADER.size:
+            raise EOFError('Parallel gzip stream ended in the middle of a member')
+
+        return header + rest
+
+    def _fill(self):
+        while not self.exhausted and len(self.pending) < 2 * self.threads:
+            member = self._read_member()
+            if member is None:
+                self.exhausted = True
+            else:
+                self.pending.append(self.executor.submit(_decompress_gzip_member, member))
+
+    def readinto(self, buffer):
+        while len(self.block) == 0:
+            self._fill()
+            if len(self.pending) == 0:
+                return 0
+            self.block = memoryview(self.pending.popleft().result())
+
+        length = min(len(buffer), len(self.block))
+        buffer[:length] = self.block[:length]
+        self.block = self.block[length:]
+
+        return length
+
+    def close(self):
+        if self.closed:
+            return
+
+        for future in self.pending:
+            future.cancel()
+        self.executor.shutdown()
+        super().close()
+
+
+CODECS = {}
+
+
+def register_codec(codec_type: type) -> type:
+    """
+    Register a :class:`Codec` subclass under its ``name`` so that Beets can be saved and loaded with it.
+
+    Can be used as a class decorator.
+    """
+    CODECS[codec_type.name] = codec_type
+
+    return codec_type
+
+
+for _codec_type in (NoCodec, GzipCodec, ParallelGzipCodec, LzmaCodec, Bz2Codec):
+    register_codec(_codec_type)
+
+try:
+    import lz4.frame
+
+    register_codec(Lz4Codec)
+except ImportError:
+    pass
+
+try:
+    import zstandard
+
+    register_codec(ZstdCodec)
+except ImportError:
+    pass
+
+
+def get_codec(codec: Union[str, Codec], level: Optional[int] = None) -> Codec:
+    """
+    Return a :class:`Codec` instance.
+
+    Parameters
+    ----------
+    codec
+        The name of a registered codec, or a :class:`Codec` instance (which is returned as-is if `level` is ``None``).
+    level : :class:`int`
+        The compression level for the codec. If ``None``, the codec's default level is used.
+
+    Returns
+    -------
+    :class:`Codec`
+    """
+    if isinstance(codec, Codec):
+        if level is None:
+            return codec
+        codec = codec.name
+
+    try:
+        return CODECS[codec](level = level)
+    except KeyError:
+        raise SimulacraException(f"Unknown codec '{codec}'. Registered codecs are {sorted(CODECS)}. Optional codecs require their package to be installed.")
+
+
+BEET_MAGIC = b'\x89BEET\r\n\n'  # the first bytes of every Beet file written by this version of Simulacra
+BEET_FORMAT_VERSION = 1
+_BEET_PREFIX = struct.Struct('<8sBI')  # magic, format version, header length
+_GZIP_MAGIC = b'\x1f\x8b'
+_PICKLE_PROTOCOL_MAGIC = b'\x80'  # the PROTO opcode that starts every pickle of protocol 2 or higher
+BUFFER_ALIGNMENT = 64  # byte alignment of out-of-band buffers in Beet files, enough for any NumPy dtype and for SIMD loads
+_HEADER_SLACK = 20  # spare header bytes, enough to fill in any payload size after the payload has been written
+BEET_TRAILER_MAGIC = b'\x89TEEB\r\n\n'  # the last bytes of every Beet file with an integrity trailer
+_BEET_TRAILER = struct.Struct('<QI8s')  # body length, body CRC32, magic
+
+
+def _json_default(obj):
+    """Make the non-JSON types that show up in Beet metadata serializable."""
+    if isinstance(obj, datetime.datetime):
+        return obj.isoformat()
+    elif isinstance(obj, datetime.timedelta):
+        return obj.total_seconds()
+    elif isinstance(obj, uuid.UUID):
+        return str(obj)
+
+    raise TypeError(f'{obj!r} is not JSON serializable')
+
+
+def _write_beet_header(file, header: dict, length: Optional[int] = None) -> int:
+    """
+    Write the Beet file prefix and JSON `header` to `file`, padded with whitespace to `length` bytes.
+
+    If `length` is ``None``, some slack is left so that the header can be rewritten in place once more is known about the payload.
+    Returns the padded length of the header.
+    """
+    header_bytes = json.dumps(header, default = _json_default).encode('utf-8')
+    if length is None:
+        length = len(header_bytes) + _HEADER_SLACK
+    elif len(header_bytes) > length:
+        raise SimulacraException(f'Beet file header needs {len(header_bytes)} bytes, but only {length} were reserved')
+
+    file.write(_BEET_PREFIX.pack(BEET_MAGIC, BEET_FORMAT_VERSION, length))
+    file.write(header_bytes.ljust(length))
+
+    return length
+
+
+def _read_beet_header(file) -> dict:
+    """
+    Read the Beet file header from `file`, leaving it positioned at the start of the payload.
+
+    Files written before the header was introduced are recognized as bare pickles, compressed with gzip or not, and get a synthetic header recording which.
+    """
+    prefix = file.read(_BEET_PREFIX.size)
+
+    if len(prefix) > 0 and prefix[:len(BEET_MAGIC)] == BEET_MAGIC[:len(prefix)]:
+        if len(prefix) < _BEET_PREFIX.size:
+            raise EOFError('Beet file ended in the middle of its header')
+
+        _, version, header_length = _BEET_PREFIX.unpack(prefix)
+        if version > BEET_FORMAT_VERSION:
+            raise SimulacraException(f'Beet file format version {version} is newer than the supported version {BEET_FORMAT_VERSION}')
+
+        header_bytes = file.read(header_length)
+        if len(header_bytes) < header_length:
+            raise EOFError('Beet file ended in the middle of its header')
+
+        return json.loads(header_bytes.decode('utf-8'))
+
+    file.seek(0)
+    if prefix[:len(_GZIP_MAGIC)] == _GZIP_MAGIC:
+        return {'codec': GzipCodec.name}
+    else:
+        return {'codec': NoCodec.name}
+
+
+class _BoundedReader(io.RawIOBase):
+    """A read-only view of the next `length` bytes of `file`. Closing it does not close `file`."""
+
+    def __init__(self, file, length: int):
+        self.file = file
+        self.remaining = length
+
+    def readable(self):
+        return True
+
+    def readinto(self, buffer):
+        length = min(len(buffer), self.remaining)
+        if length == 0:
+            return 0
+
+        length = self.file.readinto(memoryview(buffer)[:length])
+        self.remaining -= length
+
+        return length
+
+
+class _ChecksummingWriter(io.RawIOBase):
+    """A write-only view of `file` that keeps a running CRC32 and length of everything written through it. Closing it does not close `file`."""
+
+    def __init__(self, file):
+        self.file = file
+        self.crc = 0
+        self.length = 0
+
+    def writable(self):
+        return True
+
+    def write(self, data):
+        with memoryview(data) as view:
+            self.crc = zlib.crc32(view, self.crc)
+            self.length += view.nbytes
+            return self.file.write(view)
+
+    def tell(self):
+        return self.file.tell()
+
+
+def _align(position: int, alignment: int = BUFFER_ALIGNMENT) -> int:
+    """Return the smallest multiple of `alignment` that is at least `position`."""
+    return -(-position // alignment) * alignment
+
+
+def _write_out_of_band_buffers(file, buffers: List[pickle.PickleBuffer]):
+    """Write `buffers` to `file` starting at the next aligned position, with each buffer aligned."""
+    for buffer in buffers:
+        file.write(bytes(_align(file.tell()) - file.tell()))
+        file.write(buffer.raw())
+
+
+def _out_of_band_buffer_layout(buffers: List[pickle.PickleBuffer]) -> List[Tuple[int, int]]:
+    """Return the ``(offset, length)`` of each buffer, relative to the start of the aligned buffer section written by :func:`_write_out_of_band_buffers`."""
+    layout = []
+    offset = 0
+    for buffer in buffers:
+        offset = _align(offset)
+        length = buffer.raw().nbytes
+        layout.append((offset, length))
+        offset += length
+
+    return layout
+
+
+def _read_out_of_band_buffers(file, header: dict, mmap: bool = False) -> list:
+    """
+    Read the out-of-band buffers described by `header` from `file`, which must be positioned at the start of the payload. The position is restored afterwards.
+
+    If `mmap` is ``True``, the buffers are copy-on-write views into a :class:`numpy.memmap` of the file instead of in-memory copies.
+    """
+    payload_start = file.tell()
+    section_start = _align(payload_start + header['payload_size'])
+
+    if mmap:
+        mapped = np.memmap(file.name, dtype = np.uint8, mode = 'c')
+        buffers = [mapped[section_start + offset: section_start + offset + length] for offset, length in header['buffers']]
+    else:
+        buffers = []
+        for offset, length in header['buffers']:
+            buffer = bytearray(length)
+            file.seek(section_start + offset)
+            file.readinto(buffer)
+            buffers.append(buffer)
+
+    file.seek(payload_start)
+
+    return buffers
+
+
+TIME_SERIES_CHUNK_BYTES = 1024 * 1024  # time series attributes are stored in independently compressed chunks of (about) this many bytes
+_PLACEHOLDER_OFFSET = 10 ** 15  # wider than any real offset, so a header written with placeholders has room for the real values
+
+
+class _BeetPickler(pickle.Pickler):
+    """A pickler that replaces the objects in `external` (a mapping of ``id(obj)`` to key) with persistent references to them, to be stored elsewhere in the file."""
+
+    def __init__(self, file, external: dict, **kwargs):
+        super().__init__(file, **kwargs)
+        self.external = external
+
+    def persistent_id(self, obj):
+        return self.external.get(id(obj))
+
+
+class _BeetUnpickler(pickle.Unpickler):
+    """An unpickler that resolves the persistent references written by :class:`_BeetPickler` from `external` (a mapping of key to object)."""
+
+    def __init__(self, file, external: dict, **kwargs):
+        super().__init__(file, **kwargs)
+        self.external = external
+
+    def persistent_load(self, pid):
+        try:
+            return self.external[pid]
+        except KeyError:
+            raise pickle.UnpicklingError(f'Beet file is missing the data for persistent reference {pid}')
+
+
+def _dump_beet(beet: 'Beet', stream, time_series: dict, **kwargs):
+    """Pickle `beet` to `stream`, leaving references to the arrays in `time_series` instead of the arrays themselves."""
+    if len(time_series) == 0:
+        pickle.dump(beet, stream, **kwargs)
+    else:
+        external = {id(array): ('time_series', name) for name, array in time_series.items()}
+        _BeetPickler(stream, external, **kwargs).dump(beet)
+
+
+def _compress_bytes(codec: Codec, data) -> bytes:
+    buffer = io.BytesIO()
+    with codec.writer(buffer) as stream:
+        stream.write(data)
+
+    return buffer.getvalue()
+
+
+def _decompress_bytes(codec: Codec, data: bytes) -> bytes:
+    with codec.reader(io.BytesIO(data)) as stream:
+        return stream.read()
+
+
+def _time_series_chunk_rows(array: np.ndarray) -> int:
+    return max(TIME_SERIES_CHUNK_BYTES // max(array[:1].nbytes, 1), 1)
+
+
+def _time_series_index(time_series: dict, placeholder: bool = False) -> dict:
+    """Return the header entries for `time_series`, optionally with placeholder chunk offsets and lengths."""
+    index = {}
+    for name, array in time_series.items():
+        rows = _time_series_chunk_rows(array)
+        index[name] = {
+            'dtype': array.dtype.str,
+            'shape': array.shape,
+            'rows': rows,
+            'chunks': [[_PLACEHOLDER_OFFSET, _PLACEHOLDER_OFFSET]] * len(range(0, len(array), rows)) if placeholder else [],
+        }
+
+    return index
+
+
+def _write_time_series(file, time_series: dict, codec: Codec) -> dict:
+    """Write each array in `time_series` to the end of `file` as independently compressed chunks, returning their index."""
+    index = _time_series_index(time_series)
+    for name, array in time_series.items():
+        array = np.ascontiguousarray(array)
+        rows = index[name]['rows']
+        for start in range(0, len(array), rows):
+            chunk = _compress_bytes(codec, memoryview(array[start:start + rows]).cast('B'))
+            index[name]['chunks'].append([file.tell(), len(chunk)])
+            file.write(chunk)
+
+    return index
+
+
+def _read_time_series_chunks(file, codec: Codec, entry: dict, start: int = 0, stop: Optional[int] = None) -> np.ndarray:
+    """Read the rows ``[start, stop)`` of a time series from `file`, decompressing only the chunks that overlap them."""
+    shape = tuple(entry['shape'])
+    dtype = np.dtype(entry['dtype'])
+    rows = entry['rows']
+
+    start, stop, _ = slice(start, stop).indices(shape[0])
+    stop = max(start, stop)
+
+    array = np.empty((stop - start,) + shape[1:], dtype = dtype)
+    for chunk_index in range(start // rows, -(-stop // rows)):
+        offset, length = entry['chunks'][chunk_index]
+        file.seek(offset)
+        chunk = np.frombuffer(_decompress_bytes(codec, file.read(length)), dtype = dtype).reshape((-1,) + shape[1:])
+
+        chunk_start = chunk_index * rows
+        lower, upper = max(start, chunk_start), min(stop, chunk_start + len(chunk))
+        array[lower - start: upper - start] = chunk[lower - chunk_start: upper - chunk_start]
+
+    return array
+
+
+def _read_time_series(file, header: dict) -> dict:
+    """Read every time series described by `header` from `file`, keyed by their persistent references. The file position is restored afterwards."""
+    position = file.tell()
+    codec = get_codec(header['codec'])
+
+    time_series = {('time_series', name): _read_time_series_chunks(file, codec, entry) for name, entry in header['time_series'].items()}
+
+    file.seek(position)
+
+    return time_series
+
+
 class Beet:
     """
     A class that provides an easy interface for pickling and unpickling instances.
@@ -142,8 +824,19 @@ class Beet:
     ----------
     uuid
         A `Universally Unique Identifier <https://en.wikipedia.org/wiki/Universally_unique_identifier>`_ for the :class:`Beet`.
+    codec
+        A class attribute which determines the default compression codec used by :meth:`Beet.save`, either the name of a registered codec or a :class:`Codec` instance.
+    immutable_attributes
+        A class attribute naming attributes that are never modified after initialization, which ``clone(share_immutable = True)`` shares instead of copying.
+    time_series_attributes
+        A class attribute naming array attributes (typically per-timestep data) that :meth:`Beet.save` stores as independently compressed chunks along their first axis, outside the pickle.
+        Slices of them can be read with :meth:`Beet.load_slice` without loading the rest of the Beet.
     """
 
+    codec = GzipCodec.name
+    immutable_attributes = frozenset()
+    time_series_attributes = frozenset()
+
     def __init__(self, name: str, file_name: Optional[str] = None):
         """
         Parameters
@@ -165,7 +858,7 @@ class Beet:
         self.initialized_at = datetime.datetime.utcnow()
         self.uuid = uuid.uuid4()
 
-        logger.info('Initialized {}'.format(repr(self)))
+        logger.info('Initialized %r', self)  # formatted lazily, since many small Beets may be created
 
     def __str__(self):
         if self.name != self.file_name:
@@ -184,7 +877,7 @@ class Beet:
         """The hash of the Beet is the hash of its UUID."""
         return hash(self.uuid)
 
-    def clone(self, **kwargs) -> 'Beet':
+    def clone(self, share_immutable: bool = False, **kwargs) -> 'Beet':
         """
         Return a deepcopy of the Beet.
 
@@ -192,6 +885,10 @@ class Beet:
 
         Parameters
         ----------
+        share_immutable : :class:`bool`
+            If ``True``, attributes named in the class's ``immutable_attributes`` and read-only NumPy arrays (``array.flags.writeable == False``) are shared with the new Beet instead of being copied.
+            Everything else is still deep-copied.
+            This makes cloning Beets that carry large read-only data (grids, potentials, etc.) fast and cheap.
         kwargs
             Key-value pairs to modify attributes on the new Beet.
 
@@ -200,17 +897,25 @@ class Beet:
         :class:`Beet`
             The new (possibly modified) :class:`Beet`.
         """
-        new_beet = deepcopy(self)
+        memo = {}
+        if share_immutable:
+            for name, value in self.__dict__.items():
+                if name in self.immutable_attributes or (isinstance(value, np.ndarray) and not value.flags.writeable):
+                    memo[id(value)] = value  # deepcopy returns memoized objects as-is
+
+        new_beet = deepcopy(self, memo)
 
         for k, v in kwargs.items():
             setattr(new_beet, k, v)
 
         return new_beet
 
-    def save(self, target_dir: Optional[str] = None, file_extension: str = '.beet', compressed: bool = True) -> str:
+    def save(self, target_dir: Optional[str] = None, file_extension: str = '.beet', compressed: bool = True, codec: Optional[Union[str, Codec]] = None, compression_level: Optional[int] = None, out_of_band: bool = False, extra_metadata: Optional[dict] = None) -> str:
         """
         Atomically pickle the Beet to a file.
 
+        The file begins with a small header that records which codec was used, so that :meth:`Beet.load` doesn't need to guess, as well as the Beet's :meth:`Beet.metadata`, which can be read back with :meth:`Beet.peek`.
+
         Parameters
         ----------
         target_dir : :class:`str`
@@ -218,7 +923,17 @@ class Beet:
         file_extension : :class:`str`
             The file extension to name the Beet with (for keeping track of things, no actual effect).
         compressed : :class:`bool`
-            Whether to compress the Beet using gzip.
+            Whether to compress the Beet. If ``False``, `codec` is ignored.
+        codec
+            The name of a registered codec or a :class:`Codec` instance to compress with. Defaults to the class's ``codec`` attribute.
+        compression_level : :class:`int`
+            The compression level to pass to the codec. If ``None``, the codec's default level is used.
+        out_of_band : :class:`bool`
+            If ``True``, the raw data of contiguous NumPy arrays (and anything else that supports pickle protocol 5 out-of-band buffers) is written uncompressed and aligned after the pickle, instead of being copied through it.
+            Only the (small) remaining pickle stream is compressed.
+            Files saved this way can be loaded with ``mmap = True`` to avoid reading the array data until it is used.
+        extra_metadata : :class:`dict`
+            Entries to add to the Beet's :meth:`Beet.metadata` in the header of this file only.
 
         Returns
         -------
@@ -228,27 +943,68 @@ class Beet:
         if target_dir is None:
             target_dir = os.getcwd()
 
+        if not compressed:
+            codec = NoCodec.name
+        elif codec is None:
+            codec = self.codec
+        codec = get_codec(codec, level = compression_level)
+
         file_path = os.path.join(target_dir, self.file_name + file_extension)
         file_path_working = file_path + '.working'
 
         utils.ensure_dir_exists(file_path_working)
 
-        if compressed:
-            op = gzip.open
-        else:
-            op = open
+        header = {
+            'codec': codec.name,
+            'payload_size': 0,
+            'trailer': True,
+            'metadata': {**self.metadata(), **(extra_metadata or {})},
+        }
+
+        time_series = self._time_series()
+        if len(time_series) > 0:
+            header['time_series'] = _time_series_index(time_series, placeholder = True)
+
+        with open(file_path_working, mode = 'wb') as file:
+            body = _ChecksummingWriter(file)  # everything after the header goes through here, so that the trailer can record its length and checksum
+
+            if out_of_band:
+                buffers = []
+                payload = io.BytesIO()
+                with codec.writer(payload) as stream:
+                    _dump_beet(self, stream, time_series, protocol = 5, buffer_callback = buffers.append)
+
+                header['payload_size'] = payload.tell()
+                header['buffers'] = _out_of_band_buffer_layout(buffers)
 
-        with op(file_path_working, mode = 'wb') as file:
-            pickle.dump(self, file, protocol = -1)
+                header_length = _write_beet_header(file, header)
+                body.write(payload.getbuffer())
+                _write_out_of_band_buffers(body, buffers)
+            else:
+                header_length = _write_beet_header(file, header)
+                payload_start = file.tell()
+
+                with codec.writer(body) as stream:
+                    _dump_beet(self, stream, time_series, protocol = -1)
+
+                header['payload_size'] = file.tell() - payload_start
+
+            if len(time_series) > 0:
+                header['time_series'] = _write_time_series(body, time_series, codec)
+
+            file.write(_BEET_TRAILER.pack(body.length, body.crc, BEET_TRAILER_MAGIC))
+
+            file.seek(0)
+            _write_beet_header(file, header, length = header_length)  # now that the sizes and offsets are known
 
         os.replace(file_path_working, file_path)
 
-        logger.debug('Saved {} {} to {}'.format(self.__class__.__name__, self.name, file_path))
+        logger.debug('Saved {} {} to {} using codec {}'.format(self.__class__.__name__, self.name, file_path, codec))
 
         return file_path
 
     @classmethod
-    def load(cls, file_path: str) -> 'Beet':
+    def load(cls, file_path: str, mmap: bool = False) -> 'Beet':
         """
         Load a Beet from `file_path`.
 
@@ -256,51 +1012,342 @@ class Beet:
         ----------
         file_path
             The path to load a Beet from.
+        mmap : :class:`bool`
+            If ``True`` and the Beet was saved with ``out_of_band = True``, its arrays are backed by a copy-on-write :class:`numpy.memmap` of the file instead of being read into memory.
+            Array data is only read from disk when it is accessed, and modifying the arrays does not modify the file.
+            Has no effect on other files.
 
         Returns
         -------
         :class:`Beet`
             The loaded Beet.
         """
-        try:
-            with gzip.open(file_path, mode = 'rb') as file:
-                beet = pickle.load(file)
-        except OSError:
-            with open(file_path, mode = 'rb') as file:
-                beet = pickle.load(file)
-
-        logger.debug('Loaded {} {} from {}'.format(beet.__class__.__name__, beet.name, file_path))
+        with open(file_path, mode = 'rb') as file:
+            header = _read_beet_header(file)
 
-        return beet
+            buffers = None
+            if 'buffers' in header:
+                buffers = _read_out_of_band_buffers(file, header, mmap = mmap)
 
-    def info(self) -> Info:
-        return Info(header = str(self))
+            time_series = {}
+            if 'time_series' in header:
+                time_series = _read_time_series(file, header)
 
+            payload = file
+            if 'payload_size' in header:
+                payload = io.BufferedReader(_BoundedReader(file, header['payload_size']))  # don't let the decompressor read into the data after the payload
 
-class Specification(Beet):
-    """
-    A class that contains the information necessary to run a simulation.
+            with get_codec(header['codec']).reader(payload) as stream:
+                beet = _BeetUnpickler(stream, time_series, buffers = buffers).load()
 
-    It should be subclassed for each type of simulation and all additional information necessary to run that kind of simulation should be added via keyword arguments.
+        logger.debug('Loaded {} {} from {}'.format(beet.__class__.__name__, beet.name, file_path))
 
-    Any number of additional keyword arguments can be passed to the constructor.
-    They will be stored as attributes if they don't conflict with any attributes already set.
+        return beet
 
-    Attributes
-    ----------
-    simulation_type
-        A class attribute which determines what kind of :class:`Simulation` will be generated via :func:`Specification.to_simulation`.
-    uuid
-        A `Universally Unique Identifier <https://en.wikipedia.org/wiki/Universally_unique_identifier>`_ for the :class:`Specification`.
-    """
+    @classmethod
+    def load_slice(cls, file_path: str, attribute: str, start: int = 0, stop: Optional[int] = None) -> np.ndarray:
+        """
+        Read the rows ``[start, stop)`` (along the first axis) of one of the ``time_series_attributes`` of the Beet saved at `file_path`.
 
-    simulation_type = None
+        Only the header and the chunks that overlap the requested rows are read and decompressed; the Beet itself is not unpickled.
 
-    def __init__(self, name: str, file_name: Optional[str] = None, **kwargs):
-        """
         Parameters
         ----------
-        name : :class:`str`
+        file_path
+            The path to the saved Beet.
+        attribute : :class:`str`
+            The name of the time series attribute.
+        start : :class:`int`
+            The first row to read.
+        stop : :class:`int`
+            One past the last row to read. If ``None``, read to the end.
+
+        Returns
+        -------
+        :class:`numpy.ndarray`
+            The requested rows.
+        """
+        with open(file_path, mode = 'rb') as file:
+            header = _read_beet_header(file)
+
+            try:
+                entry = header['time_series'][attribute]
+            except KeyError:
+                raise SimulacraException(f'{file_path} does not contain a time series named {attribute}')
+
+            return _read_time_series_chunks(file, get_codec(header['codec']), entry, start = start, stop = stop)
+
+    def _time_series(self) -> dict:
+        """Return the ``time_series_attributes`` of this Beet that can be stored as chunks."""
+        return {
+            name: self.__dict__[name]
+            for name in sorted(self.time_series_attributes)
+            if _is_chunkable(self.__dict__.get(name))
+        }
+
+    @staticmethod
+    def save_many(beets: Iterable['Beet'], target_dir: Optional[str] = None, workers: Optional[int] = None, **kwargs) -> Iterable[utils.BatchResult]:
+        """
+        Save many Beets using a pool of threads, so that their compression and file I/O overlap.
+
+        Each Beet is saved with its own ``save`` method, so subclasses keep their file extensions.
+        Results are yielded in input order as they become available; a Beet that fails to save doesn't stop the others.
+
+        Parameters
+        ----------
+        beets
+            An iterable of Beets to save.
+        target_dir : :class:`str`
+            The directory to save the Beets to.
+        workers : :class:`int`
+            The number of threads to use. Defaults to the number of cores on the computer.
+        kwargs
+            Keyword arguments are passed to each Beet's ``save`` method.
+
+        Returns
+        -------
+        iterable of :class:`simulacra.utils.BatchResult`
+            For each Beet, ``(beet, path, exception)``.
+        """
+        return utils.thread_map(lambda beet: beet.save(target_dir = target_dir, **kwargs), beets, workers = workers)
+
+    @classmethod
+    def load_many(cls, file_paths: Iterable[str], workers: Optional[int] = None, **kwargs) -> Iterable[utils.BatchResult]:
+        """
+        Load many Beets using a pool of threads, so that their decompression and file I/O overlap.
+
+        Results are yielded in input order as they become available; a file that fails to load doesn't stop the others.
+
+        Parameters
+        ----------
+        file_paths
+            An iterable of paths to load Beets from.
+        workers : :class:`int`
+            The number of threads to use. Defaults to the number of cores on the computer.
+        kwargs
+            Keyword arguments are passed to :meth:`Beet.load`.
+
+        Returns
+        -------
+        iterable of :class:`simulacra.utils.BatchResult`
+            For each path, ``(path, beet, exception)``.
+        """
+        return utils.thread_map(lambda file_path: cls.load(file_path, **kwargs), file_paths, workers = workers)
+
+    @classmethod
+    def verify(cls, file_path: str, checksum: bool = True) -> bool:
+        """
+        Check whether the Beet file at `file_path` is complete and uncorrupted, without decompressing or unpickling it.
+
+        The length recorded in the file's trailer is checked against the size of the file, which takes constant time and catches truncated files.
+        If `checksum` is ``True``, the CRC32 recorded in the trailer is also checked by streaming through the file.
+
+        Parameters
+        ----------
+        file_path
+            The path to the saved Beet.
+        checksum : :class:`bool`
+            Whether to check the checksum as well as the length.
+
+        Returns
+        -------
+        :class:`bool`
+            ``True`` if the file passed the checks, ``False`` otherwise.
+        """
+        with open(file_path, mode = 'rb') as file:
+            file_size = os.fstat(file.fileno()).st_size
+            if file_size == 0:
+                logger.debug(f'{file_path} failed verification: empty')
+                return False
+
+            try:
+                header = _read_beet_header(file)
+            except (EOFError, ValueError) as e:
+                logger.debug(f'{file_path} failed verification: unreadable header ({e})')
+                return False
+
+            if not header.get('trailer', False):
+                file.seek(0)
+                start = file.read(max(len(BEET_MAGIC), len(_GZIP_MAGIC), len(_PICKLE_PROTOCOL_MAGIC)))
+                if not start.startswith((BEET_MAGIC, _GZIP_MAGIC, _PICKLE_PROTOCOL_MAGIC)):
+                    logger.debug(f'{file_path} failed verification: too short or not a Beet file')
+                    return False
+
+                raise SimulacraException(f'{file_path} has no integrity trailer, probably because it was saved by an older version of Simulacra')
+
+            body_start = file.tell()
+            if file_size < body_start + _BEET_TRAILER.size:
+                logger.debug(f'{file_path} failed verification: truncated')
+                return False
+
+            file.seek(file_size - _BEET_TRAILER.size)
+            body_length, crc, magic = _BEET_TRAILER.unpack(file.read(_BEET_TRAILER.size))
+            if magic != BEET_TRAILER_MAGIC or body_start + body_length + _BEET_TRAILER.size != file_size:
+                logger.debug(f'{file_path} failed verification: truncated or missing trailer')
+                return False
+
+            if checksum:
+                file.seek(body_start)
+                running_crc = 0
+                remaining = body_length
+                block = bytearray(1024 * 1024)
+                while remaining > 0:
+                    length = file.readinto(memoryview(block)[:min(remaining, len(block))])
+                    if length == 0:
+                        break
+                    running_crc = zlib.crc32(memoryview(block)[:length], running_crc)
+                    remaining -= length
+
+                if running_crc != crc:
+                    logger.debug(f'{file_path} failed verification: checksum mismatch')
+                    return False
+
+        return True
+
+    @classmethod
+    def peek(cls, file_path: str) -> dict:
+        """
+        Read the metadata of the Beet saved at `file_path` without unpickling it.
+
+        Only the file header is read, so this is much faster than :meth:`Beet.load` for large files.
+
+        Parameters
+        ----------
+        file_path
+            The path to the saved Beet.
+
+        Returns
+        -------
+        :class:`dict`
+            The :meth:`Beet.metadata` recorded when the Beet was saved, plus the ``codec`` and ``payload_size`` (in bytes) of the file.
+            Datetimes are ISO 8601 strings, time intervals are in seconds, and UUIDs are strings.
+        """
+        with open(file_path, mode = 'rb') as file:
+            header = _read_beet_header(file)
+
+        try:
+            metadata = header['metadata']
+        except KeyError:
+            raise SimulacraException(f'{file_path} has no metadata header, probably because it was saved by an older version of Simulacra')
+
+        return dict(metadata, codec = header['codec'], payload_size = header['payload_size'])
+
+    def metadata(self) -> dict:
+        """
+        Return a dictionary of summary information to store in the header of the saved Beet, where :meth:`Beet.peek` can read it back without unpickling.
+
+        Subclasses can extend the dictionary returned by ``super().metadata()``. Values must be JSON-serializable, :class:`datetime.datetime`, :class:`datetime.timedelta`, or :class:`uuid.UUID`.
+        """
+        return {
+            'class': f'{self.__class__.__module__}.{self.__class__.__qualname__}',
+            'name': self.name,
+            'file_name': self.file_name,
+            'uuid': self.uuid,
+            'initialized_at': self.initialized_at,
+        }
+
+    def info(self) -> Info:
+        return Info(header = str(self))
+
+
+_CONTENT_HASH_EXCLUDED = frozenset(('uuid', 'initialized_at'))  # attributes that differ between otherwise identical Beets
+
+
+def _update_content_hash(hasher, value, seen: set):
+    """Feed a canonical, type-tagged encoding of `value` into `hasher`, recursing into containers and object attributes."""
+    if isinstance(value, np.generic):  # NumPy scalars hash like the Python values they stand for, so sweeps built from lists and arrays agree
+        item = value.item()
+        if isinstance(item, np.generic):  # no Python equivalent (e.g. long double)
+            hasher.update(f'scalar {value.dtype.str}:'.encode())
+            hasher.update(value.tobytes())
+        else:
+            _update_content_hash(hasher, item, seen)
+    elif value is None or isinstance(value, (bool, int, float, complex, str, bytes)):
+        hasher.update(f'{type(value).__name__}:{value!r};'.encode())
+    elif isinstance(value, np.ndarray):
+        array = value
+        if array.dtype.hasobject:
+            hasher.update(f'object array {array.shape}:'.encode())
+            for item in array.flat:
+                _update_content_hash(hasher, item, seen)
+        else:
+            hasher.update(f'array {array.dtype.str} {array.shape}:'.encode())
+            hasher.update(np.ascontiguousarray(array).view(np.uint8).data)
+    elif isinstance(value, (datetime.datetime, datetime.timedelta, uuid.UUID)):
+        hasher.update(f'{type(value).__name__}:{value!r};'.encode())
+    elif isinstance(value, type) or callable(value) and hasattr(value, '__qualname__') and not isinstance(value, (types.FunctionType, types.MethodType)):
+        hasher.update(f'ref:{value.__module__}.{value.__qualname__};'.encode())
+    elif id(value) in seen:
+        hasher.update(b'cycle;')
+    else:
+        seen.add(id(value))
+        if isinstance(value, types.FunctionType):  # lambdas and closures with the same name can still compute different things
+            hasher.update(f'function {value.__module__}.{value.__qualname__}:'.encode())
+            hasher.update(marshal.dumps(value.__code__))
+            _update_content_hash(hasher, value.__defaults__, seen)
+            _update_content_hash(hasher, value.__kwdefaults__, seen)
+            for cell in value.__closure__ or ():
+                try:
+                    _update_content_hash(hasher, cell.cell_contents, seen)
+                except ValueError:  # the cell is empty
+                    hasher.update(b'empty cell;')
+        elif isinstance(value, types.MethodType):
+            hasher.update(b'method:')
+            _update_content_hash(hasher, value.__func__, seen)
+            _update_content_hash(hasher, value.__self__, seen)
+        elif isinstance(value, functools.partial):
+            hasher.update(f'{type(value).__module__}.{type(value).__qualname__}:'.encode())
+            _update_content_hash(hasher, value.func, seen)
+            _update_content_hash(hasher, value.args, seen)
+            _update_content_hash(hasher, value.keywords, seen)
+            _update_content_hash(hasher, vars(value), seen)
+        elif isinstance(value, (list, tuple)):
+            hasher.update(f'{type(value).__name__} {len(value)}:'.encode())
+            for item in value:
+                _update_content_hash(hasher, item, seen)
+        elif isinstance(value, dict):
+            hasher.update(f'{type(value).__name__} {len(value)}:'.encode())
+            for key in sorted(value, key = repr):
+                _update_content_hash(hasher, key, seen)
+                _update_content_hash(hasher, value[key], seen)
+        elif isinstance(value, (set, frozenset)):
+            hasher.update(f'{type(value).__name__} {len(value)}:'.encode())
+            for item in sorted(value, key = repr):
+                _update_content_hash(hasher, item, seen)
+        elif hasattr(value, '__dict__'):
+            hasher.update(f'{type(value).__module__}.{type(value).__qualname__}:'.encode())
+            state = {k: v for k, v in vars(value).items() if k not in _CONTENT_HASH_EXCLUDED}
+            _update_content_hash(hasher, state, seen)
+        else:
+            hasher.update(f'{type(value).__module__}.{type(value).__qualname__}:'.encode())
+            hasher.update(pickle.dumps(value, protocol = 4))
+        seen.discard(id(value))
+
+
+class Specification(Beet):
+    """
+    A class that contains the information necessary to run a simulation.
+
+    It should be subclassed for each type of simulation and all additional information necessary to run that kind of simulation should be added via keyword arguments.
+
+    Any number of additional keyword arguments can be passed to the constructor.
+    They will be stored as attributes if they don't conflict with any attributes already set.
+
+    Attributes
+    ----------
+    simulation_type
+        A class attribute which determines what kind of :class:`Simulation` will be generated via :func:`Specification.to_simulation`.
+    uuid
+        A `Universally Unique Identifier <https://en.wikipedia.org/wiki/Universally_unique_identifier>`_ for the :class:`Specification`.
+    """
+
+    simulation_type = None
+
+    def __init__(self, name: str, file_name: Optional[str] = None, **kwargs):
+        """
+        Parameters
+        ----------
+        name : :class:`str`
             The internal name of the Specification.
         file_name : :class:`str`
             The desired external name of the Specification.
@@ -318,184 +1365,2065 @@ class Specification(Beet):
             self._extra_attr_keys.append(k)
             logger.debug('{} stored additional attribute {} = {}'.format(self.name, k, v))
 
-    def save(self, target_dir: Optional[str] = None, file_extension: str = '.spec', compressed: bool = True) -> str:
+    def save(self, target_dir: Optional[str] = None, file_extension: str = '.spec', compressed: bool = True, **kwargs) -> str:
+        """
+        Atomically pickle the Specification to a file.
+
+        Parameters
+        ----------
+        target_dir : :class:`str`
+            The directory to save the Specification to.
+        file_extension : :class:`str`
+            The file extension to name the Specification with (for keeping track of things, no actual effect).
+        compressed : :class:`bool`
+            Whether to compress the Specification.
+        kwargs
+            Keyword arguments are passed to :meth:`Beet.save`.
+
+        Returns
+        -------
+        :class:`str`
+            The path to the saved Specification.
+        """
+        return super().save(target_dir = target_dir, file_extension = file_extension, compressed = compressed, **kwargs)
+
+    def _hash_attributes(self, keys: Iterable[str], numeric_keys: Iterable[str] = ()) -> str:
+        hasher = hashlib.blake2b(digest_size = 32)
+
+        _update_content_hash(hasher, type(self), set())
+        _update_content_hash(hasher, self.simulation_type, set())
+        _update_content_hash(hasher, {k: getattr(self, k) for k in keys}, set())
+        if numeric_keys:
+            _update_content_hash(hasher, ('numeric', list(numeric_keys)), set())
+
+        return hasher.hexdigest()
+
+    def content_hash(self) -> str:
+        """
+        Return a canonical hash of the content of the Specification, as a hex string.
+
+        The hash covers the class of the Specification, its ``simulation_type``, and its extra attributes (in sorted order, including the bytes of any NumPy arrays).
+        Functions are hashed by their code, defaults, and closure contents, and :func:`functools.partial` objects by their function and arguments, but not the global variables they use.
+        The name, file name, uuid, and initialization time are not included, so two Specifications that describe the same simulation hash equal.
+        """
+        return self._hash_attributes(self._extra_attr_keys)
+
+    def numeric_parameters(self) -> dict:
+        """Return a dictionary of the extra attributes of the Specification that are real numbers (but not booleans), as :class:`float`."""
+        return {
+            k: float(v)
+            for k, v in ((k, getattr(self, k)) for k in sorted(self._extra_attr_keys))
+            if isinstance(v, (int, float, np.integer, np.floating)) and not isinstance(v, (bool, np.bool_))
+        }
+
+    def parameter_space_hash(self) -> str:
+        """
+        Return a hash like :meth:`Specification.content_hash`, but leaving out the values of the :meth:`Specification.numeric_parameters`.
+
+        Specifications with equal parameter space hashes differ only in their numeric parameters, so they are points in the same parameter space.
+        """
+        numeric = self.numeric_parameters()
+        return self._hash_attributes([k for k in self._extra_attr_keys if k not in numeric], numeric_keys = sorted(numeric))
+
+    def to_simulation(self, store: Optional['ResultStore'] = None, warm_start: bool = False) -> 'Simulation':
+        """
+        Return a Simulation of the type associated with the Specification, generated from this instance.
+
+        Parameters
+        ----------
+        store : :class:`ResultStore`
+            If given, and the store holds a finished Simulation of a Specification with the same :meth:`content_hash`, return that instead of a new Simulation.
+        warm_start : :class:`bool`
+            If ``True``, and the new Simulation implements :meth:`Simulation.warm_start_from`, seed it from the finished Simulation in `store` whose Specification is nearest in parameter space (see :meth:`ResultStore.nearest`).
+
+        Returns
+        -------
+        :class:`Simulation`
+        """
+        if store is not None:
+            sim = store.get(self)
+            if sim is not None:
+                return sim
+
+        sim = self.simulation_type(self)
+
+        if warm_start and store is not None and sim.supports_warm_start:
+            neighbour = store.nearest(self)
+            if neighbour is not None:
+                sim.warm_start_from(neighbour)
+                sim.warm_started_from = neighbour.spec.numeric_parameters()
+                logger.debug(f'Warm-started {sim} from {neighbour}')
+
+        return sim
+
+    def info(self) -> Info:
+        info = super().info()
+
+        if len(self._extra_attr_keys) > 0:
+            info_extra = Info(header = f'Extra Attributes')
+
+            for k in self._extra_attr_keys:
+                info_extra.add_field(k, getattr(self, k))
+
+            info.add_info(info_extra)
+
+        return info
+
+
+# Simulation status names
+STATUS_INI = 'initialized'
+STATUS_RUN = 'running'
+STATUS_FIN = 'finished'
+STATUS_PAU = 'paused'
+STATUS_ERR = 'error'
+
+
+DELTA_EXTENSION = '.delta'  # appended to the path of a Simulation's base file to get the path of its delta checkpoint log
+DELTA_MAGIC = b'\x89DELTA\r\n'
+_DELTA_FRAME = struct.Struct('<8s16sQI')  # magic, codec name, record length, record CRC32
+DELTA_CHUNK_BYTES = 64 * 1024  # arrays are compared and stored in chunks of (about) this many bytes along their first axis
+
+
+def _digest(data) -> bytes:
+    return hashlib.blake2b(data, digest_size = 16).digest()
+
+
+def _array_chunk_rows(array: np.ndarray) -> int:
+    """Return the number of rows (along the first axis) in each delta chunk of `array`."""
+    row_bytes = max(array[:1].nbytes, 1)
+    return max(DELTA_CHUNK_BYTES // row_bytes, 1)
+
+
+def _is_chunkable(value) -> bool:
+    return isinstance(value, np.ndarray) and value.ndim > 0 and not value.dtype.hasobject
+
+
+def _fingerprint(value):
+    """
+    Return a fingerprint of `value` that changes whenever `value` does.
+
+    Arrays are fingerprinted chunk-by-chunk, so that :class:`_DeltaTracker` can tell which regions of them changed.
+    Anything else is fingerprinted by hashing its pickle.
+    """
+    if _is_chunkable(value):
+        value = np.ascontiguousarray(value)
+        rows = _array_chunk_rows(value)
+        digests = tuple(_digest(value[start:start + rows]) for start in range(0, len(value), rows))
+        return 'array', value.dtype.str, value.shape[1:], rows, digests
+    else:
+        return 'pickle', _digest(pickle.dumps(value, protocol = -1))
+
+
+class _DeltaTracker:
+    """
+    Keeps track of what a :class:`Simulation` looked like at its last checkpoint, so that the next delta checkpoint only needs to store what changed.
+
+    Only the ``base_id`` of the checkpoint chain survives pickling (and copying), so a loaded or cloned Simulation always starts a fresh chain with a full save.
+    """
+
+    def __init__(self, base_id: Optional[str] = None):
+        self.base_id = base_id
+        self.fingerprints = None
+        self.deltas = 0
+        self.delta_bytes = 0
+        self.base_bytes = 0
+
+    def __reduce__(self):
+        return self.__class__, (self.base_id,)
+
+    def reset(self, state: dict, base_bytes: int):
+        """Record `state` as the contents of the base file, which is `base_bytes` long."""
+        self.fingerprints = {name: _fingerprint(value) for name, value in state.items()}
+        self.deltas = 0
+        self.delta_bytes = 0
+        self.base_bytes = base_bytes
+
+    def diff(self, state: dict) -> dict:
+        """Return a delta record containing the parts of `state` that changed since the last call to :meth:`reset` or :meth:`diff`, and remember the new state."""
+        attributes = {}
+        arrays = {}
+        fingerprints = {}
+
+        for name, value in state.items():
+            fingerprint = fingerprints[name] = _fingerprint(value)
+            previous = self.fingerprints.get(name)
+
+            if fingerprint == previous:
+                continue
+
+            if fingerprint[0] == 'array' and previous is not None and previous[:4] == fingerprint[:4]:  # same dtype, row shape, and chunking, so we can send just the changed chunks
+                rows, digests, previous_digests = fingerprint[3], fingerprint[4], previous[4]
+                value = np.ascontiguousarray(value)
+                arrays[name] = {
+                    'length': len(value),
+                    'rows': rows,
+                    'chunks': {
+                        index: value[index * rows: (index + 1) * rows].copy()
+                        for index, digest in enumerate(digests)
+                        if index >= len(previous_digests) or digest != previous_digests[index]
+                    },
+                }
+            else:
+                attributes[name] = value
+
+        record = {
+            'base_id': self.base_id,
+            'sequence': self.deltas + 1,
+            'attributes': attributes,
+            'arrays': arrays,
+            'deleted': [name for name in self.fingerprints if name not in state],
+        }
+
+        self.fingerprints = fingerprints
+
+        return record
+
+
+def _apply_delta_record(sim: 'Simulation', record: dict):
+    """Apply a delta record produced by :meth:`_DeltaTracker.diff` to `sim`, in place."""
+    state = sim.__dict__
+
+    for name in record['deleted']:
+        state.pop(name, None)
+
+    state.update(record['attributes'])
+
+    for name, delta in record['arrays'].items():
+        array = state[name]
+        if len(array) != delta['length']:
+            resized = np.zeros((delta['length'],) + array.shape[1:], dtype = array.dtype)
+            overlap = min(len(array), delta['length'])
+            resized[:overlap] = array[:overlap]
+            array = state[name] = resized
+        elif not array.flags.writeable:
+            array = state[name] = array.copy()
+
+        rows = delta['rows']
+        for index, chunk in delta['chunks'].items():
+            array[index * rows: index * rows + len(chunk)] = chunk
+
+
+def _append_delta_record(file_path: str, record: dict, codec: Codec) -> int:
+    """Append a framed, checksummed delta record to the log at `file_path`. Returns the number of bytes appended."""
+    body = io.BytesIO()
+    with codec.writer(body) as stream:
+        pickle.dump(record, stream, protocol = -1)
+    body = body.getvalue()
+
+    with open(file_path, mode = 'ab') as file:
+        file.write(_DELTA_FRAME.pack(DELTA_MAGIC, codec.name.encode('ascii'), len(body), zlib.crc32(body)))
+        file.write(body)
+
+    return _DELTA_FRAME.size + len(body)
+
+
+def _read_delta_records(file_path: str) -> Iterable[dict]:
+    """
+    Yield the delta records in the log at `file_path`, in order.
+
+    Reading stops at the first incomplete or corrupt record (for example, one that was being written when the process was killed), since later records build on it.
+    """
+    with open(file_path, mode = 'rb') as file:
+        while True:
+            frame = file.read(_DELTA_FRAME.size)
+            if len(frame) == 0:
+                return
+
+            if len(frame) < _DELTA_FRAME.size:
+                logger.warning(f'Ignoring truncated delta record at the end of {file_path}')
+                return
+
+            magic, codec_name, length, crc = _DELTA_FRAME.unpack(frame)
+            body = file.read(length)
+            if magic != DELTA_MAGIC or len(body) != length or zlib.crc32(body) != crc:
+                logger.warning(f'Ignoring corrupt or truncated delta record (and any after it) in {file_path}')
+                return
+
+            with get_codec(codec_name.rstrip(b'\0').decode('ascii')).reader(io.BytesIO(body)) as stream:
+                yield pickle.load(stream)
+
+
+def _no_checkpoint():
+    return None
+
+
+class CheckpointHandle:
+    """
+    A handle to a checkpoint that is being written in the background by ``Simulation.save(background = True)``.
+
+    Call :meth:`CheckpointHandle.join` to block until it is written (re-raising any exception from the background save), or ``await`` it from a coroutine.
+    Copying or pickling a handle produces ``None``, so a handle stored on a Simulation never ends up in a checkpoint.
+    """
+
+    def __init__(self, future: concurrent.futures.Future, file_path: str):
+        self.future = future
+        self.file_path = file_path
+
+    def __str__(self):
+        return f'{self.__class__.__name__}({self.file_path}, done = {self.done()})'
+
+    def __repr__(self):
+        return str(self)
+
+    def __reduce__(self):
+        return _no_checkpoint, ()
+
+    def done(self) -> bool:
+        """Return ``True`` if the checkpoint has been written (or failed)."""
+        return self.future.done()
+
+    def join(self, timeout: Optional[float] = None) -> str:
+        """Block until the checkpoint has been written, then return its path."""
+        return self.future.result(timeout = timeout)
+
+    def __await__(self):
+        import asyncio
+
+        return asyncio.wrap_future(self.future).__await__()
+
+
+_checkpoint_executor = None
+_checkpoint_executor_lock = threading.Lock()
+
+
+def _get_checkpoint_executor() -> concurrent.futures.ThreadPoolExecutor:
+    """Return the thread pool used for background checkpoints, creating it on first use."""
+    global _checkpoint_executor
+    with _checkpoint_executor_lock:
+        if _checkpoint_executor is None:
+            _checkpoint_executor = concurrent.futures.ThreadPoolExecutor(max_workers = 1, thread_name_prefix = 'simulacra-checkpoint')
+
+    return _checkpoint_executor
+
+
+def _save_snapshot(snapshot: 'Simulation', delta_path: Optional[str], **kwargs) -> str:
+    """Save a snapshot of a Simulation in the background, removing the delta log it supersedes, if any."""
+    try:
+        file_path = Beet.save(snapshot, **kwargs)
+        if delta_path is not None and os.path.exists(delta_path):
+            os.remove(delta_path)
+    except Exception:
+        logger.exception(f'Background checkpoint of {snapshot.__class__.__name__} {snapshot.name} failed')
+        raise
+
+    return file_path
+
+
+class PhaseTimings:
+    """
+    A registry of the wall and CPU (process) time spent in named phases of a :class:`Simulation`, such as its physics steps, checkpoint saves, or animation frames.
+
+    Time a phase with the :meth:`PhaseTimings.timer` context manager, or decorate a Simulation method with :func:`timed_phase`.
+    Phases are timed independently, so the time in a phase nested inside another is counted in both.
+    """
+
+    def __init__(self):
+        self.wall = collections.OrderedDict()
+        self.cpu = collections.OrderedDict()
+        self.calls = collections.OrderedDict()
+
+    def __str__(self):
+        return f'{self.__class__.__name__}({", ".join(f"{phase}: {wall}" for phase, wall in self.wall.items())})'
+
+    def __repr__(self):
+        return str(self)
+
+    def __len__(self):
+        return len(self.wall)
+
+    def __iter__(self):
+        yield from self.wall
+
+    def __contains__(self, phase: str) -> bool:
+        return phase in self.wall
+
+    def add(self, phase: str, wall: datetime.timedelta, cpu: datetime.timedelta, calls: int = 1):
+        """Add time spent in `phase`."""
+        self.wall[phase] = self.wall.get(phase, datetime.timedelta()) + wall
+        self.cpu[phase] = self.cpu.get(phase, datetime.timedelta()) + cpu
+        self.calls[phase] = self.calls.get(phase, 0) + calls
+
+    @contextlib.contextmanager
+    def timer(self, phase: str):
+        """A context manager that adds the time spent in its ``with`` block to `phase`. Yields the underlying :class:`~simulacra.utils.BlockTimer`."""
+        timer = utils.BlockTimer()
+        try:
+            with timer:
+                yield timer
+        finally:
+            self.add(phase, timer.wall_time_elapsed, datetime.timedelta(seconds = timer.proc_time_elapsed))
+
+    def merge(self, other: 'PhaseTimings') -> 'PhaseTimings':
+        """Add all of the time in `other` to this registry, returning this registry."""
+        for phase in other:
+            self.add(phase, other.wall[phase], other.cpu[phase], other.calls[phase])
+
+        return self
+
+    def to_dict(self) -> dict:
+        """Return the timings as a JSON-serializable dictionary mapping phases to their ``wall`` and ``cpu`` time (in seconds) and number of ``calls``."""
+        return {phase: {'wall': self.wall[phase].total_seconds(), 'cpu': self.cpu[phase].total_seconds(), 'calls': self.calls[phase]} for phase in self}
+
+    @classmethod
+    def from_dict(cls, timings: dict) -> 'PhaseTimings':
+        """Inverse of :meth:`PhaseTimings.to_dict`."""
+        phase_timings = cls()
+        for phase, timing in timings.items():
+            phase_timings.add(phase, datetime.timedelta(seconds = timing['wall']), datetime.timedelta(seconds = timing['cpu']), timing['calls'])
+
+        return phase_timings
+
+    def info(self) -> Info:
+        info = Info(header = 'Phase Timings')
+
+        for phase in self:
+            info.add_field(phase, f'{self.wall[phase]} wall, {self.cpu[phase]} CPU, {self.calls[phase]} calls')
+
+        return info
+
+
+def timed_phase(phase: str):
+    """
+    A decorator for :class:`Simulation` methods that adds the time spent in the method to `phase` in the Simulation's ``phase_timings``.
+
+    Parameters
+    ----------
+    phase : :class:`str`
+        The name of the phase.
+    """
+
+    def decorator(method):
+        @functools.wraps(method)
+        def timed(self, *args, **kwargs):
+            phase_timings = getattr(self, 'phase_timings', None)
+            if phase_timings is None:  # e.g., loaded from a file saved before phase timings existed
+                return method(self, *args, **kwargs)
+
+            with phase_timings.timer(phase):
+                return method(self, *args, **kwargs)
+
+        return timed
+
+    return decorator
+
+
+class ResourceSampler:
+    """
+    A background thread that periodically samples the resource usage of the current process while a :class:`Simulation` runs.
+
+    Attach a sampler to a Simulation by setting its ``resource_sampler`` attribute.
+    It starts sampling when the Simulation's status becomes ``STATUS_RUN`` and stops when it becomes ``STATUS_PAU``, ``STATUS_FIN``, or ``STATUS_ERR``.
+
+    Each sample records the time since the Simulation first started running, the resident set size, the CPU percent (which can exceed 100 for multithreaded processes), the cumulative bytes read from and written to storage, and the number of open file descriptors (or handles, on Windows).
+    Samples are stored in compact NumPy arrays (see :meth:`ResourceSampler.series`).
+    When ``max_samples`` samples have been taken, every other sample is discarded and the sampling interval is doubled, so memory use stays bounded however long the Simulation runs.
+    Peak values (see :meth:`ResourceSampler.peaks`) are tracked across every sample, including discarded ones.
+
+    The samples are pickled with the Simulation, but the thread is not, so a loaded Simulation starts a new one when it runs again.
+    """
+
+    fields = collections.OrderedDict((
+        ('time', np.float64),
+        ('rss', np.int64),
+        ('cpu_percent', np.float32),
+        ('read_bytes', np.int64),
+        ('write_bytes', np.int64),
+        ('open_files', np.int32),
+    ))
+
+    def __init__(self, interval: float = 1.0, max_samples: int = 4096):
+        """
+        Parameters
+        ----------
+        interval : :class:`float`
+            The number of seconds between samples.
+        max_samples : :class:`int`
+            The number of samples to keep before halving the resolution.
+        """
+        self.interval = interval
+        self.max_samples = max_samples
+
+        self._samples = {field: np.empty(max_samples, dtype = dtype) for field, dtype in self.fields.items()}
+        self._length = 0
+        self._peaks = {}
+        self._elapsed = 0  # seconds of sampling in previous runs
+
+        self._lock = threading.Lock()
+        self._stop_event = None
+        self._thread = None
+        self._run_start = None
+
+    def __str__(self):
+        return f'{self.__class__.__name__}({len(self)} samples every {self.interval} seconds)'
+
+    def __repr__(self):
+        return utils.field_str(self, 'interval', 'max_samples')
+
+    def __len__(self):
+        return self._length
+
+    def __getstate__(self):
+        with self._lock:
+            state = self.__dict__.copy()
+            state['_samples'] = {field: array[:self._length].copy() for field, array in self._samples.items()}
+            state['_peaks'] = dict(self._peaks)
+
+        if self._run_start is not None:
+            state['_elapsed'] = self._elapsed + (time.perf_counter() - self._run_start)
+        for attr in ('_lock', '_stop_event', '_thread', '_run_start'):
+            del state[attr]
+
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+
+        samples = self._samples
+        self._samples = {field: np.empty(self.max_samples, dtype = dtype) for field, dtype in self.fields.items()}
+        for field, array in samples.items():
+            self._samples[field][:len(array)] = array
+
+        self._lock = threading.Lock()
+        self._stop_event = None
+        self._thread = None
+        self._run_start = None
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None
+
+    def start(self):
+        """Start sampling in a background thread. Does nothing if it is already running."""
+        if self.running:
+            return
+
+        self._run_start = time.perf_counter()
+        self._stop_event = threading.Event()
+        self._thread = threading.Thread(target = self._run, args = (psutil.Process(os.getpid()), self._stop_event), name = 'simulacra-resource-sampler', daemon = True)
+        self._thread.start()
+
+    def stop(self):
+        """Take a final sample, then stop the background thread."""
+        if not self.running:
+            return
+
+        self._stop_event.set()
+        self._thread.join()
+        self._thread = None
+        self._stop_event = None
+
+        self._elapsed += time.perf_counter() - self._run_start
+        self._run_start = None
+
+    def _run(self, process: psutil.Process, stop_event: threading.Event):
+        process.cpu_percent(None)  # the first call only sets the reference point
+
+        while True:
+            self._sample(process)
+            if stop_event.wait(self.interval):
+                self._sample(process)
+                return
+
+    def _sample(self, process: psutil.Process):
+        with process.oneshot():
+            sample = {
+                'time': self._elapsed + (time.perf_counter() - self._run_start),
+                'rss': process.memory_info().rss,
+                'cpu_percent': process.cpu_percent(None),
+                'open_files': process.num_fds() if hasattr(process, 'num_fds') else process.num_handles(),
+            }
+            try:
+                counters = process.io_counters()
+                sample.update(read_bytes = counters.read_bytes, write_bytes = counters.write_bytes)
+            except (AttributeError, psutil.Error):  # not available on every platform
+                sample.update(read_bytes = -1, write_bytes = -1)
+
+        with self._lock:
+            for field, value in sample.items():
+                if field != 'time':
+                    self._peaks[field] = max(self._peaks.get(field, value), value)
+
+            if self._length == self.max_samples:
+                half = (self.max_samples + 1) // 2
+                for array in self._samples.values():
+                    array[:half] = array[:self.max_samples:2]
+                self._length = half
+                self.interval *= 2
+
+            for field, value in sample.items():
+                self._samples[field][self._length] = value
+            self._length += 1
+
+    def series(self) -> dict:
+        """Return a dictionary mapping each of the sampled ``fields`` to a copy of its samples."""
+        with self._lock:
+            return {field: array[:self._length].copy() for field, array in self._samples.items()}
+
+    def peaks(self) -> dict:
+        """Return a dictionary mapping each sampled field (except time) to its largest sampled value."""
+        with self._lock:
+            return {field: self._peaks[field].item() if isinstance(self._peaks[field], np.generic) else self._peaks[field] for field in self._peaks}
+
+    def info(self) -> Info:
+        info = Info(header = str(self))
+
+        peaks = self.peaks()
+        if 'rss' in peaks:
+            info.add_field('Peak RSS', utils.bytes_to_str(peaks['rss']))
+        if 'cpu_percent' in peaks:
+            info.add_field('Peak CPU Percent', f'{peaks["cpu_percent"]:.1f}%')
+        if 'open_files' in peaks:
+            info.add_field('Peak Open Files', peaks['open_files'])
+
+        return info
+
+
+class MemoryGrowth(NamedTuple):
+    """The change in memory allocated at one site between two checkpoints of a :class:`MemoryTracker`."""
+    site: str
+    size_diff: int  # bytes
+    count_diff: int  # blocks
+    size: int  # bytes allocated at the site at the later checkpoint
+    count: int
+
+
+class MemoryCheckpoint(NamedTuple):
+    """A record of the allocation sites whose memory grew the most since the previous checkpoint of a :class:`MemoryTracker`."""
+    time: datetime.datetime
+    label: str
+    traced: int  # bytes traced by tracemalloc at the checkpoint
+    peak: int  # largest number of bytes traced since tracing started
+    growth: Tuple[MemoryGrowth, ...]
+
+
+class MemoryTracker:
+    """
+    A tracker for memory creep in long-running :class:`Simulation`\\s, based on :mod:`tracemalloc`.
+
+    Attach a tracker to a Simulation by setting its ``memory_tracker`` attribute.
+    When the Simulation's status becomes ``STATUS_RUN``, the tracker starts tracing allocations (if nothing else already is) and takes a baseline snapshot.
+    Every :meth:`Simulation.save` then takes a new snapshot, compares it to the previous one, and records the ``top`` allocation sites that grew the most as a :class:`MemoryCheckpoint`.
+    A final checkpoint is taken when the Simulation's status becomes ``STATUS_FIN`` or ``STATUS_ERR``, after which tracing is stopped again.
+
+    The checkpoint records are small and are pickled with the Simulation, and the total growth per site (see :meth:`MemoryTracker.growth`) is written to its metadata.
+    Snapshots are not pickled, so a loaded Simulation takes a new baseline when it runs again.
+    :meth:`simulacra.cluster.JobProcessor.memory_growth` compares the growth of every Simulation in a job.
+
+    Tracing allocations slows Python down noticeably, so trackers are meant for diagnosing leaks rather than for production runs.
+    """
+
+    def __init__(self, top: int = 10, key_type: str = 'lineno', frames: int = 1, max_checkpoints: int = 256):
+        """
+        Parameters
+        ----------
+        top : :class:`int`
+            The number of allocation sites to record at each checkpoint.
+        key_type : :class:`str`
+            How to group allocations into sites: ``'filename'``, ``'lineno'``, or ``'traceback'`` (see :meth:`tracemalloc.Snapshot.statistics`).
+        frames : :class:`int`
+            The number of frames to record per allocation, if this tracker starts tracing. More than one is only useful with ``key_type = 'traceback'``.
+        max_checkpoints : :class:`int`
+            The number of checkpoints to keep. When it is exceeded, the oldest checkpoint (after the first) is discarded, although its growth is still included in :meth:`MemoryTracker.growth`.
+        """
+        if key_type not in ('filename', 'lineno', 'traceback'):
+            raise SimulacraException(f"Unknown key_type '{key_type}' for {self.__class__.__name__}")
+
+        self.top = top
+        self.key_type = key_type
+        self.frames = frames
+        self.max_checkpoints = max_checkpoints
+
+        self.checkpoints = []
+        self._growth = {}
+
+        self._snapshot = None
+        self._started_tracing = False
+
+    def __str__(self):
+        return f'{self.__class__.__name__}({len(self)} checkpoints, top {self.top} sites by {self.key_type})'
+
+    def __repr__(self):
+        return utils.field_str(self, 'top', 'key_type', 'frames', 'max_checkpoints')
+
+    def __len__(self):
+        return len(self.checkpoints)
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        del state['_snapshot']
+        del state['_started_tracing']
+
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+
+        self._snapshot = None
+        self._started_tracing = False
+
+    @property
+    def running(self) -> bool:
+        return self._snapshot is not None and tracemalloc.is_tracing()
+
+    def start(self):
+        """Start tracing allocations if necessary, and take a baseline snapshot. Does nothing if it is already running."""
+        if self.running:
+            return
+
+        if not tracemalloc.is_tracing():
+            tracemalloc.start(self.frames)
+            self._started_tracing = True
+
+        self._snapshot = self._take_snapshot()
+
+    def stop(self, label: str = 'stop'):
+        """Take a final checkpoint, then stop tracing allocations if this tracker started it."""
+        if not self.running:
+            return
+
+        self.checkpoint(label)
+        self._snapshot = None
+
+        if self._started_tracing:
+            tracemalloc.stop()
+            self._started_tracing = False
+
+    def _take_snapshot(self) -> tracemalloc.Snapshot:
+        return tracemalloc.take_snapshot().filter_traces((
+            tracemalloc.Filter(False, tracemalloc.__file__),
+            tracemalloc.Filter(False, '<frozen importlib._bootstrap>'),
+            tracemalloc.Filter(False, '<frozen importlib._bootstrap_external>'),
+            tracemalloc.Filter(False, '<unknown>'),
+        ))
+
+    def _site(self, traceback: tracemalloc.Traceback) -> str:
+        if self.key_type == 'filename':
+            return traceback[0].filename
+        return ' < '.join(f'{frame.filename}:{frame.lineno}' for frame in traceback)
+
+    def checkpoint(self, label: str = 'checkpoint') -> Optional[MemoryCheckpoint]:
+        """
+        Take a snapshot and record the allocation sites that grew the most since the previous one.
+
+        Parameters
+        ----------
+        label : :class:`str`
+            A label for the checkpoint, like ``'save'`` or ``'finish'``.
+
+        Returns
+        -------
+        :class:`MemoryCheckpoint` or ``None``
+            The new checkpoint, or ``None`` if the tracker isn't running.
+        """
+        if not self.running:
+            return None
+
+        snapshot = self._take_snapshot()
+        differences = snapshot.compare_to(self._snapshot, self.key_type)
+        self._snapshot = snapshot
+
+        growth = tuple(
+            MemoryGrowth(self._site(stat.traceback), stat.size_diff, stat.count_diff, stat.size, stat.count)
+            for stat in differences[:self.top]  # sorted by decreasing absolute size_diff
+            if stat.size_diff > 0
+        )
+        for g in growth:
+            self._growth[g.site] = self._growth.get(g.site, 0) + g.size_diff
+
+        traced, peak = tracemalloc.get_traced_memory()
+        checkpoint = MemoryCheckpoint(datetime.datetime.utcnow(), label, traced, peak, growth)
+
+        self.checkpoints.append(checkpoint)
+        if len(self.checkpoints) > self.max_checkpoints:
+            del self.checkpoints[1]
+
+        logger.debug(f'{self} took checkpoint {label}, {utils.bytes_to_str(traced)} traced')
+
+        return checkpoint
+
+    def growth(self, top: Optional[int] = None) -> collections.OrderedDict:
+        """
+        Return the total growth recorded at each allocation site over every checkpoint, in bytes.
+
+        Parameters
+        ----------
+        top : :class:`int`
+            If given, only return this many sites.
+
+        Returns
+        -------
+        :class:`collections.OrderedDict`
+            A dictionary mapping allocation sites to bytes, largest first.
+        """
+        sites = sorted(self._growth.items(), key = lambda item: item[1], reverse = True)
+        return collections.OrderedDict(sites[:top])
+
+    def info(self) -> Info:
+        info = Info(header = str(self))
+
+        if len(self.checkpoints) > 0:
+            info.add_field('Latest Traced Memory', utils.bytes_to_str(self.checkpoints[-1].traced))
+            info.add_field('Peak Traced Memory', utils.bytes_to_str(max(c.peak for c in self.checkpoints)))
+
+        for site, size_diff in self.growth(top = 3).items():
+            info.add_field(site, f'+{utils.bytes_to_str(size_diff)}')
+
+        return info
+
+
+class MemoryGrowthComparison(NamedTuple):
+    """The growth at one allocation site across several :class:`Simulation`\\s, as computed by :func:`compare_memory_growth`."""
+    site: str
+    total: int  # bytes, summed over every Simulation
+    simulations: int  # the number of Simulations that grew at the site
+    largest: str  # the name of the Simulation that grew the most at the site
+    largest_size: int  # bytes
+
+
+def compare_memory_growth(growths: dict, top: Optional[int] = 10) -> List[MemoryGrowthComparison]:
+    """
+    Compare the memory growth recorded by the :class:`MemoryTracker`\\s of several Simulations, to find the allocation sites that leak in many of them.
+
+    Parameters
+    ----------
+    growths : :class:`dict`
+        A dictionary mapping the names of Simulations to their :meth:`MemoryTracker.growth`, or to the ``memory_growth`` in their metadata (see :meth:`Beet.peek`).
+    top : :class:`int`
+        The number of sites to return. If ``None``, return all of them.
+
+    Returns
+    -------
+    :class:`list` of :class:`MemoryGrowthComparison`
+        The sites that grew the most in total, largest first.
+    """
+    totals = collections.defaultdict(int)
+    counts = collections.defaultdict(int)
+    largest = {}
+    for name, growth in growths.items():
+        for site, size_diff in growth.items():
+            totals[site] += size_diff
+            counts[site] += 1
+            if site not in largest or size_diff > largest[site][1]:
+                largest[site] = (name, size_diff)
+
+    comparisons = [MemoryGrowthComparison(site, total, counts[site], *largest[site]) for site, total in totals.items()]
+    comparisons.sort(key = lambda c: c.total, reverse = True)
+
+    return comparisons[:top]
+
+
+class CheckpointDecision(NamedTuple):
+    """A record of a checkpoint taken by a :class:`CheckpointPolicy`."""
+    time: datetime.datetime
+    step: int
+    reason: str
+    duration: Optional[float]  # seconds spent in Simulation.save, or None if it hasn't returned yet
+
+
+class CheckpointPolicy:
+    """
+    A policy that decides when a :class:`Simulation` should checkpoint itself.
+
+    Attach a policy to a Simulation by setting its ``checkpoint_policy`` attribute, then call :meth:`Simulation.maybe_checkpoint` once per step of the simulation.
+    A checkpoint is taken when any of the configured triggers fires:
+
+    * ``step_interval``: every this many steps.
+    * ``wall_clock_interval``: once this much running time has passed since the last checkpoint.
+    * ``max_checkpoint_fraction``: adaptively, so that the time spent saving (measured over previous checkpoints) is at most this fraction of the running time.
+      If other triggers are also configured, it instead acts as a throttle on them.
+
+    The policy also hooks into the Simulation's status transitions: it restarts its clocks when the status becomes ``STATUS_RUN``, and checkpoints when the status becomes ``STATUS_PAU`` or ``STATUS_FIN``.
+
+    The policy is pickled along with the Simulation, so its decisions (see ``decisions``) are part of the Simulation's diagnostics.
+    """
+
+    def __init__(
+            self,
+            target_dir: Optional[str] = None,
+            step_interval: Optional[int] = None,
+            wall_clock_interval: Optional[datetime.timedelta] = None,
+            max_checkpoint_fraction: Optional[float] = None,
+            checkpoint_on_pause: bool = True,
+            checkpoint_on_finish: bool = True,
+            max_decisions: int = 100,
+            **save_kwargs):
+        """
+        Parameters
+        ----------
+        target_dir : :class:`str`
+            The directory to save checkpoints to.
+        step_interval : :class:`int`
+            The number of steps between checkpoints.
+        wall_clock_interval : :class:`datetime.timedelta`
+            The running time between checkpoints.
+        max_checkpoint_fraction : :class:`float`
+            The maximum fraction of running time to spend checkpointing.
+        checkpoint_on_pause : :class:`bool`
+            If ``True``, checkpoint when the Simulation is paused.
+        checkpoint_on_finish : :class:`bool`
+            If ``True``, checkpoint when the Simulation finishes.
+        max_decisions : :class:`int`
+            The number of most recent decisions to keep.
+        save_kwargs
+            Keyword arguments are passed to :meth:`Simulation.save`, for example ``delta = True`` or ``background = True``.
+        """
+        if max_checkpoint_fraction is not None and not 0 < max_checkpoint_fraction < 1:
+            raise SimulacraException(f'max_checkpoint_fraction must be between 0 and 1, not {max_checkpoint_fraction}')
+
+        self.target_dir = target_dir
+        self.step_interval = step_interval
+        self.wall_clock_interval = wall_clock_interval
+        self.max_checkpoint_fraction = max_checkpoint_fraction
+        self.checkpoint_on_pause = checkpoint_on_pause
+        self.checkpoint_on_finish = checkpoint_on_finish
+        self.save_kwargs = save_kwargs
+
+        self.steps = 0
+        self.checkpoints = 0
+        self.checkpoint_time = datetime.timedelta()
+        self.decisions = collections.deque(maxlen = max_decisions)
+
+        self._steps_at_checkpoint = 0
+        self._clock_at_checkpoint = time.perf_counter()
+        self._last_duration = None
+
+    def __str__(self):
+        triggers = ', '.join(f'{k} = {v}' for k, v in (('step_interval', self.step_interval), ('wall_clock_interval', self.wall_clock_interval), ('max_checkpoint_fraction', self.max_checkpoint_fraction)) if v is not None)
+        return f'{self.__class__.__name__}({triggers})'
+
+    def __repr__(self):
+        return utils.field_str(self, 'target_dir', 'step_interval', 'wall_clock_interval', 'max_checkpoint_fraction')
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        del state['_clock_at_checkpoint']  # perf_counter values are meaningless in another process
+
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._clock_at_checkpoint = time.perf_counter()
+
+    def _adaptive_interval(self) -> Optional[float]:
+        """Return the minimum number of seconds between checkpoints that keeps checkpointing under ``max_checkpoint_fraction`` of running time."""
+        if self.max_checkpoint_fraction is None or self._last_duration is None:
+            return None
+
+        return self._last_duration * (1 / self.max_checkpoint_fraction - 1)
+
+    def reason_to_checkpoint(self) -> Optional[str]:
+        """Return the name of the trigger that says to checkpoint now, or ``None`` if no checkpoint is due."""
+        since = time.perf_counter() - self._clock_at_checkpoint
+        adaptive_interval = self._adaptive_interval()
+        if adaptive_interval is not None and since < adaptive_interval:
+            return None
+
+        if self.step_interval is not None and self.steps - self._steps_at_checkpoint >= self.step_interval:
+            return 'step'
+        if self.wall_clock_interval is not None and since >= self.wall_clock_interval.total_seconds():
+            return 'wall_clock'
+        if self.max_checkpoint_fraction is not None and self.step_interval is None and self.wall_clock_interval is None:
+            return 'adaptive'
+
+        return None
+
+    def step(self, sim: 'Simulation', steps: int = 1) -> Optional[Union[str, CheckpointHandle]]:
+        """Count `steps` steps of `sim`, then checkpoint it if a trigger fires. Returns the result of :meth:`Simulation.save`, or ``None`` if no checkpoint was taken."""
+        self.steps += steps
+
+        reason = self.reason_to_checkpoint()
+        if reason is None:
+            return None
+
+        return self.checkpoint(sim, reason)
+
+    def checkpoint(self, sim: 'Simulation', reason: str, **kwargs) -> Union[str, CheckpointHandle]:
+        """Save `sim`, recording the decision and how long the save took. Keyword arguments override ``save_kwargs``."""
+        self.decisions.append(CheckpointDecision(datetime.datetime.utcnow(), self.steps, reason, None))
+
+        start = time.perf_counter()
+        result = sim.save(target_dir = self.target_dir, **{'pause': False, **self.save_kwargs, **kwargs})
+        end = time.perf_counter()
+
+        self._last_duration = end - start
+        self.decisions[-1] = self.decisions[-1]._replace(duration = self._last_duration)
+        self.checkpoints += 1
+        self.checkpoint_time += datetime.timedelta(seconds = self._last_duration)
+        self._steps_at_checkpoint = self.steps
+        self._clock_at_checkpoint = end
+
+        logger.debug(f'{self} checkpointed {sim} at step {self.steps} ({reason}) in {self._last_duration:.3f} seconds')
+
+        return result
+
+    def on_status(self, sim: 'Simulation', status: str):
+        """Hook called by :class:`Simulation` after its status changes."""
+        if status == STATUS_RUN:
+            self._clock_at_checkpoint = time.perf_counter()
+        elif status == STATUS_PAU and self.checkpoint_on_pause:
+            self.checkpoint(sim, 'pause')
+        elif status == STATUS_FIN and self.checkpoint_on_finish:
+            self.checkpoint(sim, 'finish', background = False)  # the final save should be on disk when the status setter returns
+
+    def info(self) -> Info:
+        info = Info(header = str(self))
+
+        info.add_field('Checkpoints', self.checkpoints)
+        info.add_field('Time Checkpointing', self.checkpoint_time)
+        if len(self.decisions) > 0:
+            info.add_field('Latest Checkpoint', self.decisions[-1])
+
+        return info
+
+
+PROFILE_ENV_VAR = 'SIMULACRA_PROFILE'  # if set to a true value, every Simulation is profiled
+PROFILE_EXTENSION = '.prof'
+
+
+def _no_profile():
+    return None
+
+
+class _ProfileCapture:
+    """The profiler of a Simulation, which is never pickled or copied along with it."""
+
+    def __init__(self, path: Optional[str] = None):
+        self.profiler = cProfile.Profile()
+        self.path = path
+        self.running = False
+
+    def start(self):
+        self.profiler.enable()
+        self.running = True
+
+    def stop(self):
+        self.profiler.disable()
+        self.running = False
+
+    def __reduce__(self):
+        return _no_profile, ()
+
+    def dump(self, path: Optional[str] = None):
+        """Atomically write the statistics collected so far to `path` (by default, the last path written to), in :mod:`pstats` format."""
+        if path is not None:
+            self.path = path
+
+        utils.ensure_dir_exists(self.path)
+        working_path = self.path + '.working'
+
+        running = self.running
+        self.stop()
+        try:
+            self.profiler.dump_stats(working_path)
+        finally:
+            if running:
+                self.start()
+        os.replace(working_path, self.path)
+
+        logger.debug(f'Dumped profile to {self.path}')
+
+
+def _profiled(run_simulation):
+    """Wrap a ``run_simulation`` method so that it is profiled if the Simulation's :attr:`~Simulation.profiling_enabled` is ``True``."""
+
+    @functools.wraps(run_simulation)
+    def run(self, *args, **kwargs):
+        if getattr(self.__dict__.get('_profile'), 'running', False) or not self.profiling_enabled:  # already profiled by an outer call, or not profiling at all
+            return run_simulation(self, *args, **kwargs)
+
+        capture = self.__dict__.get('_profile') or _ProfileCapture()  # a previous run's capture keeps accumulating
+        try:
+            capture.start()
+        except ValueError as e:  # another profiler is already active in this process
+            logger.warning(f'Could not profile {self} due to {e}')
+            return run_simulation(self, *args, **kwargs)
+
+        self._profile = capture
+        try:
+            return run_simulation(self, *args, **kwargs)
+        finally:
+            capture.stop()
+            if capture.path is not None:  # saved during the run, so update the profile next to it; otherwise the next save writes it
+                capture.dump()
+
+    return run
+
+
+class DataRecorder:
+    """
+    A recorder for per-timestep data, such as the observables of a :class:`Simulation`.
+
+    Each observable is registered with a dtype, a shape for each step, and an expected number of steps, and is stored in a preallocated array that grows geometrically (by ``growth_factor``) when it fills up.
+    Observables whose storage would exceed ``spill_bytes`` are spilled to a memory-mapped file in ``spill_dir``, which is extended in place as they grow.
+
+    The recorder pickles compactly: only the recorded steps are stored, and spilled observables are read back into memory when it is unpickled.
+    """
+
+    growth_factor = 2
+
+    def __init__(self, spill_dir: Optional[str] = None, spill_bytes: int = 64 * 1024 * 1024, file_name: str = 'recorder'):
+        """
+        Parameters
+        ----------
+        spill_dir : :class:`str`
+            The directory to put memory-mapped files in, usually the directory that the Simulation is checkpointed to. If ``None``, observables are never spilled.
+        spill_bytes : :class:`int`
+            Observables whose storage would be larger than this many bytes are spilled to disk.
+        file_name : :class:`str`
+            The prefix for the names of spill files, which are named ``{file_name}.{observable}.rec``.
+        """
+        self.spill_dir = spill_dir
+        self.spill_bytes = spill_bytes
+        self.file_name = file_name
+
+        self._arrays = collections.OrderedDict()
+        self._lengths = {}
+
+    def __str__(self):
+        return f'{self.__class__.__name__}({", ".join(f"{name} [{length}]" for name, length in self._lengths.items())})'
+
+    def __repr__(self):
+        return utils.field_str(self, 'spill_dir', 'spill_bytes', 'file_name')
+
+    def register(self, name: str, dtype = np.float64, shape: Tuple[int, ...] = (), expected_steps: int = 16):
+        """
+        Register an observable with the recorder.
+
+        Parameters
+        ----------
+        name : :class:`str`
+            The name of the observable.
+        dtype
+            The NumPy dtype of the observable.
+        shape : :class:`tuple` of :class:`int`
+            The shape of the observable at each step.
+        expected_steps : :class:`int`
+            The number of steps to preallocate storage for.
+        """
+        if name in self._arrays:
+            raise SimulacraException(f'{self} already has an observable named {name}')
+
+        self._lengths[name] = 0
+        self._arrays[name] = self._allocate(name, np.dtype(dtype), tuple(shape), max(int(expected_steps), 1))
+
+    def _spill_path(self, name: str) -> str:
+        return os.path.join(self.spill_dir, f'{self.file_name}.{name}.rec')
+
+    def _allocate(self, name: str, dtype: np.dtype, shape: Tuple[int, ...], steps: int, old: Optional[np.ndarray] = None) -> np.ndarray:
+        """Return storage for `steps` steps of an observable, preserving the contents of its `old` storage."""
+        nbytes = steps * dtype.itemsize * int(np.prod(shape, dtype = np.int64))
+        if self.spill_dir is None or nbytes <= self.spill_bytes:
+            array = np.empty((steps,) + shape, dtype = dtype)
+            if old is not None:
+                array[:len(old)] = old
+            return array
+
+        path = self._spill_path(name)
+        if not isinstance(old, np.memmap):
+            utils.ensure_dir_exists(self.spill_dir)
+            with open(path, mode = 'wb'):
+                pass
+        with open(path, mode = 'r+b') as file:
+            file.truncate(nbytes)  # extending the file keeps whatever has already been written to it
+
+        array = np.memmap(path, dtype = dtype, mode = 'r+', shape = (steps,) + shape)
+        if old is not None and not isinstance(old, np.memmap):
+            array[:len(old)] = old
+            logger.debug(f'{self} spilled observable {name} to {path}')
+
+        return array
+
+    def record(self, name: str, value):
+        """Record the value of observable `name` for the next step."""
+        array = self._arrays[name]
+        length = self._lengths[name]
+
+        if length == len(array):
+            array = self._arrays[name] = self._allocate(name, array.dtype, array.shape[1:], max(len(array) * self.growth_factor, length + 1), old = array)
+
+        array[length] = value
+        self._lengths[name] = length + 1
+
+    def record_step(self, **values):
+        """Record the next step of several observables at once, passed as keyword arguments."""
+        for name, value in values.items():
+            self.record(name, value)
+
+    def __getitem__(self, name: str) -> np.ndarray:
+        """Return a view of the recorded steps of observable `name`."""
+        return self._arrays[name][:self._lengths[name]]
+
+    def __contains__(self, name: str) -> bool:
+        return name in self._arrays
+
+    def __iter__(self):
+        yield from self._arrays
+
+    def __len__(self):
+        return len(self._arrays)
+
+    def capacity(self, name: str) -> int:
+        """Return the number of steps of observable `name` that can be recorded before its storage grows."""
+        return len(self._arrays[name])
+
+    def close(self):
+        """Release the recorder's spill files, reading spilled observables back into memory."""
+        for name, array in self._arrays.items():
+            if isinstance(array, np.memmap):
+                self._arrays[name] = np.array(array[:self._lengths[name]])
+                path = array.filename
+                del array
+                os.remove(path)
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        state['_arrays'] = collections.OrderedDict((name, np.ascontiguousarray(self[name])) for name in self._arrays)
+
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._arrays = collections.OrderedDict((name, np.asarray(array)) for name, array in self._arrays.items())
+
+
+class Simulation(Beet):
+    """
+    A class that represents a single simulation.
+
+    It should be subclassed and customized for each variety of simulation.
+
+    Simulations should generally be instantiated using Specification.to_simulation() to avoid possible mismatches.
+
+    Attributes
+    ----------
+    uuid
+        A `Universally Unique Identifier <https://en.wikipedia.org/wiki/Universally_unique_identifier>`_ for the :class:`Simulation`.
+    status : :class:`str`
+        The status of the Simulation. One of ``'initialized'``, ``'running'``, ``'finished'``, ``'paused'``, or ``'error'``.
+    """
+
+    _status = utils.RestrictedValues('status', {'', STATUS_INI, STATUS_RUN, STATUS_FIN, STATUS_PAU, STATUS_ERR})
+
+    delta_compaction_interval = 20  # the maximum number of delta checkpoints between full saves
+    batch_attributes: Tuple[str, ...] = ()  # the attributes stacked into the state of a BatchSimulation, see Simulation.step_batch
+
+    def __init__(self, spec: Specification):
+        """
+        Parameters
+        ----------
+        spec : :class:`Specification`
+            The :class:`Specification` for the Simulation.
+        """
+        super().__init__(spec.name, file_name = spec.file_name)  # inherit name and file_name from spec
+
+        self.spec = spec
+
+        # diagnostic data
+        self.runs = 0
+        self.init_time = None
+        self.start_time = None
+        self.end_time = None
+        self.elapsed_time = None
+        self.latest_run_time = None
+        self.running_time = datetime.timedelta()
+        self.warm_started_from = None
+        self.checkpoint_policy = None
+        self.evaluation_caches = []
+        self.phase_timings = PhaseTimings()
+        self.resource_sampler = None
+        self.memory_tracker = None
+
+        self._status = ''
+        self.status = STATUS_INI
+
+    @property
+    def status(self):
+        return self._status
+
+    @status.setter
+    def status(self, status):
+        """
+        Set the status of the :class:`Simulation`.
+
+        Defined statuses are ``STATUS_INI`` (initialized), ``STATUS_RUN`` (running), ``STATUS_FIN`` (finished), ``STATUS_PAU`` (paused), and ``STATUS_ERR`` (error).
+        These statuses can have side effects on the simulation's time diagnostics.
+
+        Parameters
+        ----------
+        status : :class:`str`
+            The new status for the simulation
+        """
+        self._set_status(status)
+
+        sampler = getattr(self, 'resource_sampler', None)
+        if sampler is not None:
+            if status == STATUS_RUN:
+                sampler.start()
+            elif status in (STATUS_PAU, STATUS_FIN, STATUS_ERR):
+                sampler.stop()
+
+        tracker = getattr(self, 'memory_tracker', None)
+        if tracker is not None:
+            if status == STATUS_RUN:
+                tracker.start()
+            elif status in (STATUS_FIN, STATUS_ERR):
+                tracker.stop(label = status)
+
+        policy = getattr(self, 'checkpoint_policy', None)
+        if policy is not None:
+            policy.on_status(self, status)
+
+    def _set_status(self, status):
+        """Set the status of the Simulation without notifying its checkpoint policy."""
+        now = datetime.datetime.utcnow()
+
+        if status == STATUS_INI:
+            self.init_time = now
+        elif status == STATUS_RUN:
+            if self.latest_run_time is None:
+                self.start_time = now
+            self.latest_run_time = now
+            self.runs += 1
+        elif status == STATUS_PAU:
+            if self._status == STATUS_RUN and self.latest_run_time is not None:  # pausing a paused Simulation (e.g. saving it) doesn't add run time again
+                self.running_time += now - self.latest_run_time
+        elif status == STATUS_FIN:
+            self.wait_for_checkpoint()
+            if self.latest_run_time is not None:
+                self.running_time += now - self.latest_run_time
+            self.end_time = now
+            self.elapsed_time = self.end_time - self.init_time
+
+        self._status = status
+
+        logger.debug('%s %s (%s) status set to %s', self.__class__.__name__, self.name, self.file_name, status)
+
+    def __str__(self):
+        return super().__str__() + f' {{{self.status}}}'
+
+    @timed_phase('save')
+    def save(self, target_dir: Optional[str] = None, file_extension: str = '.sim', compressed: bool = True, delta: bool = False, background: bool = False, pause: bool = True, **kwargs) -> Union[str, CheckpointHandle]:
+        """
+        Atomically pickle the Simulation to a file.
+
+        In delta mode, the first save writes a full base file as usual.
+        Later saves append only the attributes that changed (and, for NumPy arrays, only the chunks that changed) to a log next to the base file, named ``{file_name}{file_extension}.delta``.
+        Every ``delta_compaction_interval`` deltas, or once the log grows larger than the base file, a full save is done instead, which starts a new chain.
+        Saves of finished Simulations are always full, so :meth:`Beet.peek` sees their final state.
+        :meth:`Simulation.load` reassembles the chain.
+
+        Attributes are stored independently in delta records, so references shared between different attributes are not preserved across a delta checkpoint.
+
+        In background mode, a consistent snapshot of the Simulation is taken with :func:`copy.deepcopy` and then pickled, compressed, and atomically moved into place by a background thread, so the caller can continue running.
+        The returned :class:`CheckpointHandle` can be joined or awaited.
+        Any pending background checkpoint is waited for before the next save and when the Simulation's status is set to ``STATUS_FIN``.
+
+        Parameters
+        ----------
+        target_dir : :class:`str`
+            The directory to save the Simulation to.
+        file_extension : :class:`str`
+            The file extension to name the Simulation with (for keeping track of things, no actual effect).
+        compressed : :class:`bool`
+            Whether to compress the Simulation.
+        delta : :class:`bool`
+            If ``True``, write an incremental checkpoint if possible.
+        background : :class:`bool`
+            If ``True``, write a full checkpoint in a background thread and return a :class:`CheckpointHandle` instead of the path. Cannot be combined with `delta`.
+        pause : :class:`bool`
+            Unfinished Simulations are always saved as paused. If ``False``, a running Simulation keeps running afterwards, which is what a checkpoint in the middle of a run wants.
+        kwargs
+            Keyword arguments are passed to :meth:`Beet.save`.
+
+        Returns
+        -------
+        :class:`str` or :class:`CheckpointHandle`
+            The path to the saved Simulation, or a handle to the background checkpoint.
+        """
+        if delta and background:
+            raise SimulacraException('Delta checkpoints cannot be written in the background')
+
+        self.wait_for_checkpoint()
+
+        if self.status == STATUS_FIN:
+            return self._save(target_dir, file_extension, compressed, delta, background, **kwargs)
+
+        resume = self.status == STATUS_RUN and not pause
+        running_time = self.running_time
+        self._set_status(STATUS_PAU)  # saving isn't a pause that the checkpoint policy should react to
+        sampler = getattr(self, 'resource_sampler', None)
+        if sampler is not None and not resume:  # but the Simulation stays paused, so nothing is left running
+            sampler.stop()
+        try:
+            return self._save(target_dir, file_extension, compressed, delta, background, **kwargs)
+        finally:
+            if resume:  # the same run continues, so undo the pause without counting a new run
+                self._status = STATUS_RUN
+                self.running_time = running_time
+
+    def _save(self, target_dir: Optional[str], file_extension: str, compressed: bool, delta: bool, background: bool, **kwargs) -> Union[str, CheckpointHandle]:
+        """Save the Simulation in its current state. See :meth:`Simulation.save`."""
+        if target_dir is None:
+            target_dir = os.getcwd()
+        file_path = os.path.join(target_dir, self.file_name + file_extension)
+        delta_path = file_path + DELTA_EXTENSION
+
+        profile = self.__dict__.get('_profile')
+        if profile is not None:
+            profile.dump(os.path.join(target_dir, self.file_name + PROFILE_EXTENSION))
+
+        if getattr(self, 'memory_tracker', None) is not None:
+            self.memory_tracker.checkpoint('save')
+
+        tracker = self.__dict__.get('_delta_tracker')
+
+        if background:
+            if tracker is not None:
+                self._delta_tracker = _DeltaTracker(base_id = uuid.uuid4().hex)
+            else:
+                delta_path = None
+
+            snapshot = deepcopy(self)
+            future = _get_checkpoint_executor().submit(_save_snapshot, snapshot, delta_path, target_dir = target_dir, file_extension = file_extension, compressed = compressed, **kwargs)
+            handle = self._pending_checkpoint = CheckpointHandle(future, file_path)
+
+            logger.debug(f'Started background checkpoint of {self.__class__.__name__} {self.name} to {file_path}')
+
+            return handle
+
+        if delta and self.status != STATUS_FIN and self._can_save_delta(tracker, file_path):
+            if not compressed:
+                codec = get_codec(NoCodec.name)
+            else:
+                codec = get_codec(kwargs.get('codec') or self.codec, level = kwargs.get('compression_level'))
+
+            record = tracker.diff(self._delta_state())
+            tracker.delta_bytes += _append_delta_record(delta_path, record, codec)
+            tracker.deltas += 1
+
+            logger.debug(f'Saved delta checkpoint {tracker.deltas} for {self.__class__.__name__} {self.name} to {delta_path}')
+
+            return file_path
+
+        if delta or tracker is not None:
+            tracker = self._delta_tracker = _DeltaTracker(base_id = uuid.uuid4().hex)  # a new base starts a new chain, which orphans any existing log
+
+        file_path = super().save(target_dir = target_dir, file_extension = file_extension, compressed = compressed, **kwargs)
+
+        if tracker is not None:
+            if os.path.exists(delta_path):
+                os.remove(delta_path)
+            if delta:
+                tracker.reset(self._delta_state(), base_bytes = utils.get_file_size(file_path))
+
+        return file_path
+
+    def wait_for_checkpoint(self, timeout: Optional[float] = None):
+        """Block until the pending background checkpoint (if any) has been written. Exceptions raised by the background save are re-raised here."""
+        handle = self.__dict__.get('_pending_checkpoint')
+        if handle is not None:
+            try:
+                handle.join(timeout = timeout)
+            finally:
+                if handle.done():
+                    del self._pending_checkpoint
+
+    def time_phase(self, phase: str):
+        """Return a context manager that adds the time spent in its ``with`` block to `phase` in the Simulation's ``phase_timings`` (see :class:`PhaseTimings`)."""
+        return self.phase_timings.timer(phase)
+
+    def register_evaluation_cache(self, cache: 'CachedSummand') -> 'CachedSummand':
+        """Register a :class:`CachedSummand` with the Simulation, so that :meth:`Simulation.end_step` clears it. Returns the cache."""
+        self.evaluation_caches.append(cache)
+
+        return cache
+
+    def end_step(self, steps: int = 1) -> Optional[Union[str, CheckpointHandle]]:
+        """
+        Hook method to call at the end of each step (or each `steps` steps) of the Simulation.
+
+        Clears the registered evaluation caches, then returns the result of :meth:`Simulation.maybe_checkpoint`.
+        """
+        for cache in getattr(self, 'evaluation_caches', ()):
+            cache.clear()
+
+        return self.maybe_checkpoint(steps)
+
+    def maybe_checkpoint(self, steps: int = 1) -> Optional[Union[str, CheckpointHandle]]:
+        """
+        Tell the Simulation's ``checkpoint_policy`` that `steps` more steps have been run, checkpointing if the policy says to.
+
+        Returns the result of :meth:`Simulation.save` if a checkpoint was taken, and ``None`` otherwise (including if the Simulation has no :class:`CheckpointPolicy`).
+        """
+        policy = getattr(self, 'checkpoint_policy', None)
+        if policy is None:
+            return None
+
+        return policy.step(self, steps)
+
+    def _can_save_delta(self, tracker: Optional[_DeltaTracker], file_path: str) -> bool:
+        return (
+            tracker is not None
+            and tracker.fingerprints is not None
+            and tracker.deltas < self.delta_compaction_interval
+            and tracker.delta_bytes < tracker.base_bytes
+            and os.path.exists(file_path)
+        )
+
+    def _delta_state(self) -> dict:
+        return {name: value for name, value in self.__dict__.items() if name not in ('_delta_tracker', '_pending_checkpoint', '_profile')}
+
+    @classmethod
+    def load(cls, file_path: str, **kwargs) -> 'Simulation':
+        """
+        Load a Simulation from `file_path`, applying any delta checkpoints saved after it (see :meth:`Simulation.save`).
+
+        Parameters
+        ----------
+        file_path
+            The path to load a Simulation from.
+        kwargs
+            Keyword arguments are passed to :meth:`Beet.load`.
+
+        Returns
+        -------
+        :class:`Simulation`
+            The loaded Simulation.
+        """
+        sim = super().load(file_path, **kwargs)
+
+        tracker = sim.__dict__.get('_delta_tracker')
+        delta_path = file_path + DELTA_EXTENSION
+        if tracker is not None and os.path.exists(delta_path):
+            applied = 0
+            for record in _read_delta_records(delta_path):
+                if record['base_id'] != tracker.base_id or record['sequence'] != applied + 1:
+                    break
+                _apply_delta_record(sim, record)
+                applied += 1
+
+            logger.debug(f'Applied {applied} delta checkpoints from {delta_path} to {sim.__class__.__name__} {sim.name}')
+
+        return sim
+
+    @classmethod
+    def load_slice(cls, file_path: str, attribute: str, start: int = 0, stop: Optional[int] = None) -> np.ndarray:
+        """
+        Read the rows ``[start, stop)`` (along the first axis) of one of the ``time_series_attributes`` of the Simulation saved at `file_path`.
+
+        If delta checkpoints were saved after the base file, the rows in the base file may be out of date, so the whole Simulation is loaded (see :meth:`Simulation.load`) and sliced instead.
+        Otherwise, see :meth:`Beet.load_slice`.
+        """
+        delta_path = file_path + DELTA_EXTENSION
+        if not os.path.exists(delta_path):
+            return super().load_slice(file_path, attribute, start = start, stop = stop)
+
+        logger.debug(f'Loading all of {file_path} to read {attribute}, because it has delta checkpoints in {delta_path}')
+
+        sim = cls.load(file_path)
+        if attribute not in sim.time_series_attributes or not _is_chunkable(sim.__dict__.get(attribute)):
+            raise SimulacraException(f'{file_path} does not contain a time series named {attribute}')
+
+        return sim.__dict__[attribute][start:stop].copy()
+
+    def metadata(self) -> dict:
+        metadata = super().metadata()
+
+        metadata.update(
+            status = self.status,
+            runs = self.runs,
+            init_time = self.init_time,
+            start_time = self.start_time,
+            latest_run_time = self.latest_run_time,
+            end_time = self.end_time,
+            elapsed_time = self.elapsed_time,
+            running_time = self.running_time,
+            phase_timings = self.phase_timings.to_dict() if hasattr(self, 'phase_timings') else {},
+            resource_peaks = self.resource_sampler.peaks() if getattr(self, 'resource_sampler', None) is not None else {},
+            memory_growth = self.memory_tracker.growth() if getattr(self, 'memory_tracker', None) is not None else {},
+        )
+
+        return metadata
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+
+        if 'run_simulation' in cls.__dict__:
+            cls.run_simulation = _profiled(cls.__dict__['run_simulation'])
+
+    @property
+    def profiling_enabled(self) -> bool:
+        """
+        ``True`` if :meth:`Simulation.run_simulation` should be run under :mod:`cProfile`, because the Specification has a true ``profile`` attribute or the ``SIMULACRA_PROFILE`` environment variable is set to a true value.
+
+        The profile is written to ``{file_name}.prof`` next to the Simulation whenever it is saved, and again when ``run_simulation`` returns if it was saved during the run.
+        Profiles can be read (and combined) with :class:`pstats.Stats`.
+        """
+        return bool(getattr(self.spec, 'profile', False)) or os.environ.get(PROFILE_ENV_VAR, '').lower() not in ('', '0', 'false', 'no')
+
+    def run_simulation(self):
+        """Hook method for running the Simulation, whatever that may entail."""
+        raise NotImplementedError
+
+    @property
+    def supports_batching(self) -> bool:
+        """``True`` if this kind of Simulation names its ``batch_attributes`` and overrides :meth:`Simulation.step_batch`, so that it can be run by a :class:`BatchSimulation`."""
+        return len(self.batch_attributes) > 0 and type(self).step_batch.__func__ is not Simulation.step_batch.__func__
+
+    @classmethod
+    def step_batch(cls, state: dict, active: np.ndarray) -> np.ndarray:
+        """
+        Hook method for advancing a whole batch of Simulations of this kind by one step, as one array computation. See :class:`BatchSimulation`.
+
+        Subclasses that can be batched should override this method and list the attributes that make up their state in the ``batch_attributes`` class attribute.
+
+        Parameters
+        ----------
+        state : :class:`dict`
+            A dictionary mapping each of the ``batch_attributes`` to an array of the values of that attribute for every member of the batch, stacked along a new leading axis.
+            It should be updated in place (either by writing into the arrays, or by replacing them in the dictionary with new arrays of the same shape).
+        active : :class:`numpy.ndarray`
+            A boolean mask along the batch axis, ``False`` for members that have already finished.
+            The values of finished members have already been unpacked, so it doesn't matter what happens to them.
+
+        Returns
+        -------
+        :class:`numpy.ndarray`
+            A boolean mask along the batch axis, ``True`` for members that are finished after this step.
+        """
+        raise NotImplementedError
+
+    @property
+    def supports_warm_start(self) -> bool:
+        """``True`` if this kind of Simulation overrides :meth:`Simulation.warm_start_from`."""
+        return type(self).warm_start_from is not Simulation.warm_start_from
+
+    def warm_start_from(self, other: 'Simulation'):
+        """
+        Hook method for seeding the state of this (new) Simulation from a finished Simulation of a nearby Specification, so that it converges faster.
+
+        Subclasses that can be warm-started should override this method. See :meth:`Specification.to_simulation`.
+
+        Parameters
+        ----------
+        other : :class:`Simulation`
+            A finished Simulation of the same kind, whose Specification differs from this one's only in its numeric parameters.
+        """
+        raise NotImplementedError
+
+    def info(self) -> Info:
+        """Return a string describing the parameters of the Simulation and its associated Specification."""
+        info = super().info()
+
+        info.add_info(self.spec.info())
+
+        info_diag = Info(header = f'Status: {self.status}')
+        info_diag.add_field('Start Time', self.init_time)
+        info_diag.add_field('Latest Run Time', self.latest_run_time)
+        info_diag.add_field('End Time', self.end_time)
+        info_diag.add_field('Elapsed Time', self.elapsed_time)
+        info_diag.add_field('Run Time', self.running_time)
+        if getattr(self, 'warm_started_from', None) is not None:
+            info_diag.add_field('Warm Started From', self.warm_started_from)
+        info.add_info(info_diag)
+
+        if len(getattr(self, 'phase_timings', ())) > 0:
+            info.add_info(self.phase_timings.info())
+
+        if getattr(self, 'resource_sampler', None) is not None:
+            info.add_info(self.resource_sampler.info())
+
+        if getattr(self, 'memory_tracker', None) is not None:
+            info.add_info(self.memory_tracker.info())
+
+        if getattr(self, 'checkpoint_policy', None) is not None:
+            info.add_info(self.checkpoint_policy.info())
+
+        if len(getattr(self, 'evaluation_caches', ())) > 0:
+            info_caches = Info(header = 'Evaluation Caches')
+            for cache in self.evaluation_caches:
+                info_caches.add_field(str(cache), f'{cache.hit_rate:.1%} hit rate')
+            info.add_info(info_caches)
+
+        return info
+
+
+class BatchSimulation:
+    """
+    A runner for many cheap Simulations of the same kind, which advances all of them at once as one array computation instead of calling each one's :meth:`Simulation.run_simulation`.
+
+    The Simulation class has to support batching (see :attr:`Simulation.supports_batching`): it names the attributes that make up its state in its ``batch_attributes`` class attribute, and implements the vectorized classmethod :meth:`Simulation.step_batch`.
+    The Simulations are created from their Specifications as usual, and then each of their batch attributes is stacked along a new leading "batch" axis, so the state of the batch is a dictionary of arrays (a struct of arrays).
+    Every member must have the same shape and kind of value for each batch attribute.
+
+    :meth:`BatchSimulation.run` calls :meth:`Simulation.step_batch` until every member has finished.
+    As soon as a member finishes, its values are unpacked back into its Simulation, whose status is then set to ``STATUS_FIN``.
+    Once at most half of the rows of the state arrays still belong to running members, the finished rows are dropped, so stragglers don't keep paying for the whole batch.
+
+    Use :meth:`BatchSimulation.run_many` to split a long list of Specifications into compatible batches of a limited size.
+    """
+
+    def __init__(self, specs: Iterable[Specification], max_steps: Optional[int] = None):
+        """
+        Parameters
+        ----------
+        specs
+            The Specifications to run. They must all have the same ``simulation_type``.
+        max_steps : :class:`int`
+            If given, stop after this many steps even if some members haven't finished. Their state is unpacked, but their status is set to ``STATUS_PAU`` instead.
+        """
+        specs = list(specs)
+        if len(specs) == 0:
+            raise SimulacraException(f'A {self.__class__.__name__} needs at least one Specification')
+
+        simulation_types = {spec.simulation_type for spec in specs}
+        if len(simulation_types) > 1:
+            raise SimulacraException(f'All Specifications in a {self.__class__.__name__} must have the same simulation_type, but got {", ".join(t.__name__ for t in simulation_types)}')
+
+        self.simulation_type = simulation_types.pop()
+        self.max_steps = max_steps
+        self.steps = 0
+
+        self.simulations = [spec.to_simulation() for spec in specs]
+        if not self.simulations[0].supports_batching:
+            raise SimulacraException(f'{self.simulation_type.__name__} does not support batching, because it does not define batch_attributes and override step_batch')
+
+        self.state = collections.OrderedDict()
+        self._is_array = {}
+        for attr in self.simulation_type.batch_attributes:
+            values = [getattr(sim, attr) for sim in self.simulations]
+            if len({(np.shape(value), isinstance(value, np.ndarray)) for value in values}) > 1:
+                raise SimulacraException(f'Batch attribute {attr} of {self.simulation_type.__name__} must have the same shape for every Specification in a {self.__class__.__name__}')
+
+            self.state[attr] = np.stack(values)
+            self._is_array[attr] = isinstance(values[0], np.ndarray)
+
+        self._members = np.arange(len(self.simulations))  # the index into self.simulations of each row of the state arrays
+        self._active = np.ones(len(self.simulations), dtype = bool)
+
+    def __str__(self):
+        return f'{self.__class__.__name__}({len(self)} {self.simulation_type.__name__}s)'
+
+    def __repr__(self):
+        return str(self)
+
+    def __len__(self):
+        return len(self.simulations)
+
+    @property
+    def active(self) -> int:
+        """The number of members that haven't finished yet."""
+        return int(np.count_nonzero(self._active))
+
+    def run(self) -> List[Simulation]:
+        """
+        Run every member of the batch until it finishes (or ``max_steps`` is reached).
+
+        Returns
+        -------
+        :class:`list` of :class:`Simulation`
+            The Simulations of the batch, in the same order as their Specifications.
+        """
+        for sim in self.simulations:
+            sim.status = STATUS_RUN
+
+        while self._active.any():
+            if self.max_steps is not None and self.steps >= self.max_steps:
+                logger.warning(f'{self} reached its maximum of {self.max_steps} steps with {self.active} members still running')
+                self._unpack(self._active, STATUS_PAU)
+                break
+
+            done = np.asarray(self.simulation_type.step_batch(self.state, self._active), dtype = bool)
+            self.steps += 1
+
+            finished = done & self._active
+            if finished.any():
+                self._unpack(finished, STATUS_FIN)
+                self._active &= ~done
+
+                if 0 < self.active <= len(self._active) // 2:
+                    self._compact()
+
+        logger.debug(f'{self} finished after {self.steps} steps')
+
+        return self.simulations
+
+    def _unpack(self, rows: np.ndarray, status: str):
+        """Copy the values of the given rows of the state back into their Simulations, and set their status."""
+        for row in np.flatnonzero(rows):
+            sim = self.simulations[self._members[row]]
+            for attr, array in self.state.items():
+                setattr(sim, attr, array[row].copy() if self._is_array[attr] else array[row].item())
+            sim.status = status
+
+    def _compact(self):
+        """Drop the rows of finished members from the state."""
+        for attr, array in self.state.items():
+            self.state[attr] = array[self._active]
+        self._members = self._members[self._active]
+        self._active = self._active[self._active]
+
+    @classmethod
+    def run_many(cls, specs: Iterable[Specification], batch_size: int = 1024, max_steps: Optional[int] = None) -> List[Simulation]:
         """
-        Atomically pickle the Specification to a file.
+        Run any number of Specifications in batches of at most `batch_size` Specifications that share a ``simulation_type``.
 
         Parameters
         ----------
-        target_dir : :class:`str`
-            The directory to save the Specification to.
-        file_extension : :class:`str`
-            The file extension to name the Specification with (for keeping track of things, no actual effect).
-        compressed : :class:`bool`
-            Whether to compress the Beet using gzip.
+        specs
+            The Specifications to run.
+        batch_size : :class:`int`
+            The largest number of Specifications to run in one :class:`BatchSimulation`, which bounds the memory used by its state.
+        max_steps : :class:`int`
+            Passed to each :class:`BatchSimulation`.
 
         Returns
         -------
-        :class:`str`
-            The path to the saved Specification.
+        :class:`list` of :class:`Simulation`
+            The Simulations, in the same order as their Specifications.
         """
-        return super().save(target_dir = target_dir, file_extension = file_extension, compressed = compressed)
+        specs = list(specs)
 
-    def to_simulation(self) -> 'Simulation':
-        """Return a Simulation of the type associated with the Specification, generated from this instance."""
-        return self.simulation_type(self)
-
-    def info(self) -> Info:
-        info = super().info()
+        indices_by_type = collections.OrderedDict()
+        for index, spec in enumerate(specs):
+            indices_by_type.setdefault(spec.simulation_type, []).append(index)
 
-        if len(self._extra_attr_keys) > 0:
-            info_extra = Info(header = f'Extra Attributes')
+        simulations = [None] * len(specs)
+        for indices in indices_by_type.values():
+            for start in range(0, len(indices), batch_size):
+                chunk = indices[start:start + batch_size]
+                batch = cls((specs[index] for index in chunk), max_steps = max_steps)
+                for index, sim in zip(chunk, batch.run()):
+                    simulations[index] = sim
 
-            for k in self._extra_attr_keys:
-                info_extra.add_field(k, getattr(self, k))
+        return simulations
 
-            info.add_info(info_extra)
+    def info(self) -> Info:
+        info = Info(header = str(self))
+        info.add_field('Steps', self.steps)
+        info.add_field('Running Members', self.active)
+        info.add_field('Batch Attributes', ', '.join(self.state))
+        info.add_field('State Size', utils.bytes_to_str(sum(array.nbytes for array in self.state.values())))
 
         return info
 
 
-# Simulation status names
-STATUS_INI = 'initialized'
-STATUS_RUN = 'running'
-STATUS_FIN = 'finished'
-STATUS_PAU = 'paused'
-STATUS_ERR = 'error'
-
-
-class Simulation(Beet):
+class ResultStore:
     """
-    A class that represents a single simulation.
-
-    It should be subclassed and customized for each variety of simulation.
+    A local, content-addressed store of finished :class:`Simulation`, keyed by the :meth:`Specification.content_hash` of their Specifications.
 
-    Simulations should generally be instantiated using Specification.to_simulation() to avoid possible mismatches.
+    Simulations are saved as ``{directory}/{content_hash}.sim``.
+    If the total size of the store exceeds ``max_bytes``, the least recently used Simulations are evicted.
 
     Attributes
     ----------
-    uuid
-        A `Universally Unique Identifier <https://en.wikipedia.org/wiki/Universally_unique_identifier>`_ for the :class:`Simulation`.
-    status : :class:`str`
-        The status of the Simulation. One of ``'initialized'``, ``'running'``, ``'finished'``, ``'paused'``, or ``'error'``.
+    hits
+        The number of calls to :meth:`ResultStore.get` that found a Simulation.
+    misses
+        The number of calls to :meth:`ResultStore.get` that did not.
+    evictions
+        The number of Simulations removed to stay under ``max_bytes``.
     """
 
-    _status = utils.RestrictedValues('status', {'', STATUS_INI, STATUS_RUN, STATUS_FIN, STATUS_PAU, STATUS_ERR})
+    file_extension = '.sim'
 
-    def __init__(self, spec: Specification):
+    def __init__(self, directory: str, max_bytes: Optional[int] = None):
         """
         Parameters
         ----------
-        spec : :class:`Specification`
-            The :class:`Specification` for the Simulation.
+        directory : :class:`str`
+            The directory to keep Simulations in.
+        max_bytes : :class:`int`
+            The maximum total size of the store, in bytes. If ``None``, the store is unbounded.
         """
-        super().__init__(spec.name, file_name = spec.file_name)  # inherit name and file_name from spec
+        self.directory = os.path.abspath(directory)
+        self.max_bytes = max_bytes
 
-        self.spec = spec
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
 
-        # diagnostic data
-        self.runs = 0
-        self.init_time = None
-        self.start_time = None
-        self.end_time = None
-        self.elapsed_time = None
-        self.latest_run_time = None
-        self.running_time = datetime.timedelta()
+        self._lock = threading.Lock()
+        self._index = {}  # path -> (modification time, parameter space hash, numeric parameters)
 
-        self._status = ''
-        self.status = STATUS_INI
+        utils.ensure_dir_exists(self.directory)
+
+    def __str__(self):
+        return f'{self.__class__.__name__}({self.directory}, {len(self)} Simulations, {utils.bytes_to_str(self.size)})'
+
+    def __repr__(self):
+        return utils.field_str(self, 'directory', 'max_bytes')
+
+    def _path(self, content_hash: str) -> str:
+        return os.path.join(self.directory, content_hash + self.file_extension)
+
+    def _entries(self) -> List[os.DirEntry]:
+        return [entry for entry in os.scandir(self.directory) if entry.is_file() and entry.name.endswith(self.file_extension)]
+
+    def __len__(self):
+        return len(self._entries())
+
+    def __contains__(self, spec: Specification):
+        return os.path.exists(self._path(spec.content_hash()))
 
     @property
-    def status(self):
-        return self._status
+    def size(self) -> int:
+        """The total size of the store, in bytes."""
+        return sum(entry.stat().st_size for entry in self._entries())
 
-    @status.setter
-    def status(self, status):
+    @property
+    def hit_rate(self) -> float:
+        """The fraction of calls to :meth:`ResultStore.get` that found a Simulation."""
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups > 0 else 0
+
+    def get(self, spec: Specification) -> Optional['Simulation']:
         """
-        Set the status of the :class:`Simulation`.
+        Return the finished Simulation for a Specification with the same content as `spec`, or ``None`` if the store doesn't have one.
 
-        Defined statuses are ``STATUS_INI`` (initialized), ``STATUS_RUN`` (running), ``STATUS_FIN`` (finished), ``STATUS_PAU`` (paused), and ``STATUS_ERR`` (error).
-        These statuses can have side effects on the simulation's time diagnostics.
+        The returned Simulation is given the name, file name, and Specification of `spec`, so it can be saved in place of a Simulation run from `spec`.
+        """
+        path = self._path(spec.content_hash())
+        try:
+            sim = Simulation.load(path)
+            os.utime(path)  # mark as recently used
+        except (FileNotFoundError, EOFError, pickle.UnpicklingError) as e:
+            if not isinstance(e, FileNotFoundError):
+                logger.warning(f'Discarding unreadable entry {path} in {self}: {e}')
+                os.remove(path)
+            with self._lock:
+                self.misses += 1
+            return None
+
+        sim.name = spec.name
+        sim.file_name = spec.file_name
+        sim.spec = spec
+
+        with self._lock:
+            self.hits += 1
+        logger.debug(f'Found {sim} in {self} for {spec}')
+
+        return sim
+
+    def _refresh_index(self):
+        """Bring the parameter space index up to date with the directory, peeking only at new or modified files."""
+        index = {}
+        for entry in self._entries():
+            mtime = entry.stat().st_mtime_ns
+            cached = self._index.get(entry.path)
+            if cached is not None and cached[0] == mtime:
+                index[entry.path] = cached
+                continue
 
-        Parameters
-        ----------
-        status : :class:`str`
-            The new status for the simulation
+            try:
+                metadata = Simulation.peek(entry.path)
+                index[entry.path] = (mtime, metadata['spec_parameter_space'], metadata['spec_parameters'])
+            except (SimulacraException, KeyError, EOFError, ValueError):  # legacy or unreadable files can't be neighbours
+                continue
+
+        self._index = index
+
+    def nearest(self, spec: Specification) -> Optional['Simulation']:
         """
-        now = datetime.datetime.utcnow()
+        Return the finished Simulation whose Specification is nearest to `spec` in parameter space, or ``None`` if there isn't one.
 
-        if status == STATUS_INI:
-            self.init_time = now
-        elif status == STATUS_RUN:
-            if self.latest_run_time is None:
-                self.start_time = now
-            self.latest_run_time = now
-            self.runs += 1
-        elif status == STATUS_PAU:
-            if self.latest_run_time is not None:
-                self.running_time += now - self.latest_run_time
-        elif status == STATUS_FIN:
-            if self.latest_run_time is not None:
-                self.running_time += now - self.latest_run_time
-            self.end_time = now
-            self.elapsed_time = self.end_time - self.init_time
+        Only Specifications with the same :meth:`Specification.parameter_space_hash` as `spec` are candidates, so that they differ from it only in their :meth:`Specification.numeric_parameters`.
+        Distances are Euclidean, after scaling each parameter by the range of its values among the candidates.
+        The index of parameters is built from the file headers, so only the nearest Simulation is actually loaded.
+        """
+        space = spec.parameter_space_hash()
+        target = spec.numeric_parameters()
+        if len(target) == 0:
+            return None
 
-        self._status = status
+        with self._lock:
+            self._refresh_index()
+            candidates = [(path, parameters) for path, (_, candidate_space, parameters) in self._index.items() if candidate_space == space]
 
-        logger.debug("{} {} ({}) status set to {}".format(self.__class__.__name__, self.name, self.file_name, status))
+        if len(candidates) == 0:
+            return None
 
-    def __str__(self):
-        return super().__str__() + f' {{{self.status}}}'
+        names = sorted(target)
+        points = np.array([[parameters[name] for name in names] for _, parameters in candidates])
+        scale = np.ptp(points, axis = 0)
+        scale[scale == 0] = 1
+        distances = np.sum(((points - np.array([target[name] for name in names])) / scale) ** 2, axis = 1)
+
+        path = candidates[int(np.argmin(distances))][0]
+        try:
+            return Simulation.load(path)
+        except FileNotFoundError:  # evicted since the index was refreshed
+            return None
 
-    def save(self, target_dir: Optional[str] = None, file_extension: str = '.sim', compressed: bool = True) -> str:
+    def put(self, sim: 'Simulation') -> str:
         """
-        Atomically pickle the Simulation to a file.
+        Add a finished Simulation to the store, evicting the least recently used Simulations if the store grows past ``max_bytes``.
 
         Parameters
         ----------
-        target_dir : :class:`str`
-            The directory to save the Simulation to.
-        file_extension : :class:`str`
-            The file extension to name the Simulation with (for keeping track of things, no actual effect).
-        compressed : :class:`bool`
-            Whether to compress the Beet using gzip.
+        sim : :class:`Simulation`
+            The Simulation to store. Must be finished.
 
         Returns
         -------
         :class:`str`
-            The path to the saved Simulation.
+            The path the Simulation was saved to.
         """
-        if self.status != STATUS_FIN:
-            self.status = STATUS_PAU
-
-        return super().save(target_dir = target_dir, file_extension = file_extension, compressed = compressed)
-
-    def run_simulation(self):
-        """Hook method for running the Simulation, whatever that may entail."""
-        raise NotImplementedError
-
-    def info(self) -> Info:
-        """Return a string describing the parameters of the Simulation and its associated Specification."""
-        info = super().info()
-
-        info.add_info(self.spec.info())
-
-        info_diag = Info(header = f'Status: {self.status}')
-        info_diag.add_field('Start Time', self.init_time)
-        info_diag.add_field('Latest Run Time', self.latest_run_time)
-        info_diag.add_field('End Time', self.end_time)
-        info_diag.add_field('Elapsed Time', self.elapsed_time)
-        info_diag.add_field('Run Time', self.running_time)
-        info.add_info(info_diag)
-
-        return info
+        if sim.status != STATUS_FIN:
+            raise SimulacraException(f'Only finished Simulations can be stored, but {sim} is {sim.status}')
+
+        content_hash = sim.spec.content_hash()
+        path = self._path(content_hash)
+
+        extra_metadata = dict(  # indexed by ResultStore.nearest
+            spec_parameter_space = sim.spec.parameter_space_hash(),
+            spec_parameters = sim.spec.numeric_parameters(),
+        )
+        with tempfile.TemporaryDirectory(dir = self.directory) as staging_dir:
+            os.replace(sim.save(target_dir = staging_dir, extra_metadata = extra_metadata), path)
+        logger.debug(f'Stored {sim} in {self} as {content_hash}')
+
+        self.evict()
+
+        return path
+
+    def evict(self):
+        """Remove the least recently used Simulations until the store is no larger than ``max_bytes``."""
+        if self.max_bytes is None:
+            return
+
+        with self._lock:
+            entries = sorted(((entry.stat().st_mtime, entry.stat().st_size, entry.path) for entry in self._entries()))
+            size = sum(entry_size for _, entry_size, _ in entries)
+            for _, entry_size, entry_path in entries:
+                if size <= self.max_bytes:
+                    break
+                os.remove(entry_path)
+                size -= entry_size
+                self.evictions += 1
+                logger.debug(f'Evicted {entry_path} from {self}')
+
+    def clear(self):
+        """Remove every Simulation from the store."""
+        for entry in self._entries():
+            os.remove(entry.path)
 
 
 class Summand:
     """
     An object that can be added to other objects that it shares a superclass with.
+
+    Attributes
+    ----------
+    evaluate_batch
+        A class attribute. Subclasses whose instances differ only in their parameters can set it to a classmethod ``evaluate_batch(cls, summands, *args, **kwargs)`` that returns the sum of the values of all of the `summands` (which are all of exactly that class), usually by stacking their parameters with :meth:`Summand.stack_parameters` and evaluating them in one broadcast NumPy expression.
+        :class:`Sum` then evaluates its Summands of that class together, in batches of at most ``Sum.fusion_batch_size`` Summands and ``Sum.fusion_max_elements`` total elements (Summands times the size of the largest array argument).
+        A subclass that overrides ``__call__`` without also overriding ``evaluate_batch`` is not evaluated together, since the inherited ``evaluate_batch`` would calculate the parent's value.
     """
 
+    evaluate_batch = None
+    supports_broadcasting = None  # whether the Summand can be called with an array of times that broadcasts against its other arguments (None means check, see evaluate_grid)
+
     def __init__(self, *args, **kwargs):
         self.summation_class = Sum
 
@@ -515,10 +3443,139 @@ class Summand:
     def __call__(self, *args, **kwargs):
         raise NotImplementedError
 
+    def accumulate(self, out: np.ndarray, *args, **kwargs) -> np.ndarray:
+        """
+        Add the value of the Summand at `args` and `kwargs` to `out`, in place if possible.
+
+        Subclasses that can add their value into an existing array without allocating a temporary one should override this method.
+        The default implementation calls the Summand and adds the result to `out`.
+
+        Parameters
+        ----------
+        out : :class:`numpy.ndarray`
+            The array to accumulate into.
+        args, kwargs
+            The arguments to evaluate the Summand at.
+
+        Returns
+        -------
+        :class:`numpy.ndarray`
+            `out`, or a new array if `out` can't hold the sum (because the value has a wider dtype or a larger shape).
+        """
+        return _add_into(out, self(*args, **kwargs))
+
+    def evaluate_grid(self, x, t: np.ndarray, chunk_size: int = 256, **kwargs) -> np.ndarray:
+        """
+        Evaluate the Summand as ``self(x, t, **kwargs)`` at every time in `t`, returning an array with time along its first axis and the shape of `x` after it.
+
+        The Summand is called with a chunk of times at once, shaped ``(chunk_size, 1, ...)`` so that it broadcasts against `x`.
+        Summands that don't support broadcasting (because calling them that way raises an exception or returns an array of the wrong shape) are evaluated one time at a time instead.
+        This is checked on the first chunk, and the result is used for the rest of them.
+        Set the class attribute ``supports_broadcasting`` to ``True`` or ``False`` to skip the check.
+
+        Parameters
+        ----------
+        x
+            The (fixed) first argument of the Summand, such as a spatial grid.
+        t : :class:`numpy.ndarray`
+            A one-dimensional array of times.
+        chunk_size : :class:`int`
+            The maximum number of times to evaluate at once, which bounds the size of intermediate arrays.
+        kwargs
+            Additional keyword arguments for the Summand.
+
+        Returns
+        -------
+        :class:`numpy.ndarray`
+        """
+        t = np.asarray(t)
+        x_shape = np.shape(x)
+        broadcast = self.supports_broadcasting
+        result = None
+
+        for start in range(0, len(t), chunk_size):
+            t_chunk = t[start:start + chunk_size]
+            values = None
+
+            if broadcast is not False:
+                try:
+                    values = np.asarray(self(x, t_chunk.reshape((-1,) + (1,) * len(x_shape)), **kwargs))
+                    if values.shape != t_chunk.shape + x_shape:
+                        raise ValueError(f'expected shape {t_chunk.shape + x_shape}, got {values.shape}')
+                except Exception as e:
+                    if broadcast:
+                        raise
+                    logger.debug(f'{self} does not support broadcasting over time, evaluating one time at a time instead: {e}')
+                    broadcast = False  # don't try again for the remaining chunks
+                    values = None
+                else:
+                    broadcast = True
+
+            if values is None:
+                values = np.array([np.broadcast_to(self(x, t_, **kwargs), x_shape) for t_ in t_chunk]).reshape(t_chunk.shape + x_shape)
+
+            if result is None:
+                result = np.empty(t.shape + x_shape, dtype = values.dtype)
+            elif np.result_type(result, values) != result.dtype:
+                result = result.astype(np.result_type(result, values))
+            result[start:start + len(t_chunk)] = values
+
+        if result is None:  # no times
+            result = np.empty(t.shape + x_shape)
+
+        return result
+
+    @staticmethod
+    def stack_parameters(summands: Iterable['Summand'], *names: str, ndim: int = 1) -> Tuple[np.ndarray, ...]:
+        """
+        Stack the attributes `names` of the `summands` into arrays, one per attribute, for use in an ``evaluate_batch`` implementation.
+
+        Each array has the Summands along its first axis, followed by ``ndim - 1`` length-one axes, so that it broadcasts against arguments with ``ndim - 1`` dimensions.
+        """
+        summands = list(summands)
+        shape = (len(summands),) + (1,) * (ndim - 1)
+
+        return tuple(np.array([getattr(summand, name) for summand in summands]).reshape(shape) for name in names)
+
     def info(self) -> Info:
         return Info(header = self.__class__.__name__)
 
 
+class _FusedSummands(Summand):
+    """A group of Summands of the same class, evaluated together by the class's ``evaluate_batch``."""
+
+    def __init__(self, summand_type: type, summands: List[Summand]):
+        super().__init__()
+        self.summand_type = summand_type
+        self.summands = summands
+
+    def __str__(self):
+        return f'{self.summand_type.__name__} x {len(self.summands)}'
+
+    def __call__(self, *args, **kwargs):
+        return self.summand_type.evaluate_batch(self.summands, *args, **kwargs)
+
+
+@functools.lru_cache(maxsize = None)
+def _can_fuse(summand_type: type) -> bool:
+    """Return ``True`` if the Summands of `summand_type` can be evaluated together by its ``evaluate_batch``, which must be defined no higher in its MRO than its ``__call__``."""
+    if summand_type.evaluate_batch is None:
+        return False
+
+    def defined_in(name):
+        return next(cls for cls in summand_type.__mro__ if name in cls.__dict__)
+
+    return issubclass(defined_in('evaluate_batch'), defined_in('__call__'))
+
+
+def _add_into(out: np.ndarray, value) -> np.ndarray:
+    """Add `value` to `out` in place if `out` has the dtype and shape of the sum, and out of place otherwise."""
+    if np.result_type(out, value) == out.dtype and np.broadcast(out, value).shape == out.shape:
+        return np.add(out, value, out = out)
+
+    return out + value
+
+
 class Sum(Summand):
     """
     A class that represents a sum of Summands.
@@ -527,11 +3584,29 @@ class Sum(Summand):
     """
 
     container_name = 'summands'
+    flatten = True  # if True, Sums of the same type and summation class nested in this one are replaced by their contents
+    fusion_batch_size = 64  # the maximum number of Summands evaluated together by an evaluate_batch call
+    fusion_max_elements = 2 ** 16  # the maximum (Summands x argument elements) in an evaluate_batch call, which keeps its intermediate arrays in cache
 
     def __init__(self, *summands, **kwargs):
         setattr(self, self.container_name, summands)
         super().__init__(**kwargs)
 
+        if self.flatten:
+            setattr(self, self.container_name, tuple(self._flattened(summands)))
+
+    def _flattened(self, summands: Iterable[Summand]) -> Iterable[Summand]:
+        for summand in summands:
+            if type(summand) is type(self) and summand.summation_class is self.summation_class:
+                yield from summand._container  # already flat, because it was flattened when it was created
+            else:
+                yield summand
+
+    @classmethod
+    def from_iterable(cls, summands: Iterable[Summand], **kwargs) -> 'Sum':
+        """Construct a Sum from an iterable of Summands (which may be a generator) in a single pass."""
+        return cls(*summands, **kwargs)
+
     @property
     def _container(self):
         return getattr(self, self.container_name)
@@ -549,8 +3624,89 @@ class Sum(Summand):
         """Return a new Sum, constructed from all of the contents of self and other."""
         return self.__class__(*self, *other)
 
-    def __call__(self, *args, **kwargs):
-        return sum(x(*args, **kwargs) for x in self._container)
+    def _terms(self, *args, **kwargs) -> Iterable[Summand]:
+        """Yield the terms to evaluate at `args` and `kwargs`: the Summands of the Sum, except that Summands of classes with an ``evaluate_batch`` are grouped by class."""
+        elements = max((np.size(arg) for arg in itertools.chain(args, kwargs.values()) if isinstance(arg, np.ndarray)), default = 1)
+        batch_size = min(self.fusion_batch_size, self.fusion_max_elements // max(elements, 1))
+
+        groups = collections.OrderedDict()
+        for x in self._container:
+            if batch_size > 1 and _can_fuse(type(x)):
+                groups.setdefault(type(x), []).append(x)
+            else:
+                yield x
+
+        for summand_type, group in groups.items():
+            if len(group) == 1:
+                yield group[0]
+                continue
+
+            for start in range(0, len(group), batch_size):
+                yield _FusedSummands(summand_type, group[start:start + batch_size])
+
+    def __call__(self, *args, out: Optional[np.ndarray] = None, **kwargs):
+        """
+        Evaluate the Sum by accumulating each of its Summands into one array (see :meth:`Summand.accumulate`).
+        Summands of a class with an ``evaluate_batch`` are evaluated together (see :class:`Summand`).
+
+        Parameters
+        ----------
+        args, kwargs
+            The arguments to evaluate the Summands at.
+        out : :class:`numpy.ndarray`
+            If given, the sum is written into this array instead of a new one.
+        """
+        if out is not None:
+            out[...] = 0
+            result = self.accumulate(out, *args, **kwargs)
+            if result is not out:
+                np.copyto(out, result, casting = 'same_kind')
+            return out
+
+        summands = self._terms(*args, **kwargs)
+        try:
+            first = next(summands)
+        except StopIteration:
+            return 0
+
+        value = first(*args, **kwargs)
+        if not isinstance(value, np.ndarray) or value.ndim == 0:  # scalars (which gain nothing from accumulation, and keep their Python types this way) or something we don't know how to accumulate into
+            return sum((x(*args, **kwargs) for x in summands), value)
+
+        try:
+            result = np.asarray(value + next(summands)(*args, **kwargs))  # a new array, because the first Summand might return an array it still owns
+        except StopIteration:
+            return value
+        del value  # don't hold on to a whole-grid temporary while accumulating
+
+        for x in summands:
+            result = x.accumulate(result, *args, **kwargs)
+
+        return result
+
+    def evaluate_grid(self, x, t: np.ndarray, chunk_size: int = 256, **kwargs) -> np.ndarray:
+        """Like :meth:`Summand.evaluate_grid`, but evaluates each Summand over the time grid separately, so that Summands that don't support broadcasting don't prevent the others from using it."""
+        if type(self).__call__ is not Sum.__call__:  # a subclass that combines its Summands differently
+            return super().evaluate_grid(x, t, chunk_size = chunk_size, **kwargs)
+
+        terms = list(self._container)
+        if len(terms) == 0:
+            return np.zeros(np.shape(t) + np.shape(x))
+
+        result = terms[0].evaluate_grid(x, t, chunk_size = chunk_size, **kwargs)
+        for term in terms[1:]:
+            result = _add_into(result, term.evaluate_grid(x, t, chunk_size = chunk_size, **kwargs))
+
+        return result
+
+    def accumulate(self, out: np.ndarray, *args, **kwargs) -> np.ndarray:
+        if type(self).__call__ is not Sum.__call__:  # a subclass that combines its Summands differently
+            return _add_into(out, self(*args, **kwargs))
+
+        for x in self._terms(*args, **kwargs):
+            out = x.accumulate(out, *args, **kwargs)
+
+        return out
 
     def info(self) -> Info:
         info = super().info()
@@ -562,3 +3718,146 @@ class Sum(Summand):
                 info.add_field(x.__class__.__name__, str(x))
 
         return info
+
+
+class SumBuilder:
+    """
+    A builder for large Sums.
+
+    Building a Sum by repeated addition (``s = s + term``) copies every existing Summand on each addition, which is quadratic in the number of Summands.
+    A SumBuilder collects Summands in a list and creates the Sum once, in :meth:`SumBuilder.build`.
+    """
+
+    def __init__(self, summation_class: Optional[type] = None):
+        """
+        Parameters
+        ----------
+        summation_class
+            The type of Sum to build. If ``None``, the ``summation_class`` of the first Summand added is used.
+        """
+        self.summation_class = summation_class
+        self.summands = []
+
+    def __str__(self):
+        return f'{self.__class__.__name__}({len(self)} summands)'
+
+    def __repr__(self):
+        return utils.field_str(self, 'summation_class')
+
+    def __len__(self):
+        return len(self.summands)
+
+    def add(self, summand: Summand) -> 'SumBuilder':
+        """Add a Summand (or every Summand in a Sum) to the builder, returning the builder."""
+        if self.summation_class is None:
+            self.summation_class = summand.summation_class
+        self.summands.extend(summand)  # Summands yield themselves when iterated over, and Sums yield their contents
+
+        return self
+
+    def __iadd__(self, summand: Summand) -> 'SumBuilder':
+        return self.add(summand)
+
+    def build(self, **kwargs) -> Sum:
+        """Return a new Sum of all of the Summands added so far."""
+        summation_class = self.summation_class if self.summation_class is not None else Sum
+
+        return summation_class.from_iterable(self.summands, **kwargs)
+
+
+def _cache_key_part(value):
+    """Return a hashable key for one argument of a cached call, or raise TypeError if it can't be cached."""
+    if isinstance(value, np.ndarray):
+        return 'array', id(value), value.__array_interface__['data'][0], value.shape, value.strides, value.dtype.str
+    hash(value)
+
+    return 'value', type(value), value
+
+
+class CachedSummand(Summand):
+    """
+    A wrapper around a :class:`Summand` that caches the values of its most recent calls.
+
+    Calls are keyed on the values of scalar (hashable) arguments and on the identity, memory, shape, strides, and dtype of array arguments.
+    Changes to the contents of an array argument are not detected, so the cache must be cleared whenever they might happen, which is usually once per step of a simulation: register the cache with :meth:`Simulation.register_evaluation_cache` and call :meth:`Simulation.end_step`.
+
+    Cached arrays are returned read-only, because they are shared between callers.
+    Calls with unhashable arguments are never cached.
+    The cached values are not pickled.
+    """
+
+    def __init__(self, summand: Summand, size: int = 4):
+        """
+        Parameters
+        ----------
+        summand : :class:`Summand`
+            The Summand to cache the values of.
+        size : :class:`int`
+            The number of most recent calls to keep the values of.
+        """
+        super().__init__()
+        self.summand = summand
+        self.summation_class = summand.summation_class
+        self.size = size
+
+        self.hits = 0
+        self.misses = 0
+
+        self._entries = collections.OrderedDict()  # key -> (arguments, value), oldest first; the arguments are kept so that their ids can't be reused
+
+    def __str__(self):
+        return f'Cached({self.summand})'
+
+    def __repr__(self):
+        return f'{self.__class__.__name__}({self.summand!r}, size = {self.size})'
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        state['_entries'] = collections.OrderedDict()
+
+        return state
+
+    @property
+    def hit_rate(self) -> float:
+        """The fraction of calls that were answered from the cache."""
+        calls = self.hits + self.misses
+        return self.hits / calls if calls > 0 else 0
+
+    def __call__(self, *args, **kwargs):
+        try:
+            key = (tuple(_cache_key_part(arg) for arg in args), tuple((k, _cache_key_part(v)) for k, v in sorted(kwargs.items())))
+        except TypeError:  # unhashable arguments
+            self.misses += 1
+            return self.summand(*args, **kwargs)
+
+        try:
+            value = self._entries[key][1]
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return value
+        except KeyError:
+            self.misses += 1
+
+        value = self.summand(*args, **kwargs)
+        if isinstance(value, np.ndarray):
+            value = value.view()
+            value.flags.writeable = False
+
+        self._entries[key] = ((args, kwargs), value)
+        while len(self._entries) > self.size:
+            self._entries.popitem(last = False)
+
+        return value
+
+    def clear(self):
+        """Forget all cached values (but not the hit and miss counts)."""
+        self._entries.clear()
+
+    def info(self) -> Info:
+        info = Info(header = str(self))
+
+        info.add_field('Cache Size', self.size)
+        info.add_field('Hit Rate', f'{self.hit_rate:.1%} ({self.hits} hits, {self.misses} misses)')
+        info.add_info(self.summand.info())
+
+        return info
@@ -18,6 +18,7 @@ limitations under the License.
 """
 
 import collections
+import concurrent.futures
 import datetime
 import functools
 import itertools
@@ -327,16 +328,18 @@ def run_in_process(func, args = (), kwargs = None):
     return output
 
 
-def find_or_init_sim(spec, search_dir: Optional[str] = None, file_extension = '.sim'):
+def find_or_init_sim(spec, search_dir: Optional[str] = None, file_extension = '.sim', store = None, warm_start: bool = False):
     """
     Try to load a :class:`simulacra.Simulation` by looking for a pickled :class:`simulacra.core.Simulation` named ``{search_dir}/{spec.file_name}.{file_extension}``.
-    If that fails, create a new Simulation from `spec`.
+    If that fails, look for a finished Simulation of an identical Specification in `store`, and if that fails too, create a new Simulation from `spec`, warm-started from the nearest Simulation in `store` if `warm_start` is ``True``.
 
     Parameters
     ----------
     spec : :class:`simulacra.core.Specification`
     search_dir : str
     file_extension : str
+    store : :class:`simulacra.core.ResultStore`
+    warm_start : bool
 
     Returns
     -------
@@ -348,7 +351,7 @@ def find_or_init_sim(spec, search_dir: Optional[str] = None, file_extension = '.
         path = os.path.join(search_dir, spec.file_name + file_extension)
         sim = core.Simulation.load(file_path = path)
     except FileNotFoundError:
-        sim = spec.to_simulation()
+        sim = spec.to_simulation(store = store, warm_start = warm_start)
 
     return sim
 
@@ -384,6 +387,53 @@ def multi_map(function, targets, processes = None, **kwargs):
     return tuple(output)
 
 
+BatchResult = collections.namedtuple('BatchResult', ('target', 'value', 'exception'))
+
+
+def thread_map(function, targets, workers: Optional[int] = None) -> Iterable[BatchResult]:
+    """
+    Map a function over an iterable of inputs using a pool of threads, yielding the results in input order as they become available.
+
+    Unlike :func:`multi_map`, an exception raised for one target does not abort the batch: it is reported in that target's result instead.
+    Threads are a good fit for work that releases the GIL, like compression and file I/O.
+    At most a few targets per worker are in flight at once, so `targets` can be a long (or lazy) iterable.
+
+    Parameters
+    ----------
+    function : a callable
+        The function to call on each of the `targets`.
+    targets : an iterable
+        An iterable of arguments to call the function on.
+    workers : :class:`int`
+        The number of threads to use. Defaults to the number of cores on the computer.
+
+    Returns
+    -------
+    iterable of :class:`BatchResult`
+        For each target, a ``(target, value, exception)`` tuple, where exactly one of `value` and `exception` is meaningful (the other is ``None``).
+    """
+    if workers is None:
+        workers = multiprocessing.cpu_count()
+
+    with concurrent.futures.ThreadPoolExecutor(max_workers = workers) as executor:
+        pending = collections.deque()
+
+        def pop():
+            target, future = pending.popleft()
+            try:
+                return BatchResult(target, future.result(), None)
+            except Exception as e:
+                return BatchResult(target, None, e)
+
+        for target in targets:
+            pending.append((target, executor.submit(function, target)))
+            if len(pending) >= 2 * workers:
+                yield pop()
+
+        while len(pending) > 0:
+            yield pop()
+
+
 class cached_property:
     """
     A property that is only computed once per instance and then replaces
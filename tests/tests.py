@@ -1,8 +1,18 @@
+import functools
+import gzip
+import io
 import os
+import pickle
+import pstats
 import unittest
 import shutil
+import tracemalloc
+from unittest import mock
+
+import numpy as np
 
 import simulacra as si
+from simulacra import cluster
 
 
 THIS_DIR = os.path.abspath(os.path.dirname(__file__))
@@ -53,6 +63,361 @@ class TestBeet(unittest.TestCase):
         self.assertIsNot(loaded, self.obj)  # beets should NOT be the same object
 
 
+class LzmaBeet(si.Beet):
+    codec = 'lzma'
+
+
+class TestBeetCodecs(unittest.TestCase):
+    def setUp(self):
+        self.obj = si.Beet('foo')
+        si.utils.ensure_dir_exists(TEST_DIR)
+
+    def tearDown(self):
+        shutil.rmtree(TEST_DIR)
+
+    def test_save_load_each_codec(self):
+        for codec in si.CODECS:
+            with self.subTest(codec = codec):
+                path = self.obj.save(target_dir = TEST_DIR, codec = codec)
+                self.assertEqual(si.Beet.load(path), self.obj)
+
+    def test_compression_level(self):
+        path = self.obj.save(target_dir = TEST_DIR, codec = 'gzip', compression_level = 1)
+        self.assertEqual(si.Beet.load(path), self.obj)
+
+    def test_codec_class_attribute(self):
+        obj = LzmaBeet('lzma')
+        path = obj.save(target_dir = TEST_DIR)
+        with open(path, mode = 'rb') as f:
+            self.assertTrue(f.read().startswith(si.BEET_MAGIC))
+        self.assertEqual(si.Beet.load(path), obj)
+
+    def test_unknown_codec(self):
+        with self.assertRaises(si.SimulacraException):
+            self.obj.save(target_dir = TEST_DIR, codec = 'not_a_codec')
+
+    def test_load_legacy_files(self):
+        for op in (gzip.open, open):
+            with self.subTest(op = op):
+                path = os.path.join(TEST_DIR, 'legacy.beet')
+                with op(path, mode = 'wb') as f:
+                    pickle.dump(self.obj, f, protocol = -1)
+                self.assertEqual(si.Beet.load(path), self.obj)
+
+
+class ArrayBeet(si.Beet):
+    def __init__(self, name):
+        super().__init__(name)
+
+        self.a = np.linspace(0, 1, 1000)
+        self.b = np.arange(17, dtype = np.int8)
+        self.c = np.ones((10, 10), dtype = np.complex128)[::2]  # not contiguous, so pickled in-band
+
+
+class TestParallelGzip(unittest.TestCase):
+    def setUp(self):
+        self.obj = ArrayBeet('pgzip')
+        self.obj.big = np.random.random(100000)
+        self.codec = si.ParallelGzipCodec(threads = 4, block_size = 10000)
+        si.utils.ensure_dir_exists(TEST_DIR)
+
+    def tearDown(self):
+        shutil.rmtree(TEST_DIR)
+
+    def test_save_load(self):
+        path = self.obj.save(target_dir = TEST_DIR, codec = self.codec)
+        loaded = si.Beet.load(path)
+        self.assertEqual(loaded, self.obj)
+        np.testing.assert_array_equal(loaded.big, self.obj.big)
+
+    def test_readable_by_gzip(self):
+        path = self.obj.save(target_dir = TEST_DIR, codec = self.codec)
+        metadata = si.Beet.peek(path)
+        with open(path, mode = 'rb') as f:
+            data = f.read()
+        start = data.index(b'\x1f\x8b')  # the first gzip member starts right after the header
+        payload = data[start:start + metadata['payload_size']]
+
+        loaded = pickle.loads(gzip.decompress(payload))
+        np.testing.assert_array_equal(loaded.big, self.obj.big)
+
+    def test_detects_truncation(self):
+        buffer = io.BytesIO()
+        with self.codec.writer(buffer) as stream:
+            stream.write(bytes(100000))
+
+        with self.assertRaises(EOFError):
+            with self.codec.reader(io.BytesIO(buffer.getvalue()[:-10])) as stream:
+                stream.read()
+
+
+class TestBeetOutOfBand(unittest.TestCase):
+    def setUp(self):
+        self.obj = ArrayBeet('arrays')
+        si.utils.ensure_dir_exists(TEST_DIR)
+
+    def tearDown(self):
+        shutil.rmtree(TEST_DIR)
+
+    def assert_arrays_equal(self, loaded):
+        for attr in ('a', 'b', 'c'):
+            np.testing.assert_array_equal(getattr(loaded, attr), getattr(self.obj, attr))
+
+    def test_save_load(self):
+        for codec in ('none', 'gzip'):
+            with self.subTest(codec = codec):
+                path = self.obj.save(target_dir = TEST_DIR, codec = codec, out_of_band = True)
+                loaded = si.Beet.load(path)
+                self.assertEqual(loaded, self.obj)
+                self.assert_arrays_equal(loaded)
+
+    def test_mmap_load(self):
+        path = self.obj.save(target_dir = TEST_DIR, out_of_band = True)
+        loaded = si.Beet.load(path, mmap = True)
+        self.assert_arrays_equal(loaded)
+
+        base = loaded.a
+        while base.base is not None and not isinstance(base, np.memmap):
+            base = base.base
+        self.assertIsInstance(base, np.memmap)
+
+        loaded.a[0] = 5  # copy-on-write, so the file is unchanged
+        self.assert_arrays_equal(si.Beet.load(path))
+
+    def test_mmap_ignored_for_in_band_files(self):
+        path = self.obj.save(target_dir = TEST_DIR)
+        self.assert_arrays_equal(si.Beet.load(path, mmap = True))
+
+
+class TestBeetPeek(unittest.TestCase):
+    def setUp(self):
+        si.utils.ensure_dir_exists(TEST_DIR)
+
+    def tearDown(self):
+        shutil.rmtree(TEST_DIR)
+
+    def test_peek_beet(self):
+        obj = si.Beet('foo', file_name = 'bar')
+        path = obj.save(target_dir = TEST_DIR, codec = 'bz2')
+        metadata = si.Beet.peek(path)
+
+        self.assertEqual(metadata['class'], 'simulacra.core.Beet')
+        self.assertEqual(metadata['name'], 'foo')
+        self.assertEqual(metadata['file_name'], 'bar')
+        self.assertEqual(metadata['uuid'], str(obj.uuid))
+        self.assertEqual(metadata['codec'], 'bz2')
+        self.assertLess(metadata['payload_size'], si.utils.get_file_size(path))
+
+    def test_peek_simulation(self):
+        sim = si.Simulation(si.Specification('baz'))
+        path = sim.save(target_dir = TEST_DIR)
+        metadata = si.Simulation.peek(path)
+
+        self.assertEqual(metadata['status'], si.STATUS_PAU)
+        self.assertEqual(metadata['init_time'], sim.init_time.isoformat())
+        self.assertEqual(metadata['running_time'], 0)
+        self.assertIsNone(metadata['end_time'])
+
+    def test_peek_legacy_file(self):
+        path = os.path.join(TEST_DIR, 'legacy.beet')
+        with gzip.open(path, mode = 'wb') as f:
+            pickle.dump(si.Beet('foo'), f, protocol = -1)
+
+        with self.assertRaises(si.SimulacraException):
+            si.Beet.peek(path)
+
+
+class TestClone(unittest.TestCase):
+    def setUp(self):
+        self.grid = np.linspace(0, 1, 100)
+        self.grid.flags.writeable = False
+        self.spec = si.Specification('clone', grid = self.grid, potential = np.ones(100), label = ['a'])
+
+    def test_clone_copies_by_default(self):
+        clone = self.spec.clone()
+        self.assertIsNot(clone.grid, self.spec.grid)
+        np.testing.assert_array_equal(clone.grid, self.spec.grid)
+
+    def test_clone_shares_read_only_arrays(self):
+        clone = self.spec.clone(share_immutable = True, label = ['b'])
+        self.assertIs(clone.grid, self.spec.grid)
+        self.assertIsNot(clone.potential, self.spec.potential)
+        self.assertEqual(clone.label, ['b'])
+        self.assertEqual(self.spec.label, ['a'])
+
+    def test_clone_shares_immutable_attributes(self):
+        spec = ImmutableSpecification('clone', table = {'x': 1})
+        clone = spec.clone(share_immutable = True)
+        self.assertIs(clone.table, spec.table)
+        self.assertIsNot(clone._extra_attr_keys, spec._extra_attr_keys)
+
+
+class ImmutableSpecification(si.Specification):
+    immutable_attributes = frozenset({'table'})
+
+
+class TestBeetVerify(unittest.TestCase):
+    def setUp(self):
+        self.obj = ArrayBeet('verify')
+        si.utils.ensure_dir_exists(TEST_DIR)
+
+    def tearDown(self):
+        shutil.rmtree(TEST_DIR)
+
+    def test_intact_files(self):
+        for kwargs in (dict(), dict(out_of_band = True), dict(codec = 'none')):
+            with self.subTest(**kwargs):
+                path = self.obj.save(target_dir = TEST_DIR, **kwargs)
+                self.assertTrue(si.Beet.verify(path))
+
+    def test_truncated_file(self):
+        path = self.obj.save(target_dir = TEST_DIR)
+        size = si.utils.get_file_size(path)
+
+        for length in (size - 1, size // 2, 20, 3, 1, 0):
+            with self.subTest(length = length):
+                with open(path, mode = 'r+b') as f:
+                    f.truncate(length)
+                self.assertFalse(si.Beet.verify(path, checksum = False))
+
+    def test_corrupt_file(self):
+        path = self.obj.save(target_dir = TEST_DIR)
+        with open(path, mode = 'r+b') as f:
+            f.seek(-100, os.SEEK_END)
+            byte = f.read(1)
+            f.seek(-100, os.SEEK_END)
+            f.write(bytes([byte[0] ^ 0xff]))
+
+        self.assertTrue(si.Beet.verify(path, checksum = False))  # same length, so only the checksum can tell
+        self.assertFalse(si.Beet.verify(path))
+
+    def test_legacy_file(self):
+        path = os.path.join(TEST_DIR, 'legacy.beet')
+        with gzip.open(path, mode = 'wb') as f:
+            pickle.dump(self.obj, f, protocol = -1)
+
+        with self.assertRaises(si.SimulacraException):
+            si.Beet.verify(path)
+
+        with open(path, mode = 'wb') as f:
+            pickle.dump(self.obj, f, protocol = -1)
+
+        with self.assertRaises(si.SimulacraException):
+            si.Beet.verify(path)
+
+    def test_not_a_beet_file(self):
+        path = os.path.join(TEST_DIR, 'garbage.beet')
+        with open(path, mode = 'wb') as f:
+            f.write(b'garbage')
+
+        self.assertFalse(si.Beet.verify(path))
+
+
+class TestSaveLoadMany(unittest.TestCase):
+    def setUp(self):
+        self.specs = [si.Specification(str(ii), x = ii) for ii in range(20)]
+        si.utils.ensure_dir_exists(TEST_DIR)
+
+    def tearDown(self):
+        shutil.rmtree(TEST_DIR)
+
+    def test_round_trip(self):
+        results = list(si.Beet.save_many(self.specs, target_dir = TEST_DIR, workers = 4))
+        self.assertEqual([r.target for r in results], self.specs)
+        self.assertTrue(all(r.exception is None for r in results))
+
+        paths = [r.value for r in results]
+        loaded = list(si.Specification.load_many(paths, workers = 4))
+        self.assertEqual([r.value for r in loaded], self.specs)
+
+    def test_errors_do_not_abort_batch(self):
+        paths = [spec.save(target_dir = TEST_DIR) for spec in self.specs[:3]]
+        paths.insert(1, os.path.join(TEST_DIR, 'missing.spec'))
+
+        results = list(si.Specification.load_many(paths, workers = 2))
+        self.assertEqual(len(results), 4)
+        self.assertIsInstance(results[1].exception, FileNotFoundError)
+        self.assertEqual([r.value for r in results if r.exception is None], self.specs[:3])
+
+    def test_job_processor_load_sims(self):
+        job_dir = os.path.join(TEST_DIR, 'job')
+        for spec in self.specs[:4]:
+            spec.save(target_dir = os.path.join(job_dir, 'inputs'))
+            sim = si.Simulation(spec)
+            sim.status = si.STATUS_RUN
+            sim.status = si.STATUS_FIN
+            sim.save(target_dir = os.path.join(job_dir, 'outputs'))
+
+        jp = cluster.JobProcessor('job', job_dir, si.Simulation)
+        jp.load_sims(workers = 2)
+        self.assertEqual(len(jp.unprocessed_sim_names), 0)
+
+        with mock.patch.object(si.Simulation, 'load', side_effect = RuntimeError('unexpected')):
+            with self.assertRaises(RuntimeError):
+                jp.load_sims(force_reprocess = True)
+
+
+class TestSpecTable(unittest.TestCase):
+    def setUp(self):
+        self.parameters = [
+            cluster.Parameter('a', [1, 2, 3], expandable = True),
+            cluster.Parameter('b', 'const'),
+            cluster.Parameter('c', np.linspace(0, 1, 4), expandable = True),
+            cluster.Parameter('d', [[1, 2], [3, 4]]),
+        ]
+        self.table = cluster.SpecTable('sweep', si.Specification, self.parameters)
+        si.utils.ensure_dir_exists(TEST_DIR)
+
+    def tearDown(self):
+        shutil.rmtree(TEST_DIR)
+
+    def test_rows_match_expand_parameters_to_dicts(self):
+        dicts = cluster.expand_parameters_to_dicts(self.parameters)
+        self.assertEqual(len(self.table), len(dicts))
+        for ii, d in enumerate(dicts):
+            self.assertEqual(self.table.row(ii), dict(d))
+
+    def test_getitem_materializes_specification(self):
+        spec = self.table[-1]
+        self.assertIsInstance(spec, si.Specification)
+        self.assertEqual(spec.file_name, str(len(self.table) - 1))
+        self.assertEqual(spec.a, 3)
+        self.assertEqual(spec.c, 1.0)
+        self.assertEqual(spec.d, [[1, 2], [3, 4]])
+        self.assertIsNot(spec.d, self.table[0].d)
+
+        with self.assertRaises(IndexError):
+            self.table[len(self.table)]
+
+    def test_columns_are_typed(self):
+        self.assertEqual(self.table.column('a').dtype.kind, 'i')
+        self.assertEqual(self.table.column('c').dtype, np.float64)
+        self.assertEqual(list(self.table.column('a')), [1] * 4 + [2] * 4 + [3] * 4)
+        self.assertEqual(len(self.table.column('b')), 12)
+
+    def test_mixed_types_are_not_converted(self):
+        parameters = [
+            cluster.Parameter('v', [1, 'a'], expandable = True),
+            cluster.Parameter('w', [1, 2.5], expandable = True),
+            cluster.Parameter('x', np.arange(2, dtype = np.float32), expandable = True),
+        ]
+        table = cluster.SpecTable('mixed', si.Specification, parameters)
+
+        self.assertEqual(table.column('v').dtype, object)
+        for ii, d in enumerate(cluster.expand_parameters_to_dicts(parameters)):
+            row = table.row(ii)
+            self.assertEqual(row, dict(d))
+            self.assertEqual([type(value) for value in row.values()], [type(value) for value in d.values()])
+
+    def test_round_trip(self):
+        path = self.table.save(target_dir = TEST_DIR)
+        self.assertTrue(path.endswith('.table'))
+
+        loaded = cluster.SpecTable.load(path)
+        self.assertEqual(len(loaded), len(self.table))
+        self.assertEqual(loaded.row(5), self.table.row(5))
+
+
 class TestSpecification(TestBeet):
     def setUp(self):
         self.obj = si.Specification('bar')
@@ -84,6 +449,840 @@ class TestSimulation(TestBeet):
                     self.obj.status = x
 
 
+class HistorySimulation(si.Simulation):
+    def __init__(self, spec):
+        super().__init__(spec)
+
+        self.history = np.zeros(100000)
+        self.step = 0
+
+    def advance(self, steps = 1):
+        for _ in range(steps):
+            self.history[self.step] = self.step + 1
+            self.step += 1
+
+
+class TestDeltaCheckpoints(unittest.TestCase):
+    def setUp(self):
+        self.sim = HistorySimulation(si.Specification('delta'))
+        si.utils.ensure_dir_exists(TEST_DIR)
+
+    def tearDown(self):
+        shutil.rmtree(TEST_DIR)
+
+    def assert_same_state(self, loaded):
+        self.assertEqual(loaded.step, self.sim.step)
+        np.testing.assert_array_equal(loaded.history, self.sim.history)
+
+    def test_delta_chain_round_trip(self):
+        path = self.sim.save(target_dir = TEST_DIR, delta = True)
+        base_size = si.utils.get_file_size(path)
+
+        for _ in range(3):
+            self.sim.advance(10)
+            self.sim.save(target_dir = TEST_DIR, delta = True)
+
+        self.assertEqual(si.utils.get_file_size(path), base_size)  # base untouched
+        self.assertLess(si.utils.get_file_size(path + si.DELTA_EXTENSION), base_size)
+        self.assert_same_state(HistorySimulation.load(path))
+
+    def test_array_growth(self):
+        path = self.sim.save(target_dir = TEST_DIR, delta = True)
+        self.sim.history = np.concatenate([self.sim.history, np.arange(10.)])
+        self.sim.save(target_dir = TEST_DIR, delta = True)
+
+        self.assert_same_state(HistorySimulation.load(path))
+
+    def test_compaction(self):
+        self.sim.delta_compaction_interval = 2
+        path = self.sim.save(target_dir = TEST_DIR, delta = True)
+        for _ in range(3):
+            self.sim.advance()
+            self.sim.save(target_dir = TEST_DIR, delta = True)
+
+        self.assertEqual(self.sim._delta_tracker.deltas, 0)  # the third save compacted
+        self.assertFalse(os.path.exists(path + si.DELTA_EXTENSION))
+        self.assert_same_state(HistorySimulation.load(path))
+
+    def test_finished_save_is_full(self):
+        path = self.sim.save(target_dir = TEST_DIR, delta = True)
+        self.sim.advance()
+        self.sim.status = si.STATUS_FIN
+        self.sim.save(target_dir = TEST_DIR, delta = True)
+
+        self.assertFalse(os.path.exists(path + si.DELTA_EXTENSION))
+        self.assertEqual(si.Simulation.peek(path)['status'], si.STATUS_FIN)
+
+    def test_truncated_delta_is_ignored(self):
+        path = self.sim.save(target_dir = TEST_DIR, delta = True)
+        self.sim.advance()
+        self.sim.save(target_dir = TEST_DIR, delta = True)
+        self.sim.advance()
+        self.sim.save(target_dir = TEST_DIR, delta = True)
+
+        delta_path = path + si.DELTA_EXTENSION
+        with open(delta_path, mode = 'r+b') as f:
+            f.truncate(si.utils.get_file_size(delta_path) - 5)
+
+        loaded = HistorySimulation.load(path)
+        self.assertEqual(loaded.step, 1)
+
+
+class TimeSeriesSimulation(si.Simulation):
+    time_series_attributes = frozenset({'norm_vs_time', 'field_vs_time', 'missing'})
+
+    def __init__(self, spec):
+        super().__init__(spec)
+
+        self.norm_vs_time = np.random.random(300000)
+        self.field_vs_time = np.random.random((5000, 3)) + 1j
+        self.alias = self.norm_vs_time
+
+
+class TestTimeSeries(unittest.TestCase):
+    def setUp(self):
+        self.sim = TimeSeriesSimulation(si.Specification('series'))
+        si.utils.ensure_dir_exists(TEST_DIR)
+
+    def tearDown(self):
+        shutil.rmtree(TEST_DIR)
+
+    def test_save_load(self):
+        for out_of_band in (False, True):
+            with self.subTest(out_of_band = out_of_band):
+                path = self.sim.save(target_dir = TEST_DIR, out_of_band = out_of_band)
+                loaded = TimeSeriesSimulation.load(path)
+
+                np.testing.assert_array_equal(loaded.norm_vs_time, self.sim.norm_vs_time)
+                np.testing.assert_array_equal(loaded.field_vs_time, self.sim.field_vs_time)
+                self.assertIs(loaded.alias, loaded.norm_vs_time)
+
+    def test_load_slice(self):
+        path = self.sim.save(target_dir = TEST_DIR)
+
+        for start, stop in ((0, 10), (131000, 140000), (299990, None), (5, 5)):
+            with self.subTest(start = start, stop = stop):
+                np.testing.assert_array_equal(TimeSeriesSimulation.load_slice(path, 'norm_vs_time', start, stop), self.sim.norm_vs_time[start:stop])
+
+        np.testing.assert_array_equal(TimeSeriesSimulation.load_slice(path, 'field_vs_time', 100, 200), self.sim.field_vs_time[100:200])
+
+    def test_load_slice_unknown_attribute(self):
+        path = self.sim.save(target_dir = TEST_DIR)
+        with self.assertRaises(si.SimulacraException):
+            TimeSeriesSimulation.load_slice(path, 'alias')
+
+    def test_load_slice_applies_delta_checkpoints(self):
+        path = self.sim.save(target_dir = TEST_DIR, delta = True)
+        self.sim.norm_vs_time[:10] = -1
+        self.sim.save(target_dir = TEST_DIR, delta = True)
+        self.assertTrue(os.path.exists(path + si.DELTA_EXTENSION))
+
+        np.testing.assert_array_equal(TimeSeriesSimulation.load_slice(path, 'norm_vs_time', 0, 20), self.sim.norm_vs_time[:20])
+        with self.assertRaises(si.SimulacraException):
+            TimeSeriesSimulation.load_slice(path, 'alias')
+
+
+class TestBackgroundCheckpoints(unittest.TestCase):
+    def setUp(self):
+        self.sim = HistorySimulation(si.Specification('background'))
+        si.utils.ensure_dir_exists(TEST_DIR)
+
+    def tearDown(self):
+        shutil.rmtree(TEST_DIR)
+
+    def test_snapshot_is_consistent(self):
+        self.sim.advance()
+        handle = self.sim.save(target_dir = TEST_DIR, background = True)
+        self.sim.advance(5)  # modifications after the save starts don't leak into the checkpoint
+
+        path = handle.join()
+        self.assertEqual(path, os.path.join(TEST_DIR, 'background.sim'))
+        self.assertFalse(os.path.exists(path + '.working'))
+
+        loaded = HistorySimulation.load(path)
+        self.assertEqual(loaded.step, 1)
+        self.assertEqual(loaded.history[1], 0)
+        self.assertNotIn('_pending_checkpoint', vars(loaded))
+
+    def test_finishing_waits_for_checkpoint(self):
+        handle = self.sim.save(target_dir = TEST_DIR, background = True)
+        self.sim.status = si.STATUS_FIN
+        self.assertTrue(handle.done())
+
+    def test_no_background_delta(self):
+        with self.assertRaises(si.SimulacraException):
+            self.sim.save(target_dir = TEST_DIR, background = True, delta = True)
+
+
+class HistorySpecification(si.Specification):
+    simulation_type = HistorySimulation
+
+
+class TestContentHash(unittest.TestCase):
+    def test_ignores_identity(self):
+        a = HistorySpecification('a', x = 1, y = np.arange(5))
+        b = HistorySpecification('b', y = np.arange(5), x = 1)
+        self.assertNotEqual(a, b)
+        self.assertEqual(a.content_hash(), b.content_hash())
+
+    def test_depends_on_content(self):
+        a = HistorySpecification('a', x = 1, y = np.arange(5))
+        self.assertNotEqual(a.content_hash(), HistorySpecification('a', x = 1, y = np.arange(6)).content_hash())
+        self.assertNotEqual(a.content_hash(), HistorySpecification('a', x = 1, y = np.arange(5.)).content_hash())
+        self.assertNotEqual(a.content_hash(), HistorySpecification('a', x = 1.0, y = np.arange(5)).content_hash())
+        self.assertNotEqual(a.content_hash(), si.Specification('a', x = 1, y = np.arange(5)).content_hash())
+
+    def test_numpy_scalars(self):
+        def hash_of(x):
+            return si.Specification('s', x = x).content_hash()
+
+        self.assertEqual(hash_of(1.0), hash_of(np.float64(1.0)))
+        self.assertEqual(hash_of(1 + 2j), hash_of(np.complex128(1 + 2j)))
+        self.assertEqual(hash_of(3), hash_of(np.int64(3)))
+        self.assertEqual(hash_of(True), hash_of(np.bool_(True)))
+        self.assertNotEqual(hash_of(np.int64(1)), hash_of(np.float64(1.0)))
+        self.assertNotEqual(hash_of(np.longdouble(1)), hash_of(np.longdouble(2)))
+
+    def test_sweeps_from_lists_and_arrays(self):
+        def hashes(values):
+            table = cluster.SpecTable('sweep', si.Specification, [cluster.Parameter('x', values, expandable = True)])
+            return [spec.content_hash() for spec in table]
+
+        self.assertEqual(hashes([0.0, 0.5, 1.0]), hashes(np.linspace(0, 1, 3)))
+        self.assertEqual(hashes([1, 2]), hashes(np.array([1, 2])))
+
+    def test_callables(self):
+        def scaled(k):
+            return lambda x: k * x
+
+        def hash_of(f):
+            return si.Specification('f', f = f).content_hash()
+
+        self.assertEqual(hash_of(scaled(2)), hash_of(scaled(2)))
+        self.assertNotEqual(hash_of(scaled(2)), hash_of(scaled(3)))
+        self.assertNotEqual(hash_of(lambda x: x), hash_of(lambda x: 2 * x))
+        self.assertEqual(hash_of(functools.partial(pow, 2)), hash_of(functools.partial(pow, 2)))
+        self.assertNotEqual(hash_of(functools.partial(pow, 2)), hash_of(functools.partial(pow, 3)))
+        self.assertNotEqual(hash_of(functools.partial(pow, 2, exp = 1)), hash_of(functools.partial(pow, 2, exp = 2)))
+
+
+class TestResultStore(unittest.TestCase):
+    def setUp(self):
+        self.store = si.ResultStore(os.path.join(TEST_DIR, 'store'))
+
+    def tearDown(self):
+        shutil.rmtree(TEST_DIR)
+
+    def finished_sim(self, name, **kwargs):
+        sim = HistorySpecification(name, **kwargs).to_simulation()
+        sim.advance(3)
+        sim.status = si.STATUS_FIN
+        return sim
+
+    def test_hit_and_miss(self):
+        spec = HistorySpecification('again', x = 1)
+        self.assertIsInstance(spec.to_simulation(store = self.store), HistorySimulation)
+        self.assertEqual(self.store.misses, 1)
+
+        sim = self.finished_sim('first', x = 1)
+        self.store.put(sim)
+
+        found = spec.to_simulation(store = self.store)
+        self.assertEqual(found, sim)
+        self.assertEqual(found.step, 3)
+        self.assertEqual((found.name, found.file_name), ('again', 'again'))
+        self.assertIs(found.spec, spec)
+        self.assertEqual(self.store.hits, 1)
+        self.assertEqual(self.store.hit_rate, 0.5)
+
+    def test_find_or_init_sim_consults_store(self):
+        sim = self.finished_sim('first', x = 2)
+        self.store.put(sim)
+
+        found = si.utils.find_or_init_sim(HistorySpecification('second', x = 2), search_dir = TEST_DIR, store = self.store)
+        self.assertEqual(found, sim)
+
+    def test_only_finished_sims(self):
+        with self.assertRaises(si.SimulacraException):
+            self.store.put(HistorySpecification('unfinished').to_simulation())
+
+    def test_eviction(self):
+        first = self.store.put(self.finished_sim('first', x = 1))
+        self.store.max_bytes = int(1.5 * os.path.getsize(first))
+        os.utime(first, (0, 0))
+
+        self.store.put(self.finished_sim('second', x = 2))
+        self.assertEqual(len(self.store), 1)
+        self.assertEqual(self.store.evictions, 1)
+        self.assertFalse(os.path.exists(first))
+
+
+class WarmStartSimulation(HistorySimulation):
+    def warm_start_from(self, other):
+        self.history[:] = other.history
+        self.step = other.step
+
+
+class WarmStartSpecification(si.Specification):
+    simulation_type = WarmStartSimulation
+
+
+class TestWarmStart(unittest.TestCase):
+    def setUp(self):
+        self.store = si.ResultStore(os.path.join(TEST_DIR, 'store'))
+        for x, steps in ((1, 1), (5, 5), (10, 10)):
+            sim = WarmStartSpecification(f'x={x}', x = x, y = 0.5, kind = 'a').to_simulation()
+            sim.advance(steps)
+            sim.status = si.STATUS_FIN
+            self.store.put(sim)
+
+    def tearDown(self):
+        shutil.rmtree(TEST_DIR)
+
+    def test_parameter_space_hash(self):
+        a = WarmStartSpecification('a', x = 1, kind = 'a')
+        self.assertEqual(a.numeric_parameters(), {'x': 1.0})
+        self.assertEqual(a.parameter_space_hash(), WarmStartSpecification('b', x = 2.5, kind = 'a').parameter_space_hash())
+        self.assertNotEqual(a.parameter_space_hash(), WarmStartSpecification('c', x = 1, kind = 'b').parameter_space_hash())
+        self.assertNotEqual(a.parameter_space_hash(), WarmStartSpecification('d', z = 1, kind = 'a').parameter_space_hash())
+
+    def test_warm_start_from_nearest(self):
+        sim = si.utils.find_or_init_sim(WarmStartSpecification('new', x = 6, y = 0.5, kind = 'a'), search_dir = TEST_DIR, store = self.store, warm_start = True)
+        self.assertEqual(sim.status, si.STATUS_INI)
+        self.assertEqual(sim.step, 5)
+        self.assertEqual(sim.warm_started_from, {'x': 5.0, 'y': 0.5})
+
+    def test_opt_in(self):
+        sim = WarmStartSpecification('new', x = 6, y = 0.5, kind = 'a').to_simulation(store = self.store)
+        self.assertEqual(sim.step, 0)
+        self.assertIsNone(sim.warm_started_from)
+
+    def test_no_neighbours_in_other_parameter_spaces(self):
+        sim = WarmStartSpecification('new', x = 6, y = 0.5, kind = 'b').to_simulation(store = self.store, warm_start = True)
+        self.assertEqual(sim.step, 0)
+
+    def test_parameters_only_in_stored_headers(self):
+        sim = WarmStartSpecification('x=6', x = 6, y = 0.5, kind = 'a').to_simulation()
+        sim.status = si.STATUS_FIN
+
+        self.assertNotIn('spec_parameter_space', si.Simulation.peek(sim.save(target_dir = TEST_DIR)))
+        metadata = si.Simulation.peek(self.store.put(sim))
+        self.assertEqual(metadata['spec_parameter_space'], sim.spec.parameter_space_hash())
+        self.assertEqual(metadata['spec_parameters'], {'x': 6.0, 'y': 0.5})
+
+
+class RecordingSimulation(si.Simulation):
+    def __init__(self, spec):
+        super().__init__(spec)
+
+        self.data = si.DataRecorder()
+        self.data.register('energy', expected_steps = 4)
+        self.data.register('position', dtype = np.int32, shape = (3,))
+
+    def run_simulation(self):
+        for step in range(10):
+            self.data.record_step(energy = step / 2, position = (step, 2 * step, 3 * step))
+
+
+class TestDataRecorder(unittest.TestCase):
+    def setUp(self):
+        si.utils.ensure_dir_exists(TEST_DIR)
+
+    def tearDown(self):
+        shutil.rmtree(TEST_DIR)
+
+    def test_grows_geometrically(self):
+        recorder = si.DataRecorder()
+        recorder.register('x', expected_steps = 3)
+        for step in range(10):
+            recorder.record('x', step)
+
+        np.testing.assert_array_equal(recorder['x'], np.arange(10))
+        self.assertEqual(recorder.capacity('x'), 12)
+
+    def test_duplicate_observable(self):
+        recorder = si.DataRecorder()
+        recorder.register('x')
+        with self.assertRaises(si.SimulacraException):
+            recorder.register('x')
+
+    def test_pickles_only_recorded_steps(self):
+        recorder = si.DataRecorder()
+        recorder.register('x', expected_steps = 100000)
+        recorder.record('x', 1)
+
+        self.assertLess(len(pickle.dumps(recorder)), 1000)
+        loaded = pickle.loads(pickle.dumps(recorder))
+        np.testing.assert_array_equal(loaded['x'], [1])
+        loaded.record('x', 2)
+        np.testing.assert_array_equal(loaded['x'], [1, 2])
+
+    def test_spill(self):
+        recorder = si.DataRecorder(spill_dir = TEST_DIR, spill_bytes = 100)
+        recorder.register('x', expected_steps = 4)
+        for step in range(100):
+            recorder.record('x', step)
+
+        path = os.path.join(TEST_DIR, 'recorder.x.rec')
+        self.assertTrue(os.path.exists(path))
+        self.assertIsInstance(recorder._arrays['x'], np.memmap)
+        np.testing.assert_array_equal(recorder['x'], np.arange(100))
+
+        loaded = pickle.loads(pickle.dumps(recorder))
+        self.assertNotIsInstance(loaded['x'], np.memmap)
+        np.testing.assert_array_equal(loaded['x'], np.arange(100))
+
+        recorder.close()
+        self.assertFalse(os.path.exists(path))
+        np.testing.assert_array_equal(recorder['x'], np.arange(100))
+
+    def test_simulation_save_load(self):
+        sim = RecordingSimulation(si.Specification('recording'))
+        sim.run_simulation()
+
+        loaded = RecordingSimulation.load(sim.save(target_dir = TEST_DIR))
+        np.testing.assert_array_equal(loaded.data['energy'], np.arange(10) / 2)
+        self.assertEqual(loaded.data['position'].shape, (10, 3))
+        self.assertEqual(loaded.data['position'].dtype, np.int32)
+
+
+class TestCheckpointPolicy(unittest.TestCase):
+    def setUp(self):
+        self.sim = HistorySimulation(si.Specification('policy'))
+        si.utils.ensure_dir_exists(TEST_DIR)
+
+    def tearDown(self):
+        shutil.rmtree(TEST_DIR)
+
+    def run_steps(self, steps):
+        paths = []
+        for _ in range(steps):
+            self.sim.advance()
+            paths.append(self.sim.maybe_checkpoint())
+        return paths
+
+    def test_no_policy(self):
+        self.assertEqual(self.run_steps(3), [None] * 3)
+
+    def test_step_interval(self):
+        self.sim.checkpoint_policy = si.CheckpointPolicy(target_dir = TEST_DIR, step_interval = 3)
+        self.sim.status = si.STATUS_RUN
+        paths = self.run_steps(7)
+
+        self.assertEqual([ii for ii, path in enumerate(paths) if path is not None], [2, 5])
+        self.assertEqual(self.sim.status, si.STATUS_RUN)
+        self.assertEqual(self.sim.runs, 1)
+        self.assertEqual(HistorySimulation.load(paths[5]).step, 6)
+        self.assertEqual(HistorySimulation.peek(paths[5])['status'], si.STATUS_PAU)
+        self.assertEqual([d.reason for d in self.sim.checkpoint_policy.decisions], ['step', 'step'])
+        self.assertTrue(all(d.duration > 0 for d in self.sim.checkpoint_policy.decisions))
+
+    def test_pause_counts_running_time_once(self):
+        self.sim.checkpoint_policy = si.CheckpointPolicy(target_dir = TEST_DIR)
+        self.sim.status = si.STATUS_RUN
+        si.utils.time.sleep(0.1)
+        self.sim.status = si.STATUS_PAU
+        running_time = self.sim.running_time
+
+        self.assertEqual([d.reason for d in self.sim.checkpoint_policy.decisions], ['pause'])
+        self.assertGreaterEqual(running_time.total_seconds(), 0.1)
+        self.assertLess(running_time.total_seconds(), 0.2)  # counted twice, it would be at least 0.2
+
+        self.sim.save(target_dir = TEST_DIR)
+        self.assertEqual(self.sim.running_time, running_time)
+
+    def test_save_without_pausing(self):
+        self.sim.status = si.STATUS_RUN
+        running_time = self.sim.running_time
+        path = self.sim.save(target_dir = TEST_DIR, pause = False)
+
+        self.assertEqual((self.sim.status, self.sim.runs, self.sim.running_time), (si.STATUS_RUN, 1, running_time))
+        loaded = HistorySimulation.load(path)
+        self.assertEqual(loaded.status, si.STATUS_PAU)
+        self.assertGreaterEqual(loaded.running_time, running_time)
+
+        self.sim.save(target_dir = TEST_DIR)
+        self.assertEqual(self.sim.status, si.STATUS_PAU)
+
+    def test_wall_clock_interval(self):
+        self.sim.checkpoint_policy = si.CheckpointPolicy(target_dir = TEST_DIR, wall_clock_interval = si.utils.datetime.timedelta(hours = 1))
+        self.sim.status = si.STATUS_RUN
+        self.assertEqual(self.run_steps(3), [None] * 3)
+
+        self.sim.checkpoint_policy.wall_clock_interval = si.utils.datetime.timedelta()
+        self.assertIsNotNone(self.run_steps(1)[0])
+
+    def test_adaptive(self):
+        policy = self.sim.checkpoint_policy = si.CheckpointPolicy(target_dir = TEST_DIR, max_checkpoint_fraction = 0.5)
+        self.sim.status = si.STATUS_RUN
+        self.assertIsNotNone(self.run_steps(1)[0])  # no measurements yet, so checkpoint to get one
+
+        policy._last_duration = 3600  # pretend saves are very slow
+        self.assertEqual(self.run_steps(3), [None] * 3)
+
+        with self.assertRaises(si.SimulacraException):
+            si.CheckpointPolicy(max_checkpoint_fraction = 1.5)
+
+    def test_status_transitions(self):
+        policy = self.sim.checkpoint_policy = si.CheckpointPolicy(target_dir = TEST_DIR, step_interval = 100)
+        self.sim.status = si.STATUS_RUN
+        self.run_steps(2)
+        self.sim.status = si.STATUS_PAU
+        self.sim.status = si.STATUS_RUN
+        self.run_steps(1)
+        self.sim.status = si.STATUS_FIN
+
+        self.assertEqual([(d.step, d.reason) for d in policy.decisions], [(2, 'pause'), (3, 'finish')])
+
+        loaded = HistorySimulation.load(os.path.join(TEST_DIR, 'policy.sim'))
+        self.assertEqual(loaded.status, si.STATUS_FIN)
+        self.assertEqual(loaded.checkpoint_policy.checkpoints, 1)  # the finishing checkpoint is counted after it is saved
+        self.assertIn('Checkpoints', str(loaded.info()))
+
+
+class PhasedSimulation(si.Simulation):
+    @si.timed_phase('physics')
+    def run_simulation(self):
+        self.status = si.STATUS_RUN
+        for _ in range(3):
+            with self.time_phase('step'):
+                sum(range(1000))
+        self.status = si.STATUS_FIN
+
+
+class TestPhaseTimings(unittest.TestCase):
+    def setUp(self):
+        si.utils.ensure_dir_exists(TEST_DIR)
+
+    def tearDown(self):
+        shutil.rmtree(TEST_DIR)
+
+    def test_timer(self):
+        timings = si.PhaseTimings()
+        for _ in range(2):
+            with timings.timer('a'):
+                pass
+        with self.assertRaises(ValueError):
+            with timings.timer('b'):
+                raise ValueError
+
+        self.assertEqual(list(timings), ['a', 'b'])
+        self.assertEqual(timings.calls['a'], 2)
+        self.assertEqual(si.PhaseTimings.from_dict(timings.to_dict()).to_dict(), timings.to_dict())
+
+    def test_simulation(self):
+        sim = PhasedSimulation(si.Specification('phased'))
+        sim.run_simulation()
+        path = sim.save(target_dir = TEST_DIR)
+
+        self.assertEqual(sim.phase_timings.calls, {'step': 3, 'physics': 1, 'save': 1})
+        loaded = PhasedSimulation.load(path)
+        self.assertEqual(loaded.phase_timings.calls, {'step': 3, 'physics': 1})  # the save finished after pickling
+        self.assertEqual(PhasedSimulation.peek(path)['phase_timings']['step']['calls'], 3)
+        self.assertIn('Phase Timings', str(loaded.info()))
+
+    def test_job_processor_aggregates(self):
+        job_dir = os.path.join(TEST_DIR, 'job')
+        jp_inputs = os.path.join(job_dir, 'inputs')
+        for ii in range(3):
+            spec = si.Specification(str(ii))
+            spec.save(target_dir = jp_inputs)
+            sim = PhasedSimulation(spec)
+            sim.run_simulation()
+            sim.save(target_dir = os.path.join(job_dir, 'outputs'))
+
+        jp = cluster.JobProcessor('job', job_dir, PhasedSimulation)
+        jp.load_sims(workers = 1)
+        self.assertEqual(jp.phase_timings.calls['step'], 9)
+
+        jp.write_time_diagnostics_to_file()
+        with open(os.path.join(job_dir, 'job_diagnostics.txt')) as f:
+            self.assertIn('physics:', f.read())
+
+
+class TestResourceSampler(unittest.TestCase):
+    def setUp(self):
+        si.utils.ensure_dir_exists(TEST_DIR)
+
+    def tearDown(self):
+        shutil.rmtree(TEST_DIR)
+
+    def test_follows_status(self):
+        sim = si.Simulation(si.Specification('sampled'))
+        sampler = sim.resource_sampler = si.ResourceSampler(interval = 0.01)
+
+        sim.status = si.STATUS_RUN
+        self.assertTrue(sampler.running)
+        big = np.ones(10 ** 6)
+        si.utils.time.sleep(0.05)
+        sim.status = si.STATUS_FIN
+        self.assertFalse(sampler.running)
+
+        series = sampler.series()
+        self.assertGreaterEqual(len(series['time']), 3)
+        self.assertTrue(np.all(np.diff(series['time']) >= 0))
+        self.assertEqual(series['rss'].dtype, np.int64)
+        self.assertGreater(sampler.peaks()['rss'], big.nbytes)
+        self.assertGreater(sampler.peaks()['open_files'], 0)
+
+        path = sim.save(target_dir = TEST_DIR)
+        loaded = si.Simulation.load(path)
+        self.assertEqual(len(loaded.resource_sampler), len(sampler))
+        self.assertEqual(loaded.resource_sampler.peaks(), sampler.peaks())
+        self.assertEqual(si.Simulation.peek(path)['resource_peaks']['rss'], sampler.peaks()['rss'])
+        self.assertIn('Peak RSS', str(loaded.info()))
+
+    def test_save_stops_unless_resumed(self):
+        sim = si.Simulation(si.Specification('sampled'))
+        sampler = sim.resource_sampler = si.ResourceSampler(interval = 0.01)
+
+        sim.status = si.STATUS_RUN
+        sim.save(target_dir = TEST_DIR, pause = False)
+        self.assertEqual(sim.status, si.STATUS_RUN)
+        self.assertTrue(sampler.running)
+
+        sim.save(target_dir = TEST_DIR)
+        self.assertEqual(sim.status, si.STATUS_PAU)
+        self.assertFalse(sampler.running)
+
+    def test_bounded(self):
+        sampler = si.ResourceSampler(interval = 0.001, max_samples = 8)
+        sampler.start()
+        si.utils.time.sleep(0.1)
+        sampler.stop()
+
+        self.assertLessEqual(len(sampler), 8)
+        self.assertGreater(sampler.interval, 0.001)
+
+
+class ProfiledSimulation(si.Simulation):
+    def run_simulation(self, target_dir):
+        self.status = si.STATUS_RUN
+        sorted(range(10 ** 4), key = str)
+        self.save(target_dir = target_dir)
+        self.status = si.STATUS_FIN
+
+
+class QuietProfiledSimulation(si.Simulation):
+    def run_simulation(self):
+        self.status = si.STATUS_RUN
+        sorted(range(10 ** 4), key = str)
+        self.status = si.STATUS_FIN
+
+
+class TestProfiling(unittest.TestCase):
+    def setUp(self):
+        si.utils.ensure_dir_exists(TEST_DIR)
+
+    def tearDown(self):
+        shutil.rmtree(TEST_DIR)
+
+    def run_and_read(self, spec):
+        sim = ProfiledSimulation(spec)
+        sim.run_simulation(TEST_DIR)
+        sim.save(target_dir = TEST_DIR)
+
+        path = os.path.join(TEST_DIR, spec.file_name + '.prof')
+        return sim, path
+
+    def test_disabled_by_default(self):
+        sim, path = self.run_and_read(si.Specification('plain'))
+
+        self.assertFalse(sim.profiling_enabled)
+        self.assertFalse(os.path.exists(path))
+
+    def test_spec_attribute(self):
+        sim, path = self.run_and_read(si.Specification('profiled', profile = True))
+
+        self.assertTrue(sim.profiling_enabled)
+        self.assertFalse(sim._profile.running)
+        stats = pstats.Stats(path)
+        self.assertTrue(any(name == 'run_simulation' for _, _, name in stats.stats))  # written again when the run finished
+        self.assertIsNone(ProfiledSimulation.load(os.path.join(TEST_DIR, 'profiled.sim')).__dict__.get('_profile'))  # never pickled
+
+    def test_run_without_saving(self):
+        sim = QuietProfiledSimulation(si.Specification('quiet', profile = True))
+        sim.run_simulation()
+        self.assertFalse(os.path.exists(os.path.join(os.getcwd(), 'quiet.prof')))
+
+        sim.save(target_dir = TEST_DIR)
+
+        stats = pstats.Stats(os.path.join(TEST_DIR, 'quiet.prof'))
+        self.assertTrue(any(name == 'run_simulation' for _, _, name in stats.stats))
+
+    def test_environment_variable(self):
+        with mock.patch.dict(os.environ, {si.PROFILE_ENV_VAR: '1'}):
+            sim, path = self.run_and_read(si.Specification('env'))
+
+        self.assertTrue(os.path.exists(path))
+
+    def test_job_processor_merges(self):
+        job_dir = os.path.join(TEST_DIR, 'job')
+        for ii in range(2):
+            spec = si.Specification(str(ii), profile = True)
+            spec.save(target_dir = os.path.join(job_dir, 'inputs'))
+            ProfiledSimulation(spec).run_simulation(os.path.join(job_dir, 'outputs'))
+        with open(os.path.join(job_dir, 'outputs', 'broken.prof'), mode = 'wb') as f:
+            f.write(b'not a profile')
+
+        jp = cluster.JobProcessor('job', job_dir, ProfiledSimulation)
+        self.assertEqual(jp.get_sim_names_from_sims(), ['0', '1'])
+
+        stats = jp.merge_profiles()
+        calls = {name: primitive_calls for (_, _, name), (primitive_calls, *_) in stats.stats.items()}
+        self.assertEqual(calls['run_simulation'], 2)
+        self.assertTrue(os.path.exists(os.path.join(jp.summaries_dir, 'job.prof')))
+
+
+class LeakySimulation(si.Simulation):
+    def __init__(self, spec):
+        super().__init__(spec)
+        self.memory_tracker = si.MemoryTracker(top = 3)
+        self.leaked = []
+
+    def run_simulation(self, target_dir):
+        self.status = si.STATUS_RUN
+        for _ in range(2):
+            self.leaked.append(bytearray(10 ** 6))
+            self.save(target_dir = target_dir)
+        self.status = si.STATUS_FIN
+
+
+class TestMemoryTracker(unittest.TestCase):
+    def setUp(self):
+        si.utils.ensure_dir_exists(TEST_DIR)
+
+    def tearDown(self):
+        shutil.rmtree(TEST_DIR)
+
+    def test_checkpoints(self):
+        sim = LeakySimulation(si.Specification('leaky'))
+        sim.run_simulation(TEST_DIR)
+        tracker = sim.memory_tracker
+
+        self.assertFalse(tracker.running)
+        self.assertFalse(tracemalloc.is_tracing())
+        self.assertEqual([c.label for c in tracker.checkpoints], ['save', 'save', si.STATUS_FIN])
+
+        top = tracker.checkpoints[0].growth[0]
+        self.assertIn('tests.py', top.site)
+        self.assertGreaterEqual(top.size_diff, 10 ** 6)
+        site, size = next(iter(tracker.growth().items()))
+        self.assertGreaterEqual(size, 2 * 10 ** 6)
+
+        path = sim.save(target_dir = TEST_DIR)
+        loaded = LeakySimulation.load(path)
+        self.assertEqual(len(loaded.memory_tracker), 3)
+        self.assertEqual(LeakySimulation.peek(path)['memory_growth'][site], size)
+        self.assertIn('Peak Traced Memory', str(loaded.info()))
+
+    def test_bounded(self):
+        tracker = si.MemoryTracker(max_checkpoints = 2)
+        tracker.start()
+        for label in 'abc':
+            tracker.checkpoint(label)
+        tracker.stop()
+
+        self.assertEqual([c.label for c in tracker.checkpoints], ['a', 'stop'])
+
+    def test_compare(self):
+        comparisons = si.compare_memory_growth({'a': {'x': 1, 'y': 5}, 'b': {'x': 3}}, top = None)
+
+        self.assertEqual(comparisons[0], si.MemoryGrowthComparison('y', 5, 1, 'a', 5))
+        self.assertEqual(comparisons[1], si.MemoryGrowthComparison('x', 4, 2, 'b', 3))
+
+    def test_job_processor(self):
+        job_dir = os.path.join(TEST_DIR, 'job')
+        for ii in range(2):
+            spec = si.Specification(str(ii))
+            spec.save(target_dir = os.path.join(job_dir, 'inputs'))
+            sim = LeakySimulation(spec)
+            sim.run_simulation(os.path.join(job_dir, 'outputs'))
+            sim.save(target_dir = os.path.join(job_dir, 'outputs'))
+
+        jp = cluster.JobProcessor('job', job_dir, LeakySimulation)
+        jp.load_sims(workers = 1)
+        top = jp.memory_growth(top = 1)[0]
+        self.assertEqual(top.simulations, 2)
+        self.assertIn('tests.py', top.site)
+
+
+class DecaySimulation(si.Simulation):
+    batch_attributes = ('rate', 'x', 'steps', 'trace')
+
+    def __init__(self, spec):
+        super().__init__(spec)
+        self.rate = spec.rate
+        self.x = 1.0
+        self.steps = 0
+        self.trace = np.zeros(2)
+
+    @classmethod
+    def step_batch(cls, state, active):
+        state['x'] *= 1 - state['rate']
+        state['steps'] += 1
+        state['trace'][:, 1] = state['trace'][:, 0]
+        state['trace'][:, 0] = state['x']
+        return state['x'] < 0.1
+
+    def run_simulation(self):
+        self.status = si.STATUS_RUN
+        while self.x >= 0.1:
+            self.x *= 1 - self.rate
+            self.steps += 1
+            self.trace = np.array([self.x, self.trace[0]])
+        self.status = si.STATUS_FIN
+
+
+class DecaySpecification(si.Specification):
+    simulation_type = DecaySimulation
+
+
+class TestBatchSimulation(unittest.TestCase):
+    def setUp(self):
+        self.specs = [DecaySpecification(str(rate), rate = rate) for rate in (0.5, 0.05, 0.2, 0.01, 0.3)]
+
+    def test_matches_serial_runs(self):
+        batch = si.BatchSimulation(self.specs)
+        sims = batch.run()
+
+        self.assertEqual(batch.steps, 230)
+        self.assertEqual(batch.active, 0)
+        for spec, sim in zip(self.specs, sims):
+            serial = spec.to_simulation()
+            serial.run_simulation()
+
+            self.assertIs(sim.spec, spec)
+            self.assertEqual(sim.status, si.STATUS_FIN)
+            self.assertIsInstance(sim.steps, int)
+            self.assertEqual(sim.steps, serial.steps)
+            self.assertAlmostEqual(sim.x, serial.x)
+            np.testing.assert_allclose(sim.trace, serial.trace)
+
+    def test_max_steps(self):
+        sims = si.BatchSimulation(self.specs, max_steps = 10).run()
+
+        self.assertEqual([sim.status for sim in sims], [si.STATUS_FIN, si.STATUS_PAU, si.STATUS_PAU, si.STATUS_PAU, si.STATUS_FIN])
+        self.assertEqual(sims[1].steps, 10)
+
+    def test_run_many(self):
+        specs = self.specs + [si.Specification('plain')]
+        specs[-1].simulation_type = si.Simulation
+
+        with self.assertRaises(si.SimulacraException):
+            si.BatchSimulation.run_many(specs)
+
+        sims = si.BatchSimulation.run_many(self.specs, batch_size = 2)
+        self.assertEqual([sim.spec for sim in sims], self.specs)
+        self.assertTrue(all(sim.status == si.STATUS_FIN for sim in sims))
+
+    def test_incompatible_shapes(self):
+        spec = DecaySpecification('odd', rate = np.array([0.1, 0.2]))
+
+        with self.assertRaises(si.SimulacraException):
+            si.BatchSimulation(self.specs + [spec])
+
+
 class TestSumming(unittest.TestCase):
     def setUp(self):
         self.summand_one = si.Summand()
@@ -162,6 +1361,338 @@ class TestSummingSubclassing(unittest.TestCase):
         self.assertTrue(self.banana in self.fruit_basket)
 
 
+class Scaled(si.Summand):
+    def __init__(self, scale):
+        super().__init__()
+        self.scale = scale
+
+    def __call__(self, x):
+        return self.scale * x
+
+
+class Offset(si.Summand):
+    def __init__(self, offset):
+        super().__init__()
+        self.offset = offset
+
+    def __call__(self, x):
+        return np.full_like(x, self.offset)
+
+    def accumulate(self, out, x):
+        out += self.offset
+        return out
+
+
+class Stored(si.Summand):
+    def __init__(self, array):
+        super().__init__()
+        self.array = array
+
+    def __call__(self, x):
+        return self.array
+
+
+class TestSumAccumulate(unittest.TestCase):
+    def setUp(self):
+        self.x = np.linspace(0, 1, 10)
+        self.sum = si.Sum(Scaled(2), Offset(1), Scaled(3), Offset(0.5))
+        self.expected = 5 * self.x + 1.5
+
+    def test_call(self):
+        np.testing.assert_allclose(self.sum(self.x), self.expected)
+
+    def test_out(self):
+        out = np.empty_like(self.x)
+        self.assertIs(self.sum(self.x, out = out), out)
+        np.testing.assert_allclose(out, self.expected)
+
+    def test_nested_sum_accumulates(self):
+        nested = si.Sum(Scaled(1), si.Sum(Offset(1), Scaled(1)))
+        np.testing.assert_allclose(nested(self.x), 2 * self.x + 1)
+
+    def test_does_not_modify_returned_arrays(self):
+        stored = np.ones(3)
+        result = si.Sum(Stored(stored), Offset(1))(np.zeros(3))
+        np.testing.assert_array_equal(result, 2)
+        np.testing.assert_array_equal(stored, 1)
+
+    def test_promotion(self):
+        result = si.Sum(Scaled(1), Scaled(1j))(self.x)
+        self.assertEqual(result.dtype, np.complex128)
+        np.testing.assert_allclose(result, (1 + 1j) * self.x)
+
+        with self.assertRaises(TypeError):
+            si.Sum(Scaled(1), Scaled(1j))(self.x, out = np.empty_like(self.x))
+
+    def test_broadcasting(self):
+        result = si.Sum(Scaled(0), Offset(1))(2.0)
+        np.testing.assert_allclose(result, 1)
+        np.testing.assert_allclose(si.Sum(Stored(1.0), Scaled(1))(self.x), self.x + 1)
+
+    def test_empty_sum(self):
+        self.assertEqual(si.Sum()(self.x), 0)
+
+    def test_nested_subclass_with_own_call(self):
+        class Product(si.Sum):
+            def __call__(self, x):
+                return np.prod([summand(x) for summand in self._container], axis = 0)
+
+        product = Product(Offset(2), Offset(3))
+        np.testing.assert_allclose(si.Sum(Offset(1), Offset(1), product)(self.x), 8)
+        out = np.empty_like(self.x)
+        np.testing.assert_allclose(si.Sum(Offset(1), product)(self.x, out = out), 7)
+
+    def test_scalar_types_are_kept(self):
+        result = si.Sum(Stored(1), Stored(2))(0)
+        self.assertEqual(result, 3)
+        self.assertIs(type(result), int)
+        self.assertIs(type(si.Sum(Stored(1.5), Stored(np.float32(2)))(0)), type(1.5 + np.float32(2)))
+
+
+class Gaussian(si.Summand):
+    batch_calls = 0
+
+    def __init__(self, amplitude, center, width):
+        super().__init__()
+        self.amplitude = amplitude
+        self.center = center
+        self.width = width
+
+    def __call__(self, x):
+        return self.amplitude * np.exp(-((x - self.center) / self.width) ** 2)
+
+    @classmethod
+    def evaluate_batch(cls, summands, x):
+        cls.batch_calls += 1
+        amplitude, center, width = cls.stack_parameters(summands, 'amplitude', 'center', 'width', ndim = np.ndim(x) + 1)
+        return np.sum(amplitude * np.exp(-((x - center) / width) ** 2), axis = 0)
+
+
+class TestSumFusion(unittest.TestCase):
+    def setUp(self):
+        Gaussian.batch_calls = 0
+        self.x = np.linspace(-5, 5, 101)
+        self.gaussians = [Gaussian(k, k / 20, 1 + k / 100) for k in range(100)]
+        self.expected = sum(g(self.x) for g in self.gaussians)
+
+    def test_fused_into_one_call(self):
+        s = si.Sum.from_iterable(self.gaussians)
+        s.fusion_batch_size = 100
+        np.testing.assert_allclose(s(self.x), self.expected)
+        self.assertEqual(Gaussian.batch_calls, 1)
+
+    def test_batches(self):
+        s = si.Sum(*self.gaussians)
+        np.testing.assert_allclose(s(self.x, out = np.empty_like(self.x)), self.expected)
+        self.assertEqual(Gaussian.batch_calls, 2)
+
+    def test_mixed_with_other_summands(self):
+        s = si.Sum(Scaled(2), *self.gaussians[:3], Offset(1))
+        np.testing.assert_allclose(s(self.x), 2 * self.x + 1 + sum(g(self.x) for g in self.gaussians[:3]))
+        self.assertEqual(Gaussian.batch_calls, 1)
+
+    def test_scalar_argument(self):
+        s = si.Sum(*self.gaussians[:5])
+        self.assertAlmostEqual(s(0.3), sum(g(0.3) for g in self.gaussians[:5]))
+
+    def test_large_arguments_are_not_fused(self):
+        s = si.Sum(*self.gaussians[:5])
+        s.fusion_max_elements = len(self.x)
+        np.testing.assert_allclose(s(self.x), sum(g(self.x) for g in self.gaussians[:5]))
+        self.assertEqual(Gaussian.batch_calls, 0)
+
+    def test_single_summand_not_fused(self):
+        s = si.Sum(self.gaussians[0], Scaled(1))
+        np.testing.assert_allclose(s(self.x), self.gaussians[0](self.x) + self.x)
+        self.assertEqual(Gaussian.batch_calls, 0)
+
+    def test_subclass_overriding_call_not_fused(self):
+        class DoubledGaussian(Gaussian):
+            def __call__(self, x):
+                return 2 * super().__call__(x)
+
+        doubled = [DoubledGaussian(g.amplitude, g.center, g.width) for g in self.gaussians[:3]]
+        np.testing.assert_allclose(si.Sum(*doubled)(self.x), 2 * sum(g(self.x) for g in self.gaussians[:3]))
+        self.assertEqual(Gaussian.batch_calls, 0)
+
+    def test_empty_argument(self):
+        x = np.array([])
+        np.testing.assert_allclose(si.Sum(*self.gaussians[:3])(x), x)
+
+
+class Counting(si.Summand):
+    def __init__(self):
+        super().__init__()
+        self.calls = 0
+
+    def __call__(self, x, t = 0):
+        self.calls += 1
+        return x * t
+
+
+class TestCachedSummand(unittest.TestCase):
+    def setUp(self):
+        self.summand = Counting()
+        self.cached = si.CachedSummand(self.summand, size = 2)
+        self.x = np.linspace(0, 1, 10)
+
+    def test_hits(self):
+        first = self.cached(self.x, t = 2)
+        second = self.cached(self.x, t = 2)
+        self.assertIs(first, second)
+        self.assertEqual(self.summand.calls, 1)
+        self.assertEqual((self.cached.hits, self.cached.misses), (1, 1))
+        self.assertEqual(self.cached.hit_rate, 0.5)
+        self.assertFalse(first.flags.writeable)
+
+    def test_keys(self):
+        self.cached(self.x, t = 2)
+        self.cached(self.x, t = 3)  # different scalar
+        self.cached(self.x.copy(), t = 3)  # different array
+        self.cached(self.x[::2], t = 3)  # different view
+        self.assertEqual(self.summand.calls, 4)
+
+    def test_bounded(self):
+        for t in (1, 2, 3):
+            self.cached(self.x, t = t)
+        self.cached(self.x, t = 1)  # evicted
+        self.cached(self.x, t = 3)  # still cached
+        self.assertEqual(self.summand.calls, 4)
+
+    def test_unhashable_arguments(self):
+        self.assertEqual(self.cached([1, 2], t = 1), [1, 2])
+        self.assertEqual(self.cached.misses, 1)
+
+    def test_in_sum(self):
+        other = Counting()
+        s = self.cached + other
+        np.testing.assert_allclose(s(self.x, t = 2), 4 * self.x)
+        np.testing.assert_allclose(s(self.x, t = 2), 4 * self.x)
+        self.assertEqual((self.summand.calls, other.calls), (1, 2))
+
+    def test_cleared_by_simulation_step(self):
+        sim = si.Simulation(si.Specification('cached'))
+        sim.register_evaluation_cache(self.cached)
+
+        self.cached(self.x, t = 1)
+        sim.end_step()
+        self.cached(self.x, t = 1)
+        self.assertEqual(self.summand.calls, 2)
+        self.assertIn('Evaluation Caches', str(sim.info()))
+
+    def test_pickle_drops_entries(self):
+        self.cached(self.x, t = 1)
+        loaded = pickle.loads(pickle.dumps(self.cached))
+        self.assertEqual(len(loaded._entries), 0)
+        self.assertEqual(loaded.misses, 1)
+
+
+class Wave(si.Summand):
+    def __call__(self, x, t):
+        return np.sin(x - t)
+
+
+class ScalarOnly(si.Summand):
+    def __call__(self, x, t):
+        if np.ndim(t) > 0:
+            raise TypeError('t must be a scalar')
+        return x * t
+
+
+class TestEvaluateGrid(unittest.TestCase):
+    def setUp(self):
+        self.x = np.linspace(0, 1, 7)
+        self.t = np.linspace(0, 2, 25)
+
+    def looped(self, summand):
+        return np.array([summand(self.x, t) for t in self.t])
+
+    def test_broadcasting(self):
+        wave = Wave()
+        result = wave.evaluate_grid(self.x, self.t, chunk_size = 10)
+        self.assertEqual(result.shape, (25, 7))
+        np.testing.assert_allclose(result, self.looped(wave))
+
+    def test_fallback(self):
+        scalar_only = ScalarOnly()
+        np.testing.assert_allclose(scalar_only.evaluate_grid(self.x, self.t, chunk_size = 10), self.looped(scalar_only))
+
+        scalar_only.supports_broadcasting = True
+        with self.assertRaises(TypeError):
+            scalar_only.evaluate_grid(self.x, self.t)
+
+    def test_fallback_is_remembered(self):
+        scalar_only = ScalarOnly()
+        with mock.patch.object(ScalarOnly, '__call__', autospec = True, side_effect = ScalarOnly.__call__) as call:
+            scalar_only.evaluate_grid(self.x, self.t, chunk_size = 10)
+
+        self.assertEqual(call.call_count, 1 + len(self.t))  # one failed broadcast, then one call per time
+
+    def test_sum(self):
+        s = Wave() + ScalarOnly()
+        np.testing.assert_allclose(s.evaluate_grid(self.x, self.t, chunk_size = 4), self.looped(s))
+
+    def test_scalar_x(self):
+        result = Wave().evaluate_grid(0.5, self.t)
+        self.assertEqual(result.shape, (25,))
+        np.testing.assert_allclose(result, np.sin(0.5 - self.t))
+
+
+class TestSumConstruction(unittest.TestCase):
+    def test_nested_sums_are_flattened(self):
+        a, b, c, d = (Scaled(k) for k in range(4))
+        nested = si.Sum(si.Sum(a, b), si.Sum(c, si.Sum(d)))
+        self.assertEqual(nested.summands, (a, b, c, d))
+        self.assertEqual(len(nested.info().children), 4)
+
+    def test_other_sum_types_are_not_flattened(self):
+        class Parenthesized(si.Sum):
+            pass
+
+        a, b, c = (Scaled(k) for k in range(3))
+        inner = Parenthesized(a, b)
+        self.assertEqual(si.Sum(inner, c).summands, (inner, c))
+
+    def test_no_flatten(self):
+        class Deep(si.Sum):
+            flatten = False
+
+        a, b = Scaled(1), Scaled(2)
+        inner = Deep(a)
+        self.assertEqual(Deep(inner, b).summands, (inner, b))
+
+    def test_from_iterable(self):
+        terms = [Scaled(k) for k in range(100)]
+        s = si.Sum.from_iterable(t for t in terms)
+        self.assertEqual(list(s), terms)
+        np.testing.assert_allclose(s(np.ones(3)), sum(range(100)))
+
+    def test_builder(self):
+        terms = [Scaled(k) for k in range(10)]
+        builder = si.SumBuilder()
+        for t in terms[:5]:
+            builder += t
+        builder.add(si.Sum(*terms[5:]))
+
+        s = builder.build()
+        self.assertIsInstance(s, si.Sum)
+        self.assertEqual(list(s), terms)
+
+    def test_builder_uses_summation_class(self):
+        class Fruit(si.Summand):
+            def __init__(self):
+                super().__init__()
+                self.summation_class = FruitBasket
+
+        class FruitBasket(si.Sum, Fruit):
+            container_name = 'basket'
+
+        apples = [Fruit() for _ in range(3)]
+        basket = si.SumBuilder().add(apples[0]).add(apples[1] + apples[2]).build()
+        self.assertIsInstance(basket, FruitBasket)
+        self.assertEqual(basket.basket, tuple(apples))
+
+
 class TestFibonnaci(unittest.TestCase):
     def test_fibonnaci_value(self):
         self.assertEqual(si.math.fibonacci(99), 218922995834555169026)